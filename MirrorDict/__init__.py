@@ -16,6 +16,42 @@ removes the existing `k` from the keys and adds it to the end of the values.
 Classes:
     - `MirrorDict`: Represents a bi-directional dictionary, where each key-value pair
       is mirrored as a value-key pair for efficient reverse lookups.
+    - `MirrorDictInverse`: Live view of the inverse of a MirrorDict, see `MirrorDict.inverse`.
+    - `SharedMirrorDict`: Read-only MirrorDict of str/int pairs stored in shared memory
+      that many processes attach to without copying.
+    - `IntMirrorDict`, `StrIntMirrorDict`: MirrorDict specialized for int<->int and
+      str<->int pairs with packed array storage.
+    - `EncoderMirrorDict`: Mirror between labels and automatically assigned dense
+      integer ids with bulk `encode()` and `decode()`.
+    - `FilteredMirrorDict`: MirrorDict that rejects most lookup misses with a set of the
+      hashes of its keys and values, see `MirrorDict.enable_filter()`.
+    - `InstrumentedMirrorDict`: MirrorDict that records per-branch counters and latency
+      histograms, see `MirrorDict.enable_stats()`.
+    - `LazyMirrorDict`: MirrorDict that builds its inverse lookup only when first needed.
+    - `IndexedMirrorDict`: MirrorDict with secondary indexes (e.g. sorted keys or values)
+      kept in sync with every mutation, see `MirrorDict.add_sorted_index()`,
+      `MirrorDict.add_prefix_index()`, `MirrorDict.add_order_index()`, and
+      `MirrorDict.add_index()`.
+    - `MirrorTransaction`: Batch of staged puts and deletes that is applied to a MirrorDict
+      atomically, see `MirrorDict.transaction()`.
+    - `NormalizedMirrorDict`: MirrorDict that matches keys and values by a normalized form
+      (e.g. case-insensitive) and returns them with their original spelling.
+    - `WeakMirrorDict`: MirrorDict of weak references, where a pair is removed when either
+      of its objects is garbage collected.
+    - `ChainMirror`: Writable overlay of override pairs on a read-only base MirrorDict,
+      see `MirrorDict.overlay()`.
+    - `ComposedMirror`: Read-only view of the composition of two mirrors (`a <-> b` and
+      `b <-> c`) with lookups in both directions, see `MirrorDict.compose()`.
+    - `PersistentMirrorDict`: Mirror that records a version for every change in shared
+      persistent tries, with read-only `MirrorSnapshot` views of any version.
+    - `MirrorDictServer`, `MirrorDictClient`: Host a MirrorDict over a Unix domain socket
+      and access it from other processes with pipelined and batched requests.
+    - `MirrorManager`, `MirrorDictProxy`: Share a MirrorDict through a `multiprocessing`
+      manager with batched calls and a local lookup cache invalidated by a change counter.
+
+Functions:
+    - `create_mirror(backend, *args, **kwargs)`: Create a mirror with a named storage
+      backend, see `MirrorDict.backends`. Backends are imported only when selected.
 
 Key Features:
     - Automatically maintains a bi-directional mapping between keys and values.
@@ -101,19 +137,70 @@ __description__ = (
 )
 __copyright__ = "Copyright (c) 2025 Scott E. Boyce"
 
-__all__ = ["MirrorDict"]
+__all__ = [
+    "MirrorDict",
+    "MirrorDictInverse",
+    "SharedMirrorDict",
+    "IntMirrorDict",
+    "StrIntMirrorDict",
+    "EncoderMirrorDict",
+    "FilteredMirrorDict",
+    "InstrumentedMirrorDict",
+    "LazyMirrorDict",
+    "IndexedMirrorDict",
+    "MirrorTransaction",
+    "WeakMirrorDict",
+    "ChainMirror",
+    "ComposedMirror",
+    "PersistentMirrorDict",
+    "MirrorSnapshot",
+    "NormalizedMirrorDict",
+    "normalize_text",
+    "MirrorDictServer",
+    "MirrorDictClient",
+    "MirrorManager",
+    "MirrorDictProxy",
+    "register_mirror",
+    "create_mirror",
+    "register_backend",
+    "get_backend",
+    "available_backends",
+]
 
 
 # %% -----------------------------------------------------------------------------------------------
 
 
 from collections.abc import Hashable, MutableMapping
-import inspect
+import math
 
 
 # %% -----------------------------------------------------------------------------------------------
 
 
+# mirror cases taken by MirrorDict._update, returned as flags
+_UPDATE_REPLACE = 1  # changed the value of an existing key
+_UPDATE_REVERSE_KEY = 2  # the key was a value, its pair was dropped
+_UPDATE_EVICT_VAL = 4  # the value was already in use, its old key was dropped
+_UPDATE_REVERSE_VAL = 8  # the value was a key, its pair was dropped
+
+
+def _raise_unhashable(key, val, name="MirrorDict"):
+    """
+    Raise the TypeError for a key or value that is not hashable, named after the public
+    method that was called. Called by `_update` (and its overrides) after their own
+    `isinstance(..., Hashable)` test, so the check itself stays inline on the hot path.
+    """
+    import inspect  # only needed for the error message, imported here to keep `import MirrorDict` fast
+
+    internal = ("_raise_unhashable", "_update")
+    caller = next((f.function for f in inspect.stack()[1:] if f.function not in internal), "_update")
+    raise TypeError(
+        f"{name}.{caller}(): both key and value must be hashable, but received key='{key}' ({type(key)}) "
+        f"and value='{val}' ({type(val)})."
+    )
+
+
 class MirrorDict(MutableMapping):
     """
     A dictionary-like object that maintains a bi-directional/mirrored mapping
@@ -168,6 +255,10 @@ class MirrorDict(MutableMapping):
 
     _key: dict
     _val: dict
+    _churn = 0  # entries deleted from _key and _val since the last compaction (dict tombstones)
+    _compact_ratio = None  # ratio of tombstones to all entries that triggers auto compaction
+    _compact_at = float("inf")  # _churn that triggers the next auto compaction check
+    _resets = 0  # calls of clear() and compact(), which reset _churn, used to detect changes
 
     def __init__(self, *args, **kwargs):
         """
@@ -182,20 +273,365 @@ class MirrorDict(MutableMapping):
         self._val = {}
         self.update(*args, **kwargs)
 
+    def add_index(self, name, func, side="key"):
+        """
+        Add a group index named `name` that groups the pairs by `func(key)` (or
+        `func(value)` for `side="value"`), is kept up to date by every mutation, and answers
+            `query(name, group)`
+        with the (key, value) pairs in the group, in time proportional to their number.
+        `drop_index(name)` removes it.
+
+        The instance is converted in place to an `IndexedMirrorDict`, so mirrors without
+        indexes have no added overhead.
+
+        Args:
+            name (str): Name of the index.
+            func (callable): Returns the hashable group of a key or value.
+            side (str): "key" or "value", the side that `func` is applied to.
+
+        Example:
+            >>> md = MirrorDict({"u1": "acme/alice", "u2": "initech/bob", "u3": "acme/carol"})
+            >>> md.add_index("tenant", lambda v: v.split("/")[0], side="value")
+            >>> md.query("tenant", "acme")
+            [('u1', 'acme/alice'), ('u3', 'acme/carol')]
+        """
+        from .indexed import IndexedMirrorDict
+
+        IndexedMirrorDict._convert(self)
+        return self.add_index(name, func, side)
+
+    def add_order_index(self):
+        """
+        Add an index of the positions of the pairs in `keys()` order, that is kept up
+        to date by every mutation and supports positional access in O(log n):
+            `item_at(index)`            (key, value) pair at a position
+            `index_of(key)`             position of the pair with `key` as its key or value
+            `islice(start=0, stop=None)` iterate over the pairs in a range of positions
+
+        The order is the same as `items()`, so changing the value of a key keeps its
+        position and setting a new key (including reversing a pair) adds it at the end.
+        The instance is converted in place to an `IndexedMirrorDict`, so mirrors without
+        indexes have no added overhead.
+
+        Example:
+            >>> md = MirrorDict(a=1, b=2, c=3)
+            >>> md.add_order_index()
+            >>> md.item_at(1), md.index_of(3), list(md.islice(1))
+            (('b', 2), 2, [('b', 2), ('c', 3)])
+        """
+        from .indexed import IndexedMirrorDict
+
+        IndexedMirrorDict._convert(self)
+        return self.add_order_index()
+
+    def add_prefix_index(self, side="key"):
+        """
+        Add a prefix index of the str keys, the str values, or both, that is kept up
+        to date by every mutation and answers
+            `prefix(prefix, side="key", limit=None)`
+        with the matching strings in sorted order, in time proportional to the matches.
+
+        The instance is converted in place to an `IndexedMirrorDict`, so mirrors without
+        indexes have no added overhead.
+
+        Args:
+            side (str): "key", "value", or "both".
+
+        Example:
+            >>> md = MirrorDict(apple=1, apricot=2, banana=3)
+            >>> md.add_prefix_index()
+            >>> md.prefix("ap")
+            ['apple', 'apricot']
+        """
+        from .indexed import IndexedMirrorDict
+
+        IndexedMirrorDict._convert(self)
+        return self.add_prefix_index(side)
+
+    def add_sorted_index(self, side="key"):
+        """
+        Add a sorted index of the keys, the values, or both, that is kept up to date
+        by every mutation and supports range and nearest queries in O(log n):
+            `irange(minimum, maximum, inclusive=(True, True), reverse=False, side="key")`
+            `floor(item, default=KeyError, side="key")`   largest item <= `item`
+            `ceiling(item, default=KeyError, side="key")` smallest item >= `item`
+
+        The instance is converted in place to an `IndexedMirrorDict`, so mirrors without
+        indexes have no added overhead.
+
+        Args:
+            side (str): "key", "value", or "both".
+
+        Example:
+            >>> md = MirrorDict({10: 'a', 20: 'b', 30: 'c'})
+            >>> md.add_sorted_index()
+            >>> list(md.irange(15, 30)), md.floor(25)
+            ([20, 30], 20)
+        """
+        from .indexed import IndexedMirrorDict
+
+        IndexedMirrorDict._convert(self)
+        return self.add_sorted_index(side)
+
+    def auto_compact(self, ratio=0.5, min_tombstones=1024):
+        """
+        Enable (or disable with `ratio=None`) automatic compaction.
+
+        When the removals since the last compaction make up at least `ratio` of all
+        entries, counting deleted ones, and there are at least `min_tombstones` of them,
+        the next removal runs `compact()`. The cost of each compaction is proportional
+        to the removals that triggered it, so it is amortized O(1) per removal.
+
+        Args:
+            ratio (float or None): Tombstone ratio, between 0 and 1, that triggers a compaction.
+            min_tombstones (int): Minimum number of tombstones before compacting, so small
+                                  mirrors are not compacted repeatedly.
+
+        Example:
+            >>> md = MirrorDict((i, -i) for i in range(1, 10_001))
+            >>> md.auto_compact(ratio=0.5)
+            >>> for i in range(1, 9_001):
+            ...     del md[i]
+            >>> md.churn()["tombstones"] < 9_000
+            True
+        """
+        if ratio is None:
+            self.__dict__.pop("_compact_ratio", None)
+            self.__dict__.pop("_compact_min", None)
+            self.__dict__.pop("_compact_at", None)
+            return
+        if not 0.0 < ratio < 1.0:
+            raise ValueError(f"MirrorDict.auto_compact() expected 0 < ratio < 1, but received: {ratio}")
+        self._compact_ratio = ratio
+        self._compact_min = min_tombstones
+        self._set_compact_at()
+
+    def churn(self):
+        """
+        Return the tombstone statistics used to decide when to `compact()`.
+
+        Python dicts never shrink when items are deleted, the deleted entries stay
+        allocated (as tombstones) until the dict is resized by growth or compacted.
+
+        Returns:
+            dict: with the keys
+                "tombstones": number of entries deleted from the key and value dicts
+                              since the last compaction (an upper bound, since growth of
+                              a dict also discards its tombstones).
+                "live":       number of entries in the key and value dicts (2 * len).
+                "ratio":      tombstones / (tombstones + live).
+        """
+        tombstones = self._churn
+        live = 2 * len(self)
+        total = tombstones + live
+        return {"tombstones": tombstones, "live": live, "ratio": tombstones / total if total else 0.0}
+
     def clear(self):
         """
         Remove all items from the MirrorDict instance.
         """
         self._key.clear()
         self._val.clear()
+        self._churn = 0
+        self._resets += 1
         return self
 
+    def compact(self):
+        """
+        Rebuild the key and value dicts so that they only allocate space for the
+        current pairs, releasing the memory held by deleted entries.
+
+        The order of the keys and values is preserved, and the dicts are rebuilt in
+        place, so existing `keys()`, `values()`, and `items()` views stay valid.
+
+        Example:
+            >>> md = MirrorDict((i, -i) for i in range(1, 100_001))
+            >>> for i in range(1, 99_001):
+            ...     del md[i]
+            >>> md.churn()["tombstones"]
+            198000
+            >>> md.compact().churn()["tombstones"]
+            0
+        """
+        for d in (self._key, self._val):
+            if d:
+                items = dict(d)  # copying a dict with deleted entries makes a right-sized table
+                d.clear()
+                d.update(items)
+        self._churn = 0
+        self._resets += 1
+        if self._compact_ratio is not None:
+            self._set_compact_at()
+        return self
+
+    def compose(self, other, cache=False):
+        """
+        Return a `ComposedMirror`, a read-only view that resolves `a <-> c` through this
+        mirror of `a: b` pairs and `other`, a mirror of `b: c` pairs, in both directions.
+
+        The view reflects later changes to either mirror. With `cache=True` the lookups
+        are memoized until either mirror changes, and `materialize()` builds the
+        composed MirrorDict in bulk. Pass `other.inverse` to compose with a mirror of
+        `c: b` pairs.
+
+        Example:
+            >>> ext = MirrorDict({"ext-1": 10, "ext-2": 20})
+            >>> view = ext.compose(MirrorDict({10: "shard-a", 20: "shard-b"}))
+            >>> view["ext-1"], view["shard-b"]
+            ('shard-a', 'ext-2')
+        """
+        from .compose import ComposedMirror
+
+        return ComposedMirror(self, other, cache)
+
     def copy(self):
         """
         Return a shallow copy of the MirrorDict instance.
         """
         return MirrorDict(self)
 
+    def discard_many(self, items, return_pairs=False):
+        """
+        Remove every key (or value) in `items` that is in the mirror, together with its
+        mirrored counterpart, in one pass, and ignore the ones that are not.
+
+        Like `remove_many()`, but without raising for missing items.
+
+        Example:
+            >>> md = MirrorDict(a=1, b=2, c=3)
+            >>> md.discard_many(["a", 2, "z"], return_pairs=True)
+            [('a', 1), ('b', 2)]
+        """
+        from .bulk import remove_many
+
+        return remove_many(self, items, True, return_pairs)
+
+    def enable_filter(self):
+        """
+        Switch this instance to a `FilteredMirrorDict` that checks a set of the hashes
+        of its keys and values before each lookup, so most misses are rejected without
+        probing the key and value dicts.
+
+        The filter costs two hashes per insert and one per hit, and pays off when most
+        lookups miss and the items are expensive to hash (e.g. tuples). Removed items
+        stay in the filter until `compact()` rebuilds it. Call `disable_filter()` to
+        switch back.
+
+        Example:
+            >>> md = MirrorDict({("user", 1): 100})
+            >>> md.enable_filter()
+            >>> ("user", 2) in md
+            False
+        """
+        from .filtered import FilteredMirrorDict
+
+        if type(self) is MirrorDict:
+            self.__class__ = FilteredMirrorDict
+            self._rebuild_filter()
+        elif not isinstance(self, FilteredMirrorDict):
+            raise TypeError(f"MirrorDict.enable_filter() is not supported for subclass {type(self).__name__}.")
+
+    def enable_stats(self):
+        """
+        Switch this instance to an `InstrumentedMirrorDict` that records per-branch
+        counters and latency histograms, available from `stats()`.
+
+        The class of the instance is swapped, so a MirrorDict that never calls this
+        method pays no overhead for instrumentation. Call `disable_stats()` to
+        switch back.
+
+        Example:
+            >>> md = MirrorDict(a=1)
+            >>> md.enable_stats()
+            >>> md[1]
+            'a'
+            >>> md.stats()["counters"]
+            {'lookup_val': 1}
+        """
+        from .stats import InstrumentedMirrorDict
+
+        if type(self) is MirrorDict:
+            self.__class__ = InstrumentedMirrorDict
+            self.reset_stats()
+        elif not isinstance(self, InstrumentedMirrorDict):
+            raise TypeError(f"MirrorDict.enable_stats() is not supported for subclass {type(self).__name__}.")
+
+    @staticmethod
+    def estimate_memory(n, key, value):
+        """
+        Estimate the memory of a MirrorDict with `n` pairs like `key: value`, in the
+        same format as `memory_usage(deep=True)`.
+
+        The key and value dicts are assumed to have the smallest tables that hold `n`
+        pairs (as after `compact()`), and every key and value to be a distinct object
+        the size of the samples. Small ints and interned strings that are shared
+        make the actual memory smaller. The estimate is for a plain MirrorDict, the
+        indexes and filter reported by `memory_usage()` are not included.
+
+        Args:
+            n (int): Number of pairs.
+            key: A sample key, e.g. `"user-00001"`.
+            value: A sample value, e.g. `12345`.
+
+        Example:
+            >>> est = MirrorDict.estimate_memory(1_000_000, key="user-00001", value=12345)
+            >>> round(est["total"] / 2**20)     # MiB, on Python 3.11+
+            152
+        """
+        from .memory import estimate_memory
+
+        return estimate_memory(n, key, value)
+
+    def filter(self, predicate):
+        """
+        Return a new MirrorDict with the pairs for which `predicate(key, value)` is true,
+        in the same order, built in bulk. The MirrorDict is not modified, see `retain()`
+        to remove the other pairs in place.
+
+        Example:
+            >>> md = MirrorDict(a=1, b=2, c=3)
+            >>> md.filter(lambda key, value: value > 1)
+            MirrorDict({'b': 2, 'c': 3})
+        """
+        from .bulk import filter_pairs
+
+        return filter_pairs(self, predicate)
+
+    @classmethod
+    def from_arrow(cls, data, key="key", value="value"):
+        """
+        Create a MirrorDict from Apache Arrow columns in bulk. Requires pyarrow.
+
+        Args:
+            data: A `pyarrow.Table` or `RecordBatch` with `key` and `value` columns, or a
+                  dictionary-encoded array, whose categories become the keys and their
+                  integer codes the values.
+            key (str): Name of the key column.
+            value (str): Name of the value column.
+
+        Example:
+            >>> arr = pa.array(["low", "high", "low"]).dictionary_encode()
+            >>> MirrorDict.from_arrow(arr)
+            MirrorDict({'low': 0, 'high': 1})
+        """
+        from .interop import from_arrow
+
+        return from_arrow(cls, data, key, value)
+
+    @classmethod
+    def from_categorical(cls, data):
+        """
+        Create a MirrorDict that maps the categories of a pandas Categorical (or
+        categorical Series) to their integer codes. Requires pandas.
+
+        Example:
+            >>> MirrorDict.from_categorical(pd.Categorical(["b", "a", "b"]))
+            MirrorDict({'a': 0, 'b': 1})
+        """
+        from .interop import from_categorical
+
+        return from_categorical(cls, data)
+
     def get(self, key, default=None):
         """
         Return the value for key if key is in the dictionary, else default.
@@ -206,6 +642,27 @@ class MirrorDict(MutableMapping):
             return self._val[key]
         return default
 
+    @property
+    def inverse(self):
+        """
+        Live view of the inverse mapping (`{v:k}`), backed by `_val` without copying.
+
+        Iterating, `keys()`, `values()`, and `items()` of the view return the
+        values, keys, and value-key pairs of the MirrorDict. Lookups follow the
+        same mirror rules, and writes go through the MirrorDict, so `md.inverse[v] = k`
+        is the same as `md[k] = v`.
+
+        Example:
+            >>> md = MirrorDict({'a': 1, 'b': 2})
+            >>> inv = md.inverse
+            >>> list(inv.items())
+            [(1, 'a'), (2, 'b')]
+            >>> inv[3] = 'c'
+            >>> md['c']
+            3
+        """
+        return MirrorDictInverse(self)
+
     def items(self):
         """
         Iterate over key-value pairs from the initial mapping.
@@ -218,6 +675,126 @@ class MirrorDict(MutableMapping):
         """
         return self._key.keys()
 
+    def map_series(self, series, side="both"):
+        """
+        Translate a whole pandas Series (or Index, or sequence) through the mirror with
+        one vectorized `Series.map`, instead of a Python lookup per row. Requires pandas.
+
+        Items that are not in the mirror become NaN.
+
+        Args:
+            series: The items to translate.
+            side (str): "key" to translate keys to values, "value" to translate
+                        values to keys, or "both" (default) to translate either.
+
+        Example:
+            >>> md = MirrorDict(a=1, b=2)
+            >>> md.map_series(pd.Series(["a", 2, "z"])).tolist()
+            [1, 'b', nan]
+        """
+        from .interop import map_series
+
+        return map_series(self, series, side)
+
+    def memory_usage(self, deep=False):
+        """
+        Return the memory used by the MirrorDict in bytes, by component.
+
+        Args:
+            deep (bool): Also count the key and value objects, each object once even if
+                         it is shared, and the items of tuple and frozenset keys and values.
+
+        Returns:
+            dict: with the keys
+                "instance":    the MirrorDict object and its attribute dict.
+                "key_table":   the dict from keys to values.
+                "value_table": the dict from values to keys.
+                "spelling_table": the dict from canonical forms to spellings (only for a
+                               `NormalizedMirrorDict`).
+                "pending":     the pairs not yet in the value table, and their list (only
+                               for a `LazyMirrorDict`).
+                "indexes":     the secondary indexes (only for an `IndexedMirrorDict`),
+                               not counting the keys and values they hold.
+                "filter":      the hash set of a `FilteredMirrorDict` (only if it has one).
+                "keys":        the key objects (only if `deep`).
+                "values":      the value objects (only if `deep`).
+                "spellings":   the spellings that are not also canonical forms (only if
+                               `deep`, for a `NormalizedMirrorDict`).
+                "total":       the sum of the components.
+                "per_pair_overhead": bytes of all the components but the instance and the
+                               key and value objects per pair.
+                "per_pair":    bytes of everything but the instance per pair.
+
+        Example:
+            >>> md = MirrorDict((f"id{i}", i) for i in range(1000))
+            >>> md.memory_usage()["key_table"]   # str keys, on Python 3.11+
+            26032
+        """
+        from .memory import memory_usage
+
+        return memory_usage(self, deep)
+
+    def merge(self, other, on_key_conflict="replace", on_value_conflict="replace", report=False):
+        """
+        Merge the pairs of `other` into the MirrorDict, resolving the pairs that conflict
+        with existing ones by policy instead of silently evicting the existing pairs.
+
+        An incoming pair `k: v` conflicts on its key if `k` is already a key or value
+        with another partner, and on its value if `v` is. The conflicts are found with
+        set operations on both tables and the other pairs are added in bulk, so merging
+        large mirrors does not run Python code per pair unless it conflicts.
+
+        Args:
+            other: A MirrorDict, mapping, or iterable of key-value pairs that forms a
+                   valid mirror (no value repeats and no key is also a value).
+            on_key_conflict (str): Policy when the key of an incoming pair is in use:
+                "replace": evict the existing pair, as `update()` does (default).
+                "keep":    keep the existing pair and skip the incoming one.
+                "raise":   raise ValueError, leaving the MirrorDict unchanged.
+            on_value_conflict (str): Policy when the value of an incoming pair is in use,
+                                     with the same options. A pair that conflicts on both
+                                     sides uses "raise" over "keep" over "replace".
+            report (bool): If True, return a report of the merge instead of self.
+
+        Returns:
+            MirrorDict: self, or if `report` is True, a dict with
+                "added":     number of incoming pairs added.
+                "unchanged": number of incoming pairs that were already present.
+                "replaced":  list of the existing (key, value) pairs that were evicted.
+                "skipped":   list of the incoming (key, value) pairs that were not added.
+
+        Raises:
+            ValueError: If a conflict has the "raise" policy, or `other` is not a valid mirror.
+
+        Example:
+            >>> md = MirrorDict(a=1, b=2)
+            >>> md.merge({"a": 10, "c": 2}, on_value_conflict="keep", report=True)
+            {'added': 1, 'unchanged': 0, 'replaced': [('a', 1)], 'skipped': [('c', 2)]}
+            >>> md
+            MirrorDict({'a': 10, 'b': 2})
+        """
+        from .merge import merge
+
+        return merge(self, other, on_key_conflict, on_value_conflict, report)
+
+    def overlay(self, *args, **kwargs):
+        """
+        Return a `ChainMirror`, a writable overlay on this MirrorDict that reads as if
+        the given overrides were applied to a copy, in O(1) time and O(overrides) memory.
+
+        The MirrorDict is not modified by the overlay, and must not be modified while
+        the overlay is used.
+
+        Example:
+            >>> md = MirrorDict(en=1, fr=2)
+            >>> chain = md.overlay(es=2)
+            >>> chain[2], "fr" in chain, md[2]
+            ('es', False, 'fr')
+        """
+        from .chain import ChainMirror
+
+        return ChainMirror(self, *args, **kwargs)
+
     def pop(self, key, default=KeyError):
         """
         Remove a key (or value) and its mirrored counterpart from the dictionary.
@@ -261,11 +838,13 @@ class MirrorDict(MutableMapping):
             val = self._key[key]
             del self._key[key]
             del self._val[val]
+            self._removed(2)
             return val
         if key in self._val:
             key, val = self._val[key], key
             del self._key[key]
             del self._val[val]
+            self._removed(2)
             return key
         if default is not KeyError:
             return default
@@ -295,11 +874,71 @@ class MirrorDict(MutableMapping):
             raise KeyError("MirrorDict.popitem() dictionary is empty.")
         key, val = self._key.popitem()
         del self._val[val]
+        self._removed(2)
         return key, val
 
     def __reversed__(self):
         return reversed(self._key.keys())
 
+    def remove_many(self, items, return_pairs=False):
+        """
+        Remove every key (or value) in `items` together with its mirrored counterpart,
+        resolving all of them in one pass before anything is removed.
+
+        When more than half of the pairs are removed, the key and value dicts are rebuilt
+        with the remaining pairs instead of deleting the removed ones one at a time.
+
+        Args:
+            items (iterable): Keys or values to remove, in any mix. An item and its
+                              counterpart in the same call remove their pair once.
+            return_pairs (bool): Return the list of the removed (key, value) pairs, in
+                                 the order of the items that removed them, instead of
+                                 their number.
+
+        Returns:
+            int or list: The number of removed pairs, or the pairs with `return_pairs=True`.
+
+        Raises:
+            KeyError: If an item is not found, in which case nothing is removed.
+
+        Example:
+            >>> md = MirrorDict(a=1, b=2, c=3)
+            >>> md.remove_many(["a", 2])
+            2
+            >>> md
+            MirrorDict({'c': 3})
+        """
+        from .bulk import remove_many
+
+        return remove_many(self, items, False, return_pairs)
+
+    def retain(self, predicate, return_pairs=False):
+        """
+        Keep only the pairs for which `predicate(key, value)` is true, and remove the rest.
+
+        The predicate is called on every pair before anything is removed, so if it raises
+        the MirrorDict is unchanged. When more than half of the pairs are removed, the key
+        and value dicts are rebuilt in bulk with the pairs that are kept.
+
+        Args:
+            predicate (callable): Called as `predicate(key, value)` for each pair.
+            return_pairs (bool): Return the list of the removed (key, value) pairs
+                                 instead of their number.
+
+        Returns:
+            int or list: The number of removed pairs, or the pairs with `return_pairs=True`.
+
+        Example:
+            >>> md = MirrorDict(a=1, b=2, c=3)
+            >>> md.retain(lambda key, value: value != 2)
+            1
+            >>> md
+            MirrorDict({'a': 1, 'c': 3})
+        """
+        from .bulk import retain
+
+        return retain(self, predicate, return_pairs)
+
     def reversed(self):
         """
         Return a reversed iterator over the dictionary's keys.
@@ -349,6 +988,62 @@ class MirrorDict(MutableMapping):
         self._update(key, default)
         return default
 
+    def to_arrow(self, key="key", value="value"):
+        """
+        Return the pairs as a `pyarrow.Table` with a `key` and a `value` column,
+        in `items()` order. Requires pyarrow.
+        """
+        from .interop import to_arrow
+
+        return to_arrow(self, key, value)
+
+    def to_categorical(self, codes=None, ordered=False):
+        """
+        Return a pandas Categorical whose categories are the keys, for a mirror of
+        categories to the integer codes 0 to n-1 (e.g. from `from_categorical()`).
+        Requires pandas.
+
+        Args:
+            codes (array-like, optional): The codes to decode, in bulk. If None, the
+                                          `CategoricalDtype` of the categories is returned.
+            ordered (bool): Whether the categories are ordered by their codes.
+
+        Raises:
+            ValueError: If the values are not the integers 0 to n-1.
+
+        Example:
+            >>> md = MirrorDict(low=0, high=1)
+            >>> md.to_categorical([1, 0, 0])
+            ['high', 'low', 'low']
+            Categories (2, object): ['low', 'high']
+        """
+        from .interop import to_categorical
+
+        return to_categorical(self, codes, ordered)
+
+    def transaction(self):
+        """
+        Return a `MirrorTransaction` that stages puts and deletes and applies them
+        all at once on commit.
+
+        The staged operations are resolved with the mirror rules before anything is
+        applied, so an error (e.g. an unhashable value or deleting a missing key)
+        leaves the MirrorDict unchanged instead of half updated. Used as a context
+        manager, the transaction commits when the block exits normally and is
+        discarded if the block raises.
+
+        Example:
+            >>> md = MirrorDict(a=1, b=2)
+            >>> with md.transaction() as tx:
+            ...     tx['c'] = 3
+            ...     del tx[1]
+            >>> md
+            MirrorDict({'b': 2, 'c': 3})
+        """
+        from .transaction import MirrorTransaction
+
+        return MirrorTransaction(self)
+
     def update(self, *args, **kwargs):
         """
         Update the MirrorDict with key-value pairs from a mapping, iterable, or keyword arguments.
@@ -380,7 +1075,9 @@ class MirrorDict(MutableMapping):
             MirrorDict({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 1: 'a', 2: 'b', 3: 'c', 4: 'd', 5: 'e'})
         """
         for arg in args:
-            if isinstance(arg, MutableMapping):
+            if type(arg) is MirrorDict and type(self) is MirrorDict:  # no conflicts within arg, so merge in bulk
+                self.merge(arg)
+            elif isinstance(arg, MutableMapping):
                 for key, val in arg.items():
                     self._update(key, val)
             elif hasattr(arg, "__iter__") and not isinstance(arg, str):  # If it's an iterable of key-value pairs
@@ -414,43 +1111,101 @@ class MirrorDict(MutableMapping):
     #         self.values = {v: k for k, v in self._key.items()}
     #     return self
 
-    def _update(self, key, val):
+    def _update(self, key, val, displaced=None):
         """
         Add or update a key-value pair and maintain the mirrored relationship.
 
         Args:
             key: The key to add or update.
             val: The value to associate with the key.
+            displaced (list, optional): If given, every (key, value) pair that is removed
+                                        or replaced by the update is appended to it.
+
+        Returns:
+            int | None: None if the pair was already defined, otherwise the mirror cases
+                        taken, a combination of the `_UPDATE_*` flags (0 for a new pair).
 
         Raises:
             TypeError: If key or value is not hashable.
         """
         if not isinstance(key, Hashable) or not isinstance(val, Hashable):
-            caller = inspect.stack()[1].function
-            raise TypeError(
-                f"MirrorDict.{caller}(): both key and value must be hashable, but received key='{key}' ({type(key)}) "
-                f"and value='{val}' ({type(val)})."
-            )
+            _raise_unhashable(key, val)
 
+        removed = 0  # entries deleted, for compaction
+        case = 0  # _UPDATE_* flags, for InstrumentedMirrorDict
         if key in self._key:  # key already defined, check if val is the same or needs to be updated
             val_old = self._key[key]
             if val_old == val:
-                return
+                return None
             key_old = self._val.pop(val_old)
+            removed = 1
+            case = _UPDATE_REPLACE
             if key_old != key:
                 self._key.pop(key_old)
+                removed += 1
+            if displaced is not None:
+                displaced.append((key, val_old))
 
         if key in self._val:  # key in _val, so need to reverse storage direction
-            self._key.pop(self._val.pop(key))
+            key_old = self._val.pop(key)
+            self._key.pop(key_old)
+            removed += 2
+            case |= _UPDATE_REVERSE_KEY
+            if displaced is not None:
+                displaced.append((key_old, key))
 
         if val in self._val:  # val already defined, update key to it
-            self._key.pop(self._val[val])
+            key_old = self._val[val]
+            self._key.pop(key_old)
+            removed += 1
+            case |= _UPDATE_EVICT_VAL
+            if displaced is not None:
+                displaced.append((key_old, val))
 
         if val in self._key:  # val in _key, so need to reverse storage direction
-            self._val.pop(self._key.pop(val))
+            val_old = self._key.pop(val)
+            self._val.pop(val_old)
+            removed += 2
+            case |= _UPDATE_REVERSE_VAL
+            if displaced is not None:
+                displaced.append((val, val_old))
 
         self._key[key] = val
         self._val[val] = key
+        if removed:
+            self._removed(removed)
+        return case
+
+    def _pair_of(self, x):
+        """
+        Return the (key, value) pair that has `x` as its key or value, as `items()`
+        returns it, or None if `x` is not in the mirror.
+        """
+        if x in self._key:
+            return x, self._key[x]
+        if x in self._val:
+            return self._val[x], x
+        return None
+
+    def _removed(self, count):
+        """
+        Record `count` entries deleted from `_key` and `_val`, and run `compact()`
+        if auto compaction is enabled and its threshold is reached.
+        """
+        self._churn += count
+        if self._churn >= self._compact_at:
+            if self._churn >= self._compact_ratio * (self._churn + 2 * len(self)):
+                self.compact()
+            else:  # pairs were added since the threshold was set
+                self._set_compact_at()
+
+    def _set_compact_at(self):
+        """
+        Set the tombstone count at which auto compaction checks the ratio again.
+        """
+        # removing a pair adds two tombstones and two fewer live entries, so their sum only changes on insert
+        total = self._churn + 2 * len(self)
+        self._compact_at = max(self._compact_min, self._churn + 1, math.ceil(self._compact_ratio * total))
 
     def __str__(self):
         return f"MirrorDict({self._key})"
@@ -512,11 +1267,17 @@ class MirrorDict(MutableMapping):
             self._key.pop(key)
         else:
             raise KeyError(f'del MirrorDict[key] does not have key="{key}".')
+        self._removed(2)
 
     def __ior__(self, other):  # dict concat with assignment, a |= b
         return self.update(other)
 
     def __or__(self, other):  # dict concat, a | b
+        if type(self) is MirrorDict:
+            md = MirrorDict()
+            md._key = self._key.copy()
+            md._val = self._val.copy()
+            return md.update(other)
         return MirrorDict(self, other)
 
     def __ror__(self, other):  # reverse dict concat, b | a
@@ -545,6 +1306,163 @@ class MirrorDict(MutableMapping):
         raise TypeError(f"'>=' not supported between instances of 'MirrorDict' and '{type(other)}'")
 
 
+class MirrorDictInverse(MutableMapping):
+    """
+    Live view of the inverse (`{v:k}`) of a MirrorDict, returned by `MirrorDict.inverse`.
+
+    The view holds no data of its own; it reads the `_val` dict of the MirrorDict
+    and all writes are applied to the MirrorDict with its mirror logic.
+    The order of the view is the order that values were last set.
+    """
+
+    __slots__ = ("_mirror",)
+
+    def __init__(self, mirror):
+        self._mirror = mirror
+
+    def _inv(self):
+        val = self._mirror._val
+        if val is None:  # LazyMirrorDict that has not built its inverse yet
+            val = self._mirror._inverse()
+        return val
+
+    @property
+    def inverse(self):
+        """
+        The MirrorDict that this is the inverse of.
+        """
+        return self._mirror
+
+    def clear(self):
+        self._mirror.clear()
+        return self
+
+    def copy(self):
+        """
+        Return a new MirrorDict with the values as keys and keys as values.
+        """
+        return MirrorDict(self._inv().items())
+
+    def get(self, key, default=None):
+        val = self._inv()
+        if key in val:
+            return val[key]
+        return self._mirror._key.get(key, default)
+
+    def items(self):
+        return self._inv().items()
+
+    def keys(self):
+        return self._inv().keys()
+
+    def pop(self, key, default=KeyError):
+        return self._mirror.pop(key, default)
+
+    def popitem(self):
+        """
+        Remove and return the last value-key pair of the inverse.
+        """
+        val = self._inv()
+        if len(val) == 0:
+            raise KeyError("MirrorDict.inverse.popitem() dictionary is empty.")
+        v = next(reversed(val.keys()))
+        return v, self._mirror.pop(v)
+
+    def values(self):
+        return self._inv().values()
+
+    def __str__(self):
+        return f"MirrorDictInverse({self._inv()})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return len(self._inv())
+
+    def __iter__(self):
+        return iter(self._inv())
+
+    def __reversed__(self):
+        return reversed(self._inv().keys())
+
+    def __contains__(self, key):
+        return key in self._inv() or key in self._mirror._key
+
+    def __setitem__(self, key, value):
+        self._mirror._update(value, key)
+
+    def __getitem__(self, key):
+        val = self._inv()
+        if key in val:
+            return val[key]
+        if key in self._mirror._key:
+            return self._mirror._key[key]
+        raise KeyError(f'MirrorDict.inverse[key] does not have key="{key}".')
+
+    def __delitem__(self, key):
+        del self._mirror[key]
+
+    def __eq__(self, other):
+        if isinstance(other, MirrorDictInverse):
+            return self._inv() == other._inv()
+        if isinstance(other, MirrorDict):
+            return self._inv() == other._key
+        return self._inv() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+# %% -----------------------------------------------------------------------------------------------
+# Specialized variants, defined in submodules since they build on MirrorDict.
+# They are imported on first access, so `import MirrorDict` only loads this module.
+
+_SUBMODULES = {
+    "SharedMirrorDict": "shared",
+    "IntMirrorDict": "typed",
+    "StrIntMirrorDict": "typed",
+    "EncoderMirrorDict": "encoder",
+    "InstrumentedMirrorDict": "stats",
+    "FilteredMirrorDict": "filtered",
+    "LazyMirrorDict": "lazy",
+    "IndexedMirrorDict": "indexed",
+    "MirrorTransaction": "transaction",
+    "WeakMirrorDict": "weak",
+    "ChainMirror": "chain",
+    "ComposedMirror": "compose",
+    "PersistentMirrorDict": "persistent",
+    "MirrorSnapshot": "persistent",
+    "NormalizedMirrorDict": "normalized",
+    "normalize_text": "normalized",
+    "MirrorDictServer": "server",
+    "MirrorDictClient": "server",
+    "MirrorManager": "managed",
+    "MirrorDictProxy": "managed",
+    "register_mirror": "managed",
+    "create_mirror": "backends",
+    "register_backend": "backends",
+    "get_backend": "backends",
+    "available_backends": "backends",
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        from importlib import import_module
+
+        value = getattr(import_module(f".{_SUBMODULES[name]}", __name__), name)
+        globals()[name] = value  # later access skips __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
 # %% -----------------------------------------------------------------------------------------------
 
 
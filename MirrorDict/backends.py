@@ -0,0 +1,126 @@
+"""
+MirrorDict Backends Module
+
+This module defines a registry of named storage backends for mirrors, so code can
+select a storage engine by name (e.g. from a config file or command line option)
+and optional engines are imported only when they are selected.
+
+A backend is a callable, usually a class, that is called as `factory(*args, **kwargs)`
+and returns a mirror that implements the `MirrorDict` mapping interface:
+    - `m[x]`, `m.get(x, default)`, and `x in m` look up `x` as either a key or a value.
+    - `len(m)`, `iter(m)`, `m.keys()`, `m.values()`, and `m.items()` are over the pairs
+      as they were set, keys first.
+    - Mutable backends also support `m[key] = value`, `del m[x]`, `m.pop(x, default)`,
+      `m.update(...)`, and `m.clear()` with the same mirror rules as `MirrorDict`.
+
+A backend is registered either as the callable itself, or as a "module:attribute"
+string that is imported on the first `get_backend()` or `create_mirror()` call for
+that name, so registering an engine with heavy dependencies costs nothing until used.
+
+Built-in backends:
+    "dict":         `MirrorDict`, two Python dicts.
+    "lazy":         `LazyMirrorDict`, builds the inverse dict only when first needed.
+    "int":          `IntMirrorDict`, int<->int pairs in packed arrays.
+    "strint":       `StrIntMirrorDict`, str<->int pairs in packed arrays.
+    "shared":       `SharedMirrorDict.create`, read-only str/int pairs in shared memory.
+    "indexed":      `IndexedMirrorDict`, supports secondary indexes.
+    "instrumented": `InstrumentedMirrorDict`, records counters and latency histograms.
+    "weak":         `WeakMirrorDict`, pairs are removed when either object is collected.
+    "persistent":   `PersistentMirrorDict`, keeps every version in shared persistent tries.
+
+Example Usage:
+    >>> from MirrorDict import create_mirror, register_backend
+    >>> md = create_mirror("int", {1: 100, 2: 200})
+    >>> md[200]
+    2
+    >>> register_backend("fast", "mypackage.engine:FastMirror")   # not imported yet
+"""
+
+from importlib import import_module
+
+__all__ = ["create_mirror", "register_backend", "get_backend", "available_backends"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_BACKENDS = {
+    "dict": "MirrorDict:MirrorDict",
+    "lazy": "MirrorDict.lazy:LazyMirrorDict",
+    "int": "MirrorDict.typed:IntMirrorDict",
+    "strint": "MirrorDict.typed:StrIntMirrorDict",
+    "shared": "MirrorDict.shared:SharedMirrorDict.create",
+    "indexed": "MirrorDict.indexed:IndexedMirrorDict",
+    "instrumented": "MirrorDict.stats:InstrumentedMirrorDict",
+    "weak": "MirrorDict.weak:WeakMirrorDict",
+    "persistent": "MirrorDict.persistent:PersistentMirrorDict",
+}
+
+
+def register_backend(name, factory, replace=False):
+    """
+    Register a storage backend under `name`.
+
+    Args:
+        name (str): Name used to select the backend.
+        factory (callable or str): Callable that creates the mirror, or a
+                                   "module:attribute" string naming it, which is
+                                   imported the first time the backend is selected.
+        replace (bool): If False (default), raise ValueError if `name` is already registered.
+    """
+    if not isinstance(name, str):
+        raise TypeError(f"register_backend() expected name to be a str, but received: {name!r}")
+    if isinstance(factory, str):
+        if ":" not in factory:
+            raise ValueError(f'register_backend() expected factory string as "module:attribute", but received: {factory!r}')
+    elif not callable(factory):
+        raise TypeError(f"register_backend() expected factory to be callable or a str, but received: {factory!r}")
+    if not replace and name in _BACKENDS:
+        raise ValueError(f'register_backend() backend "{name}" is already registered, use replace=True to override.')
+    _BACKENDS[name] = factory
+
+
+def get_backend(name):
+    """
+    Return the factory registered as `name`, importing it if it was registered by name.
+
+    Raises:
+        KeyError: If no backend is registered as `name`.
+        ImportError: If the backend's module cannot be imported, e.g. a missing optional dependency.
+    """
+    try:
+        factory = _BACKENDS[name]
+    except KeyError:
+        raise KeyError(
+            f'get_backend() has no backend named "{name}", available backends are: {available_backends()}'
+        ) from None
+
+    if isinstance(factory, str):
+        module, attr = factory.split(":", 1)
+        factory = import_module(module)
+        for part in attr.split("."):
+            factory = getattr(factory, part)
+        _BACKENDS[name] = factory  # later calls skip the import
+    return factory
+
+
+def available_backends():
+    """
+    Return the sorted names of the registered backends.
+    """
+    return sorted(_BACKENDS)
+
+
+def create_mirror(backend, /, *args, **kwargs):
+    """
+    Create a mirror with the storage backend named `backend`.
+
+    The remaining arguments are passed to the backend's factory, for most backends
+    they are the same as for `MirrorDict(*args, **kwargs)`.
+
+    Example:
+        >>> md = create_mirror("lazy", a=1, b=2)
+        >>> md[2]
+        'b'
+    """
+    return get_backend(backend)(*args, **kwargs)
@@ -0,0 +1,173 @@
+"""
+MirrorDict Bulk Removal Module
+
+This module implements `MirrorDict.remove_many()`, `MirrorDict.discard_many()`,
+`MirrorDict.retain()`, and `MirrorDict.filter()`, which remove (or select) many pairs
+in one call instead of a `pop()` per item.
+
+The removals are done in two steps:
+    1. The pairs to remove are found first, by resolving each item as a key or a value
+       (or by calling the predicate on each pair), without changing the mirror, so a
+       missing item or an error raised by the predicate leaves the mirror unchanged.
+    2. If they are more than `_REBUILD_RATIO` of the pairs, the key and value dicts are
+       rebuilt in place with the pairs that are kept, which is faster than deleting
+       them one at a time and leaves no deleted entries behind, as `compact()` does.
+       Otherwise, they are deleted from both dicts.
+
+The methods return the number of removed pairs, or with `return_pairs=True`, the list
+of the removed (key, value) pairs, in the order of the items that removed them for
+`remove_many()` and `discard_many()`, and in the order of the mirror for `retain()`. Subclasses that hook into the mutations (e.g.
+`IndexedMirrorDict`) have each pair removed with `pop()`.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDict
+    >>> md = MirrorDict((f"session-{i}", i) for i in range(10))
+    >>> md.remove_many(["session-1", 2, "session-3"])
+    3
+    >>> md.retain(lambda key, value: value % 2 == 0)
+    3
+    >>> md
+    MirrorDict({'session-0': 0, 'session-4': 4, 'session-6': 6, 'session-8': 8})
+"""
+
+from collections.abc import Sized
+
+from . import MirrorDict
+
+__all__ = ["remove_many", "retain", "filter_pairs"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_REBUILD_RATIO = 0.5  # fraction of the pairs removed above which both dicts are rebuilt
+_MISSING = object()
+
+
+def _rebuild(md, doomed):
+    """
+    Rebuild the key and value dicts of a MirrorDict in place without the pairs whose
+    keys are in `doomed`, leaving no deleted entries, as `compact()` does.
+    """
+    key, val = md._key, md._val
+    kept_key = {k: v for k, v in key.items() if k not in doomed}
+    kept_val = {v: k for v, k in val.items() if k not in doomed}
+    key.clear()  # rebuilt in place, so existing keys(), values(), and items() views stay valid
+    key.update(kept_key)
+    val.clear()
+    val.update(kept_val)
+    md._churn = 0
+    md._resets += 1
+    if md._compact_ratio is not None:
+        md._set_compact_at()
+
+
+def _pairs_in_order(key, val, items):
+    """
+    Return the (key, value) pairs of the `items` found in the dicts, in the order of
+    their first item, as the removals one item at a time return them.
+    """
+    pairs = {}
+    for x in items:
+        if x in key:
+            pairs.setdefault(x, key[x])
+        elif x in val:
+            pairs.setdefault(val[x], x)
+    return list(pairs.items())
+
+
+def _remove(md, doomed, return_pairs):
+    """
+    Remove the `doomed` pairs, a dict of key -> value, from a MirrorDict.
+    """
+    if len(doomed) > _REBUILD_RATIO * len(md._key):
+        _rebuild(md, doomed)
+    elif doomed:
+        key, val = md._key, md._val
+        for k, v in doomed.items():
+            del key[k]
+            del val[v]
+        md._removed(2 * len(doomed))
+    return list(doomed.items()) if return_pairs else len(doomed)
+
+
+def remove_many(md, items, missing_ok=False, return_pairs=False):
+    """
+    See `MirrorDict.remove_many` and `MirrorDict.discard_many`.
+    """
+    method = "discard_many" if missing_ok else "remove_many"
+    if isinstance(items, str) or not hasattr(items, "__iter__"):
+        raise TypeError(f"MirrorDict.{method}() expected an iterable of keys or values but received: {items}")
+    if not isinstance(items, Sized):
+        items = list(items)
+
+    if type(md) is not MirrorDict:
+        doomed = {}
+        for x in items:
+            pair = md._pair_of(x)
+            if pair is not None:
+                doomed[pair[0]] = pair[1]
+            elif not missing_ok:
+                raise KeyError(f'MirrorDict.{method}(items): item="{x}" not found, no items were removed.')
+        for k in doomed:
+            md.pop(k)
+        return list(doomed.items()) if return_pairs else len(doomed)
+
+    key, val = md._key, md._val
+    if not missing_ok:  # set differences with dicts run at C speed in the size of the set
+        missing = set(items).difference(key).difference(val)
+        if missing:
+            x = next(x for x in items if x in missing)
+            raise KeyError(f'MirrorDict.{method}(items): item="{x}" not found, no items were removed.')
+
+    if len(items) > _REBUILD_RATIO * len(key):
+        wanted = set(items)
+        doomed = wanted.intersection(key)
+        doomed.update(map(val.__getitem__, wanted.intersection(val)))
+        if len(doomed) > _REBUILD_RATIO * len(key):
+            pairs = _pairs_in_order(key, val, items) if return_pairs else None
+            _rebuild(md, doomed)
+            return pairs if return_pairs else len(doomed)
+
+    # one dict.pop per item, an item whose pair was already removed is skipped
+    pairs = []
+    pop_key, pop_val = key.pop, val.pop
+    for x in items:
+        v = pop_key(x, _MISSING)
+        if v is not _MISSING:
+            del val[v]
+            pairs.append((x, v))
+            continue
+        k = pop_val(x, _MISSING)
+        if k is not _MISSING:
+            del key[k]
+            pairs.append((k, x))
+    if pairs:
+        md._removed(2 * len(pairs))
+    return pairs if return_pairs else len(pairs)
+
+
+def retain(md, predicate, return_pairs=False):
+    """
+    See `MirrorDict.retain`.
+    """
+    doomed = {k: v for k, v in md.items() if not predicate(k, v)}
+    if type(md) is MirrorDict:
+        return _remove(md, doomed, return_pairs)
+    for k in doomed:
+        md.pop(k)
+    return list(doomed.items()) if return_pairs else len(doomed)
+
+
+def filter_pairs(md, predicate):
+    """
+    See `MirrorDict.filter`.
+    """
+    if type(md) is not MirrorDict:
+        return MirrorDict([(k, v) for k, v in md.items() if predicate(k, v)])
+    key = {k: v for k, v in md._key.items() if predicate(k, v)}
+    result = MirrorDict()
+    result._key = key
+    result._val = {v: k for v, k in md._val.items() if k in key} if len(key) < len(md._key) else md._val.copy()
+    return result
+
@@ -0,0 +1,289 @@
+"""
+ChainMirror Module
+
+This module defines the `ChainMirror` class, a writable overlay on a read-only base
+mirror, for per-request or per-tenant overrides of a large shared `MirrorDict`
+without copying it.
+
+A `ChainMirror` reads as if the overrides were applied to a copy of the base with
+`update()`, with the same mirror rules:
+    - An override `k: v` hides every base pair that has `k` or `v` as its key or value,
+      in both directions, so `chain[v]` returns `k` and the base partners of `k` and `v`
+      are no longer found.
+    - Deleting an item removes the override that has it, or hides its base pair.
+
+The overrides are stored in a small `MirrorDict` and the hidden base pairs in a set
+of their keys, so creating a `ChainMirror` is O(1) and its memory is O(overrides).
+The base is never modified, and must not be modified while overlays use it. Overlays
+can be stacked with `new_child()`, and `to_mirror()` builds the combined `MirrorDict`.
+
+Iteration yields the visible base pairs in base order, then the overrides in the
+order they were set.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDict
+    >>> base = MirrorDict({"en": 1, "fr": 2, "de": 3})
+    >>> chain = base.overlay({"es": 2})     # es takes id 2, hiding fr:2
+    >>> chain[2], "fr" in chain, base[2]
+    ('es', False, 'fr')
+    >>> chain.to_mirror()
+    MirrorDict({'en': 1, 'de': 3, 'es': 2})
+"""
+
+from collections.abc import ItemsView, KeysView, Mapping, MutableMapping, ValuesView
+
+from . import MirrorDict
+
+__all__ = ["ChainMirror"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class _ChainKeysView(KeysView):
+    def __contains__(self, key):
+        pair = self._mapping._pair(key)
+        return pair is not None and pair[0] == key
+
+    def __iter__(self):
+        for k, _ in self._mapping._iter_items():
+            yield k
+
+
+class _ChainValuesView(ValuesView):
+    def __contains__(self, value):
+        pair = self._mapping._pair(value)
+        return pair is not None and pair[1] == value
+
+    def __iter__(self):
+        for _, v in self._mapping._iter_items():
+            yield v
+
+
+class _ChainItemsView(ItemsView):
+    def __contains__(self, item):
+        key, value = item
+        pair = self._mapping._pair(key)
+        return pair is not None and pair[0] == key and pair[1] == value
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class ChainMirror(MutableMapping):
+    """
+    A writable overlay of override pairs on a read-only base mirror, with two-way
+    lookups that see the base as changed by the overrides.
+
+    Args:
+        base (MirrorDict or ChainMirror): The mirror to overlay, which is not modified.
+        *args, **kwargs: Initial overrides, applied in order as by `update()`.
+
+    Attributes:
+        base: The base mirror.
+        overlay (MirrorDict): The override pairs, do not modify it directly.
+
+    Example Usage:
+        >>> chain = ChainMirror(MirrorDict(a=1, b=2))
+        >>> chain["c"] = 1      # hides a:1
+        >>> dict(chain.items())
+        {'b': 2, 'c': 1}
+    """
+
+    def __init__(self, base, *args, **kwargs):
+        if not isinstance(base, (MirrorDict, ChainMirror)):
+            raise TypeError(f"ChainMirror() expected the base to be a MirrorDict or ChainMirror, but received: {type(base)}")
+        from .normalized import NormalizedMirrorDict
+
+        if isinstance(base, NormalizedMirrorDict):
+            raise TypeError("ChainMirror() is not supported for a NormalizedMirrorDict base.")
+        self.base = base
+        self.overlay = MirrorDict()
+        self._hidden = set()  # keys of the base pairs that are hidden
+        self.update(*args, **kwargs)
+
+    def _base_pair(self, x):
+        """
+        Return the (key, value) pair of the base that has `x` as its key or value, or None.
+        """
+        base = self.base
+        if type(base) is ChainMirror:
+            return base._pair(x)
+        if base._val is None:  # LazyMirrorDict builds its inverse on demand
+            base._inverse()
+        if x in base._key:
+            return x, base._key[x]
+        if x in base._val:
+            return base._val[x], x
+        return None
+
+    def _pair(self, x):
+        """
+        Return the visible (key, value) pair that has `x` as its key or value, or None.
+        """
+        overlay = self.overlay
+        if x in overlay._key:
+            return x, overlay._key[x]
+        if x in overlay._val:
+            return overlay._val[x], x
+        pair = self._base_pair(x)
+        if pair is None or pair[0] in self._hidden:
+            return None
+        return pair
+
+    def _base_items(self):
+        hidden = self._hidden
+        if not hidden:
+            return iter(self.base.items())
+        return ((k, v) for k, v in self.base.items() if k not in hidden)
+
+    def clear(self):
+        """
+        Remove all items, which hides every base pair, O(len(base)).
+        """
+        self.overlay.clear()
+        self._hidden.update(k for k, _ in self._base_items())
+        return self
+
+    def copy(self):
+        """
+        Return a ChainMirror on the same base with a copy of the overrides, O(overrides).
+        """
+        chain = ChainMirror(self.base)
+        chain.overlay = self.overlay.copy()
+        chain._hidden = self._hidden.copy()
+        return chain
+
+    def get(self, key, default=None):
+        pair = self._pair(key)
+        if pair is None:
+            return default
+        return pair[1] if pair[0] == key else pair[0]
+
+    def items(self):
+        """
+        Return a view of the visible base pairs in base order, then the overrides.
+        """
+        return _ChainItemsView(self)
+
+    def keys(self):
+        """
+        Return a view of the keys of the visible base pairs, then of the overrides.
+        """
+        return _ChainKeysView(self)
+
+    def new_child(self, *args, **kwargs):
+        """
+        Return a new ChainMirror with this one as its base and the given overrides.
+        """
+        return ChainMirror(self, *args, **kwargs)
+
+    def pop(self, key, default=KeyError):
+        pair = self._pair(key)
+        if pair is None:
+            if default is not KeyError:
+                return default
+            raise KeyError(f'ChainMirror.pop(key, default) key="{key}" not found and default=KeyError.')
+        self._remove(pair)
+        return pair[1] if pair[0] == key else pair[0]
+
+    def popitem(self):
+        """
+        Remove and return the last override, or if there are none, the last visible
+        base pair, which is O(len(base)).
+        """
+        if len(self.overlay):
+            return self.overlay.popitem()
+        pairs = list(self._base_items())
+        if not pairs:
+            raise KeyError("ChainMirror.popitem() dictionary is empty.")
+        self._hidden.add(pairs[-1][0])
+        return pairs[-1]
+
+    def to_mirror(self):
+        """
+        Return a `MirrorDict` with the visible pairs.
+        """
+        return MirrorDict(self.items())
+
+    def update(self, *args, **kwargs):
+        """
+        Add overrides from mappings, iterables, or keyword arguments, in order.
+        """
+        for arg in args:
+            if isinstance(arg, (Mapping, MirrorDict)):
+                pairs = arg.items()
+            elif hasattr(arg, "__iter__") and not isinstance(arg, str):
+                pairs = arg
+            else:
+                raise TypeError(
+                    f"ChainMirror.update() expected a dict-like or an iterable of key-value pairs but received: {arg}"
+                )
+            for key, val in pairs:
+                self[key] = val
+        for key, val in kwargs.items():
+            self[key] = val
+        return self
+
+    def values(self):
+        """
+        Return a view of the values of the visible base pairs, then of the overrides.
+        """
+        return _ChainValuesView(self)
+
+    def _iter_items(self):
+        yield from self._base_items()
+        yield from self.overlay.items()
+
+    def _remove(self, pair):
+        key = pair[0]
+        if key in self.overlay._key:
+            del self.overlay[key]
+        else:
+            self._hidden.add(key)
+
+    def __str__(self):
+        return f"ChainMirror({dict(self.items())})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return len(self.base) - len(self._hidden) + len(self.overlay)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return self._pair(key) is not None
+
+    def __setitem__(self, key, value):
+        hide = (self._base_pair(key), self._base_pair(value))
+        self.overlay[key] = value  # raises for an unhashable key or value before anything changes
+        for pair in hide:
+            if pair is not None:
+                self._hidden.add(pair[0])
+
+    def __getitem__(self, key):
+        pair = self._pair(key)
+        if pair is None:
+            raise KeyError(f'ChainMirror[key] does not have key="{key}".')
+        return pair[1] if pair[0] == key else pair[0]
+
+    def __delitem__(self, key):
+        pair = self._pair(key)
+        if pair is None:
+            raise KeyError(f'del ChainMirror[key] does not have key="{key}".')
+        self._remove(pair)
+
+    def __eq__(self, other):
+        if isinstance(other, ChainMirror):
+            other = dict(other.items())
+        elif isinstance(other, MirrorDict):
+            other = other._key
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
@@ -0,0 +1,245 @@
+"""
+EncoderMirrorDict Module
+
+This module defines the `EncoderMirrorDict` class, a mirror between hashable labels
+and dense integer ids (0, 1, 2, ...) that are assigned automatically in the
+order the labels are first seen.
+
+It replaces the label encoder pattern `md.setdefault(label, len(md))` on a
+`MirrorDict`. The forward side is a dict of `label:id` and the inverse side is a
+plain list indexed by id, so decoding an id is list indexing with no hashing.
+`encode()` and `decode()` translate whole iterables in bulk.
+
+Example Usage:
+    >>> from MirrorDict import EncoderMirrorDict
+    >>> enc = EncoderMirrorDict()
+    >>> enc.encode(["red", "green", "red", "blue"])
+    [0, 1, 0, 2]
+    >>> enc.decode([2, 0])
+    ['blue', 'red']
+    >>> enc["green"], enc[1]
+    (1, 'green')
+"""
+
+from collections.abc import ItemsView, KeysView, Mapping, ValuesView
+
+from . import MirrorDict
+
+__all__ = ["EncoderMirrorDict"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class _Codes(dict):
+    """
+    label:id dict that assigns the next id to a missing label on `codes[label]`,
+    so bulk encoding can run as `map(codes.__getitem__, labels)`.
+    """
+
+    __slots__ = ("labels",)
+
+    def __missing__(self, label):
+        code = len(self.labels)
+        self[label] = code
+        self.labels.append(label)
+        return code
+
+
+class _EncoderKeysView(KeysView):
+    def __contains__(self, label):
+        return label in self._mapping._key
+
+
+class _EncoderItemsView(ItemsView):
+    def __contains__(self, item):
+        label, code = item
+        return code is not None and self._mapping._key.get(label, None) == code
+
+    def __iter__(self):
+        return iter(self._mapping._key.items())
+
+
+class _EncoderValuesView(ValuesView):
+    def __contains__(self, code):
+        return type(code) is int and 0 <= code < len(self._mapping)
+
+    def __iter__(self):
+        return iter(range(len(self._mapping)))
+
+
+class EncoderMirrorDict(Mapping):
+    """
+    A mirror between hashable labels (keys) and dense integer ids (values).
+
+    Each new label is assigned the next id, `len(self)`, the first time it is encoded.
+    Lookups follow the `MirrorDict` rules: `md[label]` returns the id and `md[id]`
+    returns the label, with labels checked before ids.
+
+    Ids are positions in the label list, so pairs cannot be removed individually,
+    only all at once with `clear()`.
+
+    Example Usage:
+        >>> enc = EncoderMirrorDict(["a", "b"])
+        >>> enc.add("c")
+        2
+        >>> enc.encode(["c", "a", "d"])
+        [2, 0, 3]
+        >>> print(enc)
+        EncoderMirrorDict({'a': 0, 'b': 1, 'c': 2, 'd': 3})
+    """
+
+    _key: _Codes
+    _labels: list
+
+    def __init__(self, labels=()):
+        """
+        Initialize an EncoderMirrorDict instance.
+
+        Args:
+            labels: An iterable of hashable labels that are assigned ids in order.
+                    Repeated labels keep their first id.
+        """
+        self._labels = []
+        self._key = _Codes()
+        self._key.labels = self._labels
+        self.encode(labels)
+
+    def add(self, label):
+        """
+        Return the id of `label`, assigning the next id if it is new.
+        """
+        return self._key[label]
+
+    def clear(self):
+        """
+        Remove all labels and reset the next id to 0.
+        """
+        self._key.clear()
+        self._labels.clear()
+        return self
+
+    def copy(self):
+        """
+        Return a shallow copy of the EncoderMirrorDict instance.
+        """
+        return EncoderMirrorDict(self._labels)
+
+    def decode(self, codes):
+        """
+        Translate an iterable of ids into a list of labels.
+
+        Raises:
+            IndexError: If an id is out of range, including negative ids.
+        """
+        codes = codes if isinstance(codes, list) else list(codes)
+        labels = list(map(self._labels.__getitem__, codes))
+        if codes and min(codes) < 0:  # list indexing would wrap around
+            raise IndexError(f"EncoderMirrorDict.decode(codes): id={min(codes)} is out of range.")
+        return labels
+
+    def encode(self, labels, add=True):
+        """
+        Translate an iterable of labels into a list of ids.
+
+        Args:
+            labels: An iterable of hashable labels.
+            add (bool): If True, new labels are assigned the next id.
+                        If False, new labels raise a `KeyError`.
+
+        Raises:
+            KeyError: If `add` is False and a label is not defined.
+            TypeError: If a label is not hashable.
+        """
+        if add:
+            return list(map(self._key.__getitem__, labels))
+        labels = list(labels)
+        codes = list(map(self._key.get, labels))
+        if None in codes:
+            label = labels[codes.index(None)]
+            raise KeyError(f'EncoderMirrorDict.encode(labels, add=False) label="{label}" is not defined.')
+        return codes
+
+    def get(self, key, default=None):
+        """
+        Return the id for a label, or the label for an id, else default.
+        """
+        code = self._key.get(key, None)
+        if code is not None:
+            return code
+        if type(key) is int and 0 <= key < len(self._labels):
+            return self._labels[key]
+        return default
+
+    def items(self):
+        """
+        Iterate over label-id pairs in id order.
+        """
+        return _EncoderItemsView(self)
+
+    def keys(self):
+        """
+        Return an iterator over the labels in id order.
+        """
+        return _EncoderKeysView(self)
+
+    def setdefault(self, key, default=None):
+        """
+        Return the id of the label `key`, assigning the next id if it is new.
+
+        Provided for compatibility with the `md.setdefault(label, len(md))` pattern,
+        `default` must be None or equal to `len(self)`.
+
+        Raises:
+            ValueError: If `key` is new and `default` is not the next id.
+        """
+        code = self._key.get(key, None)
+        if code is not None:
+            return code
+        if default is not None and default != len(self._labels):
+            raise ValueError(
+                f"EncoderMirrorDict.setdefault(key, default): ids are assigned densely, so default must be None "
+                f"or {len(self._labels)}, but received default={default}."
+            )
+        return self._key[key]
+
+    def values(self):
+        """
+        Return an iterator over the ids, which is `range(len(self))`.
+        """
+        return _EncoderValuesView(self)
+
+    def __str__(self):
+        return f"EncoderMirrorDict({dict(self._key)})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def __iter__(self):
+        return iter(self._labels)
+
+    def __contains__(self, key):
+        return key in self._key or (type(key) is int and 0 <= key < len(self._labels))
+
+    def __getitem__(self, key):
+        code = self._key.get(key, None)
+        if code is not None:
+            return code
+        if type(key) is int and 0 <= key < len(self._labels):
+            return self._labels[key]
+        raise KeyError(f'EncoderMirrorDict[key] does not have key="{key}".')
+
+    def __eq__(self, other):  # compare self == other.
+        if isinstance(other, EncoderMirrorDict):
+            return self._labels == other._labels
+        if isinstance(other, MirrorDict):
+            return dict(self._key) == other._key
+        return dict(self._key) == other
+
+    def __ne__(self, other):  # compare self != other.
+        return not self == other
+
+    __hash__ = None
@@ -0,0 +1,806 @@
+"""
+IndexedMirrorDict Module
+
+This module defines the `IndexedMirrorDict` class, a `MirrorDict` subclass that keeps
+secondary indexes on its keys and/or values in sync with every mutation, and the
+indexes that can be attached to it.
+
+A plain `MirrorDict` is converted in place the first time an index is added to it
+(e.g. `md.add_sorted_index()`), by swapping the class of the instance, so mirrors
+without indexes pay nothing for the bookkeeping.
+
+Every index receives `_add(key, val)` when a pair is added, `_remove(key, val)` when
+a pair is removed (including the pairs evicted by `_update`), and `_clear()`.
+Before a pair is added, `_check(key, val)` may raise to reject it while the
+mirror is still unchanged.
+
+Indexes:
+    - `SortedIndex`: sorted keys or values for `irange`, `floor`, and `ceiling` queries.
+    - `PrefixIndex`: sorted str keys or values for `prefix` (autocomplete) queries.
+    - `OrderIndex`: positions of the pairs in `keys()` order for `item_at`, `index_of`,
+      and `islice` queries.
+    - `GroupIndex`: pairs grouped by a user function of their key or value, for
+      `query` by group.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDict
+    >>> md = MirrorDict({100: "start", 250: "middle", 400: "end"})
+    >>> md.add_sorted_index(side="key")
+    >>> list(md.irange(200, 400))
+    [250, 400]
+    >>> md.floor(300), md.ceiling(300)
+    (250, 400)
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Hashable
+
+from . import MirrorDict, _raise_unhashable
+
+__all__ = ["IndexedMirrorDict", "SortedIndex", "PrefixIndex", "OrderIndex", "GroupIndex"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_SIDES = ("key", "value")
+
+
+def _check_side(side, method, allow_both=False):
+    if side in _SIDES or (allow_both and side == "both"):
+        return
+    options = '"key", "value", or "both"' if allow_both else '"key" or "value"'
+    raise ValueError(f'MirrorDict.{method}(): side must be {options}, but received side="{side}".')
+
+
+class _SortedList:
+    """
+    Sorted multiset stored as a list of sorted buckets, so inserts and removals
+    move at most `2 * _LOAD` items and searches are two bisects.
+    """
+
+    _LOAD = 512
+
+    def __init__(self, items=()):
+        items = sorted(items)
+        load = self._LOAD
+        self._lists = [items[i : i + load] for i in range(0, len(items), load)]
+        self._maxes = [bucket[-1] for bucket in self._lists]
+        self._len = len(items)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for bucket in self._lists:
+            yield from bucket
+
+    def clear(self):
+        self._lists = []
+        self._maxes = []
+        self._len = 0
+
+    def add(self, item):
+        lists, maxes = self._lists, self._maxes
+        self._len += 1
+        if not maxes:
+            lists.append([item])
+            maxes.append(item)
+            return
+        i = bisect_right(maxes, item)
+        if i == len(maxes):
+            i -= 1
+            lists[i].append(item)
+            maxes[i] = item
+        else:
+            insort(lists[i], item)
+        if len(lists[i]) > 2 * self._LOAD:
+            half = lists[i][self._LOAD :]
+            del lists[i][self._LOAD :]
+            maxes[i] = lists[i][-1]
+            lists.insert(i + 1, half)
+            maxes.insert(i + 1, half[-1])
+
+    def remove(self, item):
+        lists, maxes = self._lists, self._maxes
+        i = bisect_left(maxes, item)
+        bucket = lists[i]
+        j = bisect_left(bucket, item)
+        del bucket[j]
+        self._len -= 1
+        if not bucket:
+            del lists[i]
+            del maxes[i]
+        elif j == len(bucket):
+            maxes[i] = bucket[-1]
+
+    def _position(self, item, right):
+        """
+        Return the (bucket, index) of the first item >= `item`, or > `item` if `right`.
+        """
+        search = bisect_right if right else bisect_left
+        i = search(self._maxes, item)
+        if i == len(self._maxes):
+            return i, 0
+        return i, search(self._lists[i], item)
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True), reverse=False):
+        start = (0, 0) if minimum is None else self._position(minimum, not inclusive[0])
+        stop = (len(self._lists), 0) if maximum is None else self._position(maximum, inclusive[1])
+        if stop <= start:
+            return iter(())
+        if reverse:
+            return self._iter_reverse(start, stop)
+        return self._iter(start, stop)
+
+    def _iter(self, start, stop):
+        lists = self._lists
+        (i, j), (i1, j1) = start, stop
+        while i < len(lists) and (i, j) < (i1, j1):
+            bucket = lists[i]
+            for k in range(j, j1 if i == i1 else len(bucket)):
+                yield bucket[k]
+            i, j = i + 1, 0
+
+    def _iter_reverse(self, start, stop):
+        lists = self._lists
+        (i0, j0), (i, j) = start, stop
+        if j == 0:  # stop is the start of bucket i, so begin at the end of bucket i - 1
+            i -= 1
+            j = len(lists[i])
+        while i >= i0:
+            bucket = lists[i]
+            for k in range(j - 1, (j0 if i == i0 else 0) - 1, -1):
+                yield bucket[k]
+            i -= 1
+            if i >= 0:
+                j = len(lists[i])
+
+    def floor(self, item):
+        i, j = self._position(item, True)
+        if j > 0:
+            return True, self._lists[i][j - 1]
+        if i > 0:
+            return True, self._lists[i - 1][-1]
+        return False, None
+
+    def ceiling(self, item):
+        i, j = self._position(item, False)
+        if i < len(self._lists):
+            return True, self._lists[i][j]
+        return False, None
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class SortedIndex:
+    """
+    Sorted index of the keys or the values of an `IndexedMirrorDict`.
+
+    Items on the indexed side must be mutually comparable, pairs that are not
+    comparable with the items already in the index raise a `TypeError` and are not added.
+    """
+
+    def __init__(self, side, items=()):
+        self.side = side
+        self._is_key = side == "key"
+        self._items = _SortedList(items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _check(self, key, val):
+        item = key if self._is_key else val
+        if len(self._items):
+            sample = self._items._lists[0][0]
+            try:
+                item < sample
+                sample < item
+            except TypeError:
+                raise TypeError(
+                    f"MirrorDict sorted index on the {self.side}s: {self.side}={item!r} ({type(item)}) is not "
+                    f"comparable with the indexed {self.side}s ({type(sample)})."
+                ) from None
+
+    def _add(self, key, val):
+        self._items.add(key if self._is_key else val)
+
+    def _remove(self, key, val):
+        self._items.remove(key if self._is_key else val)
+
+    def _clear(self):
+        self._items.clear()
+
+
+class PrefixIndex:
+    """
+    Index of the str keys or str values of an `IndexedMirrorDict` for prefix searches.
+
+    The strings are kept sorted, so the matches for a prefix are a contiguous run
+    that is found with a bisect and then read until the first non-match.
+    Items on the indexed side that are not a str are ignored.
+    """
+
+    def __init__(self, side, items=()):
+        self.side = side
+        self._is_key = side == "key"
+        self._items = _SortedList(item for item in items if isinstance(item, str))
+
+    def __len__(self):
+        return len(self._items)
+
+    def search(self, prefix, limit=None):
+        """
+        Return a sorted list of the indexed strings that start with `prefix`, at most `limit` of them.
+        """
+        matches = []
+        if limit is not None and limit <= 0:
+            return matches
+        for item in self._items.irange(prefix):
+            if not item.startswith(prefix):
+                break
+            matches.append(item)
+            if len(matches) == limit:
+                break
+        return matches
+
+    def _check(self, key, val):
+        pass
+
+    def _add(self, key, val):
+        item = key if self._is_key else val
+        if isinstance(item, str):
+            self._items.add(item)
+
+    def _remove(self, key, val):
+        item = key if self._is_key else val
+        if isinstance(item, str):
+            self._items.remove(item)
+
+    def _clear(self):
+        self._items.clear()
+
+
+_DEAD = object()
+
+
+class _OrderList:
+    """
+    Sequence of unique items in insertion order with O(log n) positional access.
+
+    Every item is stored in a slot that is appended when it is added, and a removed
+    item leaves a dead slot behind. A Fenwick tree over the slots counts the live
+    ones, so the position of an item and the item at a position are O(log n).
+    The dead slots are dropped once they outnumber the live ones.
+    """
+
+    def __init__(self, items=()):
+        self._build(list(items))
+
+    def _build(self, slots):
+        self._slots = slots
+        self._slot_of = {item: i for i, item in enumerate(slots)}
+        n = len(slots)
+        tree = [0] * (n + 1)
+        for i in range(1, n + 1):
+            tree[i] += slots[i - 1] is not _DEAD
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def __contains__(self, item):
+        return item in self._slot_of
+
+    def clear(self):
+        self._build([])
+
+    def append(self, item):
+        slots, tree = self._slots, self._tree
+        self._slot_of[item] = len(slots)
+        slots.append(item)
+        i = len(slots)
+        total, j, low = 1, i - 1, i - (i & -i)  # tree[i] is the count of the slots in (low, i]
+        while j > low:
+            total += tree[j]
+            j -= j & -j
+        tree.append(total)
+
+    def remove(self, item):
+        slots, tree = self._slots, self._tree
+        slot = self._slot_of.pop(item)
+        slots[slot] = _DEAD
+        i, n = slot + 1, len(slots)
+        while i <= n:
+            tree[i] -= 1
+            i += i & -i
+        if 2 * len(self._slot_of) < n and n > 64:
+            self._build([item for item in slots if item is not _DEAD])
+
+    def index(self, item):
+        """
+        Return the position of `item`, the number of live slots before its slot.
+        """
+        tree = self._tree
+        i = self._slot_of[item]
+        count = 0
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+    def _slot(self, position):
+        """
+        Return the slot of the item at `position`, which must be in range.
+        """
+        tree = self._tree
+        n = len(tree) - 1
+        slot, remaining = 0, position + 1
+        step = 1 << n.bit_length()
+        while step:
+            if slot + step <= n and tree[slot + step] < remaining:
+                slot += step
+                remaining -= tree[slot]
+            step >>= 1
+        return slot
+
+    def __getitem__(self, position):
+        return self._slots[self._slot(position)]
+
+    def islice(self, start, stop):
+        """
+        Yield the items at positions `start` to `stop`, which must be in range. Live
+        slots are read in sequence and a dead slot is skipped by seeking the next
+        position in the tree, so a run of dead slots costs O(log n), not its length.
+        """
+        slots = self._slots
+        slot = self._slot(start)
+        for position in range(start, stop):
+            if slots[slot] is _DEAD:
+                slot = self._slot(position)
+            yield slots[slot]
+            slot += 1
+
+
+class OrderIndex:
+    """
+    Index of the positions of the pairs of an `IndexedMirrorDict` in `keys()` order.
+
+    Follows the order of the key dict: a new key is added at the end, changing the
+    value of a key keeps its position, and a removed key shifts the ones after it.
+    """
+
+    def __init__(self, keys):
+        self._keys = keys  # the key dict of the mirror, to tell a changed value from a removed key
+        self._items = _OrderList(keys)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _check(self, key, val):
+        pass
+
+    def _add(self, key, val):
+        if key not in self._items:
+            self._items.append(key)
+
+    def _remove(self, key, val):
+        if key not in self._keys:  # otherwise only the value of the key changed
+            self._items.remove(key)
+
+    def _clear(self):
+        self._items.clear()
+
+
+class GroupIndex:
+    """
+    Index of the pairs of an `IndexedMirrorDict` grouped by `func(key)` or `func(value)`.
+
+    Each group holds its pairs in the order they were added, so a query reads only the
+    pairs of the group. The group of each key is stored, so `func` runs once per added
+    pair and never on removal. `func` must return a hashable group, and a pair for which
+    it raises is not added.
+    """
+
+    def __init__(self, side, func, pairs=()):
+        self.side = side
+        self.func = func
+        self._is_key = side == "key"
+        self._groups = {}  # group -> {key: value}
+        self._group_of = {}  # key -> group
+        self._checked = None  # (key, val, group) computed by _check for the next _add
+        for key, val in pairs:
+            self._insert(key, val, self._group(key, val))
+
+    def __len__(self):
+        return len(self._group_of)
+
+    def query(self, group):
+        """
+        Return the (key, value) pairs in `group` in the order they were added.
+        """
+        pairs = self._groups.get(group, None)
+        return [] if pairs is None else list(pairs.items())
+
+    def _group(self, key, val):
+        group = self.func(key if self._is_key else val)
+        try:
+            hash(group)
+        except TypeError:
+            raise TypeError(
+                f"MirrorDict group index: func returned the unhashable group {group!r} ({type(group)}) "
+                f"for key={key!r} and value={val!r}."
+            ) from None
+        return group
+
+    def _insert(self, key, val, group):
+        self._group_of[key] = group
+        pairs = self._groups.get(group, None)
+        if pairs is None:
+            self._groups[group] = {key: val}
+        else:
+            pairs[key] = val
+
+    def _check(self, key, val):
+        self._checked = (key, val, self._group(key, val))
+
+    def _add(self, key, val):
+        checked = self._checked
+        self._checked = None
+        if checked is not None and checked[0] == key and checked[1] == val:
+            group = checked[2]
+        else:
+            group = self._group(key, val)
+        self._insert(key, val, group)
+
+    def _remove(self, key, val):
+        group = self._group_of.pop(key)
+        pairs = self._groups[group]
+        del pairs[key]
+        if not pairs:
+            del self._groups[group]
+
+    def _clear(self):
+        self._groups.clear()
+        self._group_of.clear()
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class IndexedMirrorDict(MirrorDict):
+    """
+    A `MirrorDict` that maintains secondary indexes through `_update`, `pop`,
+    `popitem`, `__delitem__`, and `clear`.
+
+    Instances are usually created by adding an index to a `MirrorDict`, which converts it
+    in place, but the class can also be used directly. `copy()` returns a plain `MirrorDict`.
+
+    Example Usage:
+        >>> md = IndexedMirrorDict({"a": 3, "b": 1, "c": 2})
+        >>> md.add_sorted_index(side="value")
+        >>> list(md.irange(side="value"))
+        [1, 2, 3]
+    """
+
+    _indexes: list  # every attached index, notified of all mutations
+    _sorted: dict  # side -> SortedIndex
+    _prefix: dict  # side -> PrefixIndex
+    _order: "OrderIndex | None"
+    _groups: dict  # name -> GroupIndex
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize an IndexedMirrorDict instance with no indexes, see `MirrorDict.__init__`.
+        """
+        self._indexes = []
+        self._sorted = {}
+        self._prefix = {}
+        self._order = None
+        self._groups = {}
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def _convert(cls, md):
+        """
+        Convert the MirrorDict `md` into an IndexedMirrorDict in place.
+        """
+        if isinstance(md, IndexedMirrorDict):
+            return
+        if type(md) is not MirrorDict:
+            raise TypeError(f"MirrorDict indexes are not supported for subclass {type(md).__name__}.")
+        md.__class__ = cls
+        md._indexes = []
+        md._sorted = {}
+        md._prefix = {}
+        md._order = None
+        md._groups = {}
+
+    def _attach(self, index):
+        self._indexes.append(index)
+        return index
+
+    # -- indexes ------------------------------------------------------------------------------------
+
+    def add_index(self, name, func, side="key"):
+        """
+        Add a group index named `name` of the pairs grouped by `func(key)` (or
+        `func(value)`) that supports `query(name, group)` in time proportional to the
+        number of pairs in the group.
+
+        The index is built in bulk from the current pairs and then kept up to date by
+        every mutation.
+
+        Args:
+            name (str): Name of the index, used by `query()` and `drop_index()`.
+            func (callable): Returns the hashable group of a key or value.
+            side (str): "key" or "value", the side that `func` is applied to.
+
+        Raises:
+            ValueError: If an index named `name` already exists.
+        """
+        _check_side(side, "add_index")
+        if name in self._groups:
+            raise ValueError(f'MirrorDict.add_index(): an index named "{name}" already exists, see drop_index().')
+        self._groups[name] = self._attach(GroupIndex(side, func, self._key.items()))
+
+    def drop_index(self, name):
+        """
+        Remove the group index named `name`.
+
+        Raises:
+            ValueError: If there is no index named `name`.
+        """
+        index = self._group_index(name, "drop_index")
+        del self._groups[name]
+        self._indexes.remove(index)
+
+    def _group_index(self, name, method):
+        if name not in self._groups:
+            raise ValueError(f'MirrorDict.{method}(): no index named "{name}", see add_index().')
+        return self._groups[name]
+
+    def query(self, name, group):
+        """
+        Return the (key, value) pairs in `group` of the group index `name`, in the
+        order they were added.
+
+        Raises:
+            ValueError: If there is no index named `name`.
+        """
+        return self._group_index(name, "query").query(group)
+
+    def add_sorted_index(self, side="key"):
+        """
+        Add a sorted index of the keys, the values, or both that supports the
+        `irange`, `floor`, and `ceiling` queries in O(log n).
+
+        The index is built in bulk from the current pairs and then kept up to date by
+        every mutation. Adding an index that already exists does nothing.
+
+        Args:
+            side (str): "key", "value", or "both".
+
+        Raises:
+            TypeError: If the items on the side are not mutually comparable.
+        """
+        _check_side(side, "add_sorted_index", allow_both=True)
+        for s in _SIDES if side == "both" else (side,):
+            if s not in self._sorted:
+                items = self._key.keys() if s == "key" else self._key.values()
+                self._sorted[s] = self._attach(SortedIndex(s, items))
+
+    def add_prefix_index(self, side="key"):
+        """
+        Add a prefix index of the str keys, the str values, or both that supports
+        `prefix()` queries in time proportional to the number of matches.
+
+        The index is built in bulk from the current pairs and then kept up to date by
+        every mutation. Adding an index that already exists does nothing.
+
+        Args:
+            side (str): "key", "value", or "both".
+        """
+        _check_side(side, "add_prefix_index", allow_both=True)
+        for s in _SIDES if side == "both" else (side,):
+            if s not in self._prefix:
+                items = self._key.keys() if s == "key" else self._key.values()
+                self._prefix[s] = self._attach(PrefixIndex(s, items))
+
+    def add_order_index(self):
+        """
+        Add an index of the positions of the pairs in `keys()` order that supports
+        `item_at()`, `index_of()`, and `islice()` in O(log n).
+
+        The index is built from the current pairs and then kept up to date by every
+        mutation. Adding the index when it already exists does nothing.
+        """
+        if self._order is None:
+            self._order = self._attach(OrderIndex(self._key))
+
+    def prefix(self, prefix, side="key", limit=None):
+        """
+        Return the str keys (or values) that start with `prefix` in sorted order.
+
+        Args:
+            prefix (str): The prefix to search for.
+            side (str): "key" or "value", the side with a prefix index.
+            limit (int, optional): Maximum number of matches to return.
+
+        Raises:
+            ValueError: If there is no prefix index on `side`.
+        """
+        _check_side(side, "prefix")
+        if side not in self._prefix:
+            raise ValueError(f'MirrorDict.prefix(): no prefix index on side="{side}", see add_prefix_index().')
+        return self._prefix[side].search(prefix, limit)
+
+    def _sorted_index(self, side, method):
+        _check_side(side, method)
+        if side not in self._sorted:
+            raise ValueError(f'MirrorDict.{method}(): no sorted index on side="{side}", see add_sorted_index().')
+        return self._sorted[side]._items
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True), reverse=False, side="key"):
+        """
+        Iterate in sorted order over the keys (or values) between `minimum` and `maximum`.
+
+        Args:
+            minimum: Lower bound, or None for no lower bound.
+            maximum: Upper bound, or None for no upper bound.
+            inclusive (tuple[bool, bool]): Whether the minimum and maximum are included.
+            reverse (bool): Iterate from largest to smallest.
+            side (str): "key" or "value", the side with a sorted index.
+
+        Raises:
+            ValueError: If there is no sorted index on `side`.
+        """
+        return self._sorted_index(side, "irange").irange(minimum, maximum, inclusive, reverse)
+
+    def _order_index(self, method):
+        if self._order is None:
+            raise ValueError(f"MirrorDict.{method}(): no order index, see add_order_index().")
+        return self._order._items
+
+    def item_at(self, index):
+        """
+        Return the (key, value) pair at position `index` in `items()` order.
+        Negative indexes count from the end.
+
+        Raises:
+            IndexError: If `index` is out of range.
+            ValueError: If there is no order index.
+        """
+        order = self._order_index("item_at")
+        if index < 0:
+            index += len(order)
+        if not 0 <= index < len(order):
+            raise IndexError(f"MirrorDict.item_at(index) index={index} out of range for {len(order)} pairs.")
+        key = order[index]
+        return key, self._key[key]
+
+    def index_of(self, key):
+        """
+        Return the position in `items()` order of the pair that has `key` as its key or value.
+
+        Raises:
+            KeyError: If `key` is not a key or value.
+            ValueError: If there is no order index.
+        """
+        order = self._order_index("index_of")
+        if key in self._key:
+            return order.index(key)
+        if key in self._val:
+            return order.index(self._val[key])
+        raise KeyError(f'MirrorDict.index_of(key) does not have key="{key}".')
+
+    def islice(self, start=0, stop=None):
+        """
+        Iterate over the (key, value) pairs from position `start` up to, but not
+        including, `stop` in `items()` order, in O(log n) plus the number of pairs.
+
+        Like `itertools.islice`, `start` and `stop` must be non-negative and are clipped
+        to the number of pairs, and `stop=None` iterates to the end.
+
+        Raises:
+            ValueError: If there is no order index, or `start` or `stop` is negative.
+        """
+        order = self._order_index("islice")
+        size = len(order)
+        stop = size if stop is None else stop
+        if start < 0 or stop < 0:
+            raise ValueError(f"MirrorDict.islice(): start={start} and stop={stop} must be non-negative.")
+        stop = min(stop, size)
+        if start >= stop:
+            return iter(())
+        key = self._key
+        return ((k, key[k]) for k in order.islice(start, stop))
+
+    def floor(self, item, default=KeyError, side="key"):
+        """
+        Return the largest key (or value) that is <= `item`.
+
+        Raises:
+            KeyError: If there is no such key and no default is provided.
+        """
+        found, result = self._sorted_index(side, "floor").floor(item)
+        if found:
+            return result
+        if default is not KeyError:
+            return default
+        raise KeyError(f'MirrorDict.floor(item, default) no {side} <= "{item}" and default=KeyError.')
+
+    def ceiling(self, item, default=KeyError, side="key"):
+        """
+        Return the smallest key (or value) that is >= `item`.
+
+        Raises:
+            KeyError: If there is no such key and no default is provided.
+        """
+        found, result = self._sorted_index(side, "ceiling").ceiling(item)
+        if found:
+            return result
+        if default is not KeyError:
+            return default
+        raise KeyError(f'MirrorDict.ceiling(item, default) no {side} >= "{item}" and default=KeyError.')
+
+    # -- mutations ----------------------------------------------------------------------------------
+
+    def clear(self):
+        super().clear()
+        for index in self._indexes:
+            index._clear()
+        return self
+
+    def pop(self, key, default=KeyError):
+        if key in self._key:
+            pair = key, self._key[key]
+        elif key in self._val:
+            pair = self._val[key], key
+        else:
+            return super().pop(key, default)
+        result = super().pop(key)
+        for index in self._indexes:
+            index._remove(*pair)
+        return result
+
+    def popitem(self):
+        key, val = super().popitem()
+        for index in self._indexes:
+            index._remove(key, val)
+        return key, val
+
+    def _update(self, key, val):
+        if not isinstance(key, Hashable) or not isinstance(val, Hashable):
+            _raise_unhashable(key, val)
+        indexes = self._indexes
+        if not indexes:
+            return super()._update(key, val)
+
+        for index in indexes:
+            index._check(key, val)
+        displaced = []
+        case = super()._update(key, val, displaced)
+        if case is None:  # the pair was already defined
+            return case
+        for pair in displaced:
+            for index in indexes:
+                index._remove(*pair)
+        for index in indexes:
+            index._add(key, val)
+        return case
+
+    def __delitem__(self, key):
+        if key in self._key:
+            pair = key, self._key[key]
+        elif key in self._val:
+            pair = self._val[key], key
+        else:
+            return super().__delitem__(key)
+        super().__delitem__(key)
+        for index in self._indexes:
+            index._remove(*pair)
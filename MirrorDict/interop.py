@@ -0,0 +1,161 @@
+"""
+MirrorDict Interop Module
+
+This module implements the conversions between `MirrorDict` and Apache Arrow and
+pandas, which are optional dependencies that are imported only when a conversion
+is called:
+
+    pip install MirrorDict[arrow]    # pyarrow
+    pip install MirrorDict[pandas]   # pandas
+
+The keys and values are moved as whole columns (lists built from the dict views at
+C speed, and arrays converted by pyarrow or pandas), and a mirror built from columns
+is checked for conflicts in bulk, so no Python code runs per pair unless a key or
+value repeats.
+
+Conventions:
+    - `to_arrow()` and `from_arrow(table)` use a table with a key and a value column.
+    - A dictionary-encoded array or a categorical maps each category (key) to its
+      integer code (value), as in `EncoderMirrorDict`.
+
+Example Usage:
+    >>> import pandas as pd
+    >>> from MirrorDict import MirrorDict
+    >>> md = MirrorDict.from_categorical(pd.Categorical(["low", "high", "low"], categories=["low", "high"]))
+    >>> md
+    MirrorDict({'low': 0, 'high': 1})
+    >>> md.to_categorical([1, 0, 0])
+    ['high', 'low', 'low']
+    Categories (2, object): ['low', 'high']
+    >>> md.map_series(pd.Series(["high", "low", "mid"])).tolist()
+    [1.0, 0.0, nan]
+"""
+
+from importlib import import_module
+
+from . import MirrorDict
+
+__all__ = ["from_arrow", "to_arrow", "from_categorical", "to_categorical", "map_series"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+def _require(module, extra, method):
+    try:
+        return import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"MirrorDict.{method}() requires {module}, install it with: pip install MirrorDict[{extra}]"
+        ) from e
+
+
+def _from_columns(cls, keys, values):
+    """
+    Return a `cls` with the pairs `zip(keys, values)`. For a MirrorDict, its dicts are
+    built directly when no key or value repeats and no key is also a value, otherwise
+    the pairs are added in order with the mirror rules. Subclasses are built from the
+    pairs with their constructor, so their own state (e.g. a filter) is kept in sync.
+    """
+    keys, values = list(keys), list(values)
+    if len(keys) != len(values):
+        raise ValueError(f"MirrorDict: received {len(keys)} keys and {len(values)} values, they must be the same length.")
+    if cls is not MirrorDict:
+        return cls(zip(keys, values))
+    md = MirrorDict()
+    key = dict(zip(keys, values))
+    val = dict(zip(values, keys))
+    if len(key) == len(val) == len(keys) and key.keys().isdisjoint(val):
+        md._key = key
+        md._val = val
+        return md
+    return md.update(zip(keys, values))
+
+
+def _categories_by_code(md, method):
+    """
+    Return the keys ordered by their values, which must be the integers 0 to len(md) - 1.
+    """
+    categories = [None] * len(md)
+    for category, code in md._key.items():
+        if type(code) is not int or not 0 <= code < len(categories) or categories[code] is not None:
+            raise ValueError(
+                f"MirrorDict.{method}(): the values must be the integer codes 0 to {len(md) - 1}, "
+                f"but received {category!r}: {code!r}."
+            )
+        categories[code] = category
+    return categories
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+def from_arrow(cls, data, key="key", value="value"):
+    """
+    See `MirrorDict.from_arrow`.
+    """
+    pa = _require("pyarrow", "arrow", "from_arrow")
+    if isinstance(data, pa.ChunkedArray):
+        data = data.combine_chunks()
+    if isinstance(data, pa.Array):
+        if not pa.types.is_dictionary(data.type):
+            raise TypeError(f"MirrorDict.from_arrow() expected a dictionary-encoded array, but received type {data.type}.")
+        categories = data.dictionary.to_pylist()
+        return _from_columns(cls, categories, range(len(categories)))
+    if isinstance(data, (pa.Table, pa.RecordBatch)):
+        return _from_columns(cls, data.column(key).to_pylist(), data.column(value).to_pylist())
+    raise TypeError(
+        f"MirrorDict.from_arrow() expected a pyarrow Table, RecordBatch, or dictionary array, but received {type(data)}."
+    )
+
+
+def to_arrow(md, key="key", value="value"):
+    """
+    See `MirrorDict.to_arrow`.
+    """
+    pa = _require("pyarrow", "arrow", "to_arrow")
+    return pa.table({key: pa.array(list(md.keys())), value: pa.array(list(md.values()))})
+
+
+def from_categorical(cls, data):
+    """
+    See `MirrorDict.from_categorical`.
+    """
+    pd = _require("pandas", "pandas", "from_categorical")
+    if isinstance(data, (pd.Series, pd.Index)):
+        if not isinstance(data.dtype, pd.CategoricalDtype):
+            raise TypeError(f"MirrorDict.from_categorical() expected a categorical, but received dtype {data.dtype}.")
+        data = data.array
+    if not isinstance(data, (pd.Categorical, pd.CategoricalDtype)):
+        raise TypeError(f"MirrorDict.from_categorical() expected a pandas Categorical, but received {type(data)}.")
+    categories = data.categories.tolist()
+    return _from_columns(cls, categories, range(len(categories)))
+
+
+def to_categorical(md, codes=None, ordered=False):
+    """
+    See `MirrorDict.to_categorical`.
+    """
+    pd = _require("pandas", "pandas", "to_categorical")
+    categories = _categories_by_code(md, "to_categorical")
+    if codes is None:
+        return pd.CategoricalDtype(categories, ordered=ordered)
+    return pd.Categorical.from_codes(codes, categories=categories, ordered=ordered)
+
+
+def map_series(md, series, side="both"):
+    """
+    See `MirrorDict.map_series`.
+    """
+    pd = _require("pandas", "pandas", "map_series")
+    if side == "key":
+        lookup = pd.Series(list(md.values()), index=list(md.keys()))
+    elif side == "value":
+        lookup = pd.Series(list(md.keys()), index=list(md.values()))
+    elif side == "both":
+        lookup = pd.Series(list(md.values()) + list(md.keys()), index=list(md.keys()) + list(md.values()))
+    else:
+        raise ValueError(f'MirrorDict.map_series(): side must be "key", "value", or "both", but received side="{side}".')
+    if not isinstance(series, (pd.Series, pd.Index)):
+        series = pd.Series(series)
+    return series.map(lookup)
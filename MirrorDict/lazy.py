@@ -0,0 +1,259 @@
+"""
+LazyMirrorDict Module
+
+This module defines the `LazyMirrorDict` class, a `MirrorDict` that does not build
+its inverse (`_val`) dict until it is needed.
+
+Inserts of new pairs only update the forward (`_key`) dict and record the pair
+as pending. Whether a pending pair conflicts with another pair (a repeated value,
+or a key that is also a value) cannot be known without the inverse, so the
+pending pairs are settled by the next read:
+
+    - A forward lookup (`md[key]`, `get`, `in`, `len`, iteration, ...) checks the
+      pending pairs in bulk. When there are many pending pairs relative to the size
+      of the mirror, this is done with a temporary set of the values that is
+      discarded afterwards, so `_val` stays unbuilt. Otherwise `_val` is built.
+    - A reverse lookup, a `__contains__` miss on the keys, or a mutation that
+      depends on uniqueness (changing the value of a key, removing by value, or
+      setting a key to something already in the mirror) builds `_val`.
+
+Once `_val` is built the instance behaves like an eager `MirrorDict`, until `clear()`.
+If any pending pair did conflict, the pending pairs are replayed through
+`MirrorDict._update`, so the observable mirror semantics are unchanged.
+
+Note that `keys()`, `values()`, and `items()` return live views of `_key` that are
+settled when they are created, so a view held across later inserts can show
+pending pairs that a subsequent read would evict.
+
+Example Usage:
+    >>> from MirrorDict import LazyMirrorDict
+    >>> md = LazyMirrorDict((f"id{i}", i) for i in range(5))
+    >>> md["id3"]      # forward lookups do not need the inverse
+    3
+    >>> md[3]          # first reverse lookup builds it
+    'id3'
+"""
+
+from collections.abc import Hashable
+from itertools import islice
+
+from . import MirrorDict, _raise_unhashable
+
+__all__ = ["LazyMirrorDict"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class LazyMirrorDict(MirrorDict):
+    """
+    A `MirrorDict` that builds its inverse (`_val`) only on the first reverse lookup
+    or uniqueness-sensitive mutation.
+
+    Intended for mirrors that are built in bulk and then mostly queried by key.
+    Has the same API and semantics as `MirrorDict`.
+
+    Example Usage:
+        >>> md = LazyMirrorDict(a=1, b=2)
+        >>> md["a"]
+        1
+        >>> md._val is None
+        True
+        >>> md[2]
+        'b'
+    """
+
+    _val: "dict | None"  # None until the inverse is built
+    _pending: list  # (key, value) pairs inserted in _key but not yet checked for conflicts
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize a LazyMirrorDict instance, see `MirrorDict.__init__`.
+        """
+        self._key = {}
+        self._val = None
+        self._pending = []
+        self.update(*args, **kwargs)
+
+    def _inverse(self):
+        """
+        Settle any pending pairs, build `_val` if it does not exist, and return it.
+        """
+        if self._val is not None:
+            return self._val
+
+        key = self._key
+        pending = self._pending
+        val = {v: k for k, v in islice(key.items(), len(key) - len(pending))}
+        self._val = val
+        if not pending:
+            return val
+
+        new = {v: k for k, v in pending}
+        size = len(val) + len(pending)
+        val.update(new)
+        if len(val) != size or not val.keys().isdisjoint(new.values()):
+            # a pending pair conflicts, undo the pending inserts and replay them eagerly
+            for k, _ in pending:
+                del key[k]
+            self._churn += len(pending)
+            self._val = {v: k for k, v in key.items()}
+            replay = pending.copy()
+            pending.clear()
+            for k, v in replay:
+                MirrorDict._update(self, k, v)
+            return self._val
+
+        pending.clear()
+        return val
+
+    def _pair_of(self, x):
+        self._inverse()
+        return super()._pair_of(x)
+
+    def _settle(self):
+        """
+        Resolve the pending pairs so that `_key` is exact, without building `_val`
+        when the pending pairs can be checked against a temporary set instead.
+        """
+        pending = self._pending
+        if not pending:
+            return
+        key = self._key
+        if 8 * len(pending) < len(key):  # cheaper to build the inverse than to check every value
+            self._inverse()
+            return
+        vals = set(key.values())
+        if len(vals) == len(key) and vals.isdisjoint(key):
+            pending.clear()
+        else:
+            self._inverse()
+
+    def clear(self):
+        """
+        Remove all items, including the inverse, so the instance is lazy again.
+        """
+        self._key.clear()
+        self._val = None
+        self._pending.clear()
+        self._churn = 0
+        self._resets += 1
+        return self
+
+    def get(self, key, default=None):
+        self._settle()
+        if key in self._key:
+            return self._key[key]
+        return self._inverse().get(key, default)
+
+    def items(self):
+        self._settle()
+        return self._key.items()
+
+    def keys(self):
+        self._settle()
+        return self._key.keys()
+
+    def pop(self, key, default=KeyError):
+        self._settle()
+        if key in self._key:
+            val = self._key.pop(key)
+            if self._val is not None:
+                del self._val[val]
+            self._removed(1 if self._val is None else 2)
+            return val
+        self._inverse()
+        return super().pop(key, default)
+
+    def popitem(self):
+        self._settle()
+        if len(self._key) == 0:
+            raise KeyError("MirrorDict.popitem() dictionary is empty.")
+        key, val = self._key.popitem()
+        if self._val is not None:
+            del self._val[val]
+        self._removed(1 if self._val is None else 2)
+        return key, val
+
+    def reversed(self):
+        self._settle()
+        return reversed(self._key.keys())
+
+    def setdefault(self, key, default=None):
+        self._settle()
+        if key in self._key:
+            return self._key[key]
+        if key in self._inverse():
+            return self._val[key]
+        self._update(key, default)
+        return default
+
+    def merge(self, other, on_key_conflict="replace", on_value_conflict="replace", report=False):
+        self._inverse()  # conflicts are found in _val
+        return super().merge(other, on_key_conflict, on_value_conflict, report)
+
+    def transaction(self):
+        self._inverse()  # commit resolves conflicts against _val
+        return super().transaction()
+
+    def values(self):
+        self._settle()
+        return self._key.values()
+
+    def _update(self, key, val):
+        if not isinstance(key, Hashable) or not isinstance(val, Hashable):
+            _raise_unhashable(key, val)
+        if self._val is None and key not in self._key and val not in self._key:
+            self._key[key] = val
+            self._pending.append((key, val))
+            return
+        self._inverse()
+        super()._update(key, val)
+
+    def __str__(self):
+        self._settle()
+        return f"MirrorDict({self._key})"
+
+    def __reversed__(self):
+        return self.reversed()
+
+    def __len__(self):
+        self._settle()
+        return len(self._key)
+
+    def __iter__(self):
+        self._settle()
+        return iter(self._key)
+
+    def __contains__(self, key):
+        self._settle()
+        return key in self._key or key in self._inverse()
+
+    def __getitem__(self, key):
+        self._settle()
+        if key in self._key:
+            return self._key[key]
+        val = self._inverse()
+        if key in val:
+            return val[key]
+        raise KeyError(f'MirrorDict[key] does not have key="{key}".')
+
+    def __delitem__(self, key):
+        self._settle()
+        if key in self._key:
+            val = self._key.pop(key)
+            if self._val is not None:
+                del self._val[val]
+            self._removed(1 if self._val is None else 2)
+            return
+        self._inverse()
+        super().__delitem__(key)
+
+    def __eq__(self, other):
+        self._settle()
+        if isinstance(other, LazyMirrorDict):
+            other._settle()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
@@ -0,0 +1,350 @@
+"""
+MirrorDict Managed Module
+
+This module shares one mutable `MirrorDict` between processes with a
+`multiprocessing` manager (`MirrorManager`), and defines the proxy that worker
+processes use (`MirrorDictProxy`), which answers repeated lookups from a local cache.
+
+The mirror lives in the manager process. A `multiprocessing.Manager().dict()` style
+proxy costs one round trip per call, so the proxy instead:
+    - Sends every call as a batch of requests, and `get_many()`, `update()`, and
+      `pipeline()` put many lookups or changes in one round trip.
+    - Caches the results of `md[x]`, `md.get(x)`, `x in md`, and `get_many()`,
+      including misses, tagged with the version of the mirror they were read at.
+    - Checks the version of the mirror, a change counter that the manager increments
+      for every batch that changes the mirror, in shared memory before each cached
+      read, so a repeated lookup is a local dict hit and any change made by any
+      process clears the caches of all the proxies.
+
+A proxy that cannot attach to the shared memory counter, e.g. connected to a manager
+on another host, does not cache and sends every lookup to the manager.
+
+Example Usage:
+    >>> from MirrorDict import MirrorManager
+    >>> with MirrorManager() as manager:
+    ...     md = manager.MirrorDict({"a": 1, "b": 2})   # pass md to worker processes
+    ...     md["c"] = 3
+    ...     md.get_many(["a", 2, "z"]), md[3], md[3]      # the second md[3] is a cache hit
+    ([1, 'b', None], 'c', 'c')
+"""
+
+import struct
+import threading
+from collections.abc import Mapping, MutableMapping
+from multiprocessing import shared_memory, util
+from multiprocessing.managers import BaseManager, BaseProxy
+
+from . import MirrorDict
+from .server import _METHODS, _Pipeline
+from .shared import _attach
+
+__all__ = ["MirrorManager", "MirrorDictProxy", "register_mirror"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_COUNTER = struct.Struct("Q")
+_READS = frozenset(("getitem", "get", "get_many", "lookup", "contains", "len", "keys", "values", "items"))
+
+
+def _lookup(md, items):
+    """
+    Return (True, partner) or (False, None) for each item, so a cached miss is not
+    confused with a partner that is None.
+    """
+    key, val = md._key, md._val
+    return [(True, key[x]) if x in key else (True, val[x]) if x in val else (False, None) for x in items]
+
+
+_OWNER_METHODS = dict(_METHODS, lookup=_lookup)
+
+
+def _state(md):
+    """
+    Return a value that changes whenever the pairs of the mirror change.
+    """
+    return len(md._key), md._churn, md._resets
+
+
+def _release(shm):
+    shm.close()
+    shm.unlink()
+
+
+class _MirrorOwner:
+    """
+    The mirror in the manager process, with the shared memory change counter.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._mirror = MirrorDict(*args, **kwargs)
+        self._lock = threading.Lock()  # the manager serves each connection in its own thread
+        self._version = 0
+        self._shm = shared_memory.SharedMemory(create=True, size=_COUNTER.size)
+        _COUNTER.pack_into(self._shm.buf, 0, 0)
+        # multiprocessing runs these finalizers when the manager process exits, unlike atexit
+        util.Finalize(self, _release, args=(self._shm,), exitpriority=10)
+
+    def counter_name(self):
+        return self._shm.name
+
+    def batch(self, requests):
+        """
+        Run the `(method, args)` requests in order under one lock and return the version
+        of the mirror after them and the `(ok, result)` of each request.
+        """
+        responses = []
+        changed = False
+        with self._lock:
+            md = self._mirror
+            for method, args in requests:
+                before = _state(md)
+                try:
+                    responses.append((True, _OWNER_METHODS[method](md, *args)))
+                except Exception as e:
+                    responses.append((False, e))
+                    # a failed write only counts if it changed the mirror before raising (e.g. update)
+                    if method not in _READS and not changed and _state(md) != before:
+                        changed = True
+                    continue
+                if method not in _READS:
+                    changed = True
+            if changed:
+                self._version += 1
+                _COUNTER.pack_into(self._shm.buf, 0, self._version)
+            return self._version, responses
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class MirrorDictProxy(BaseProxy, MutableMapping):
+    """
+    Proxy for a `MirrorDict` in a `MirrorManager`, with the same mapping API as `MirrorDict`
+    and a local cache of lookups that is cleared whenever the mirror changes.
+
+    Created by `manager.MirrorDict(...)`, and can be passed to other processes
+    (e.g. as an argument of a `multiprocessing.Pool` task), which get their own cache.
+
+    Attributes:
+        cache_size (int): Maximum number of cached lookups, the cache is cleared when full.
+                          Defaults to 65536, set to 0 to disable the cache.
+    """
+
+    _exposed_ = ("batch", "counter_name")
+    cache_size = 1 << 16
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = {}  # item -> (found, partner) at _cache_version
+        self._cache_version = None
+        self._counter = None  # shared memory counter, False if it cannot be attached
+        self._hits = 0
+        self._misses = 0
+
+    # -- transport ----------------------------------------------------------------------------------
+
+    def _send(self, requests):
+        version, responses = self._callmethod("batch", (requests,))
+        if version != self._cache_version:
+            self._cache.clear()
+            self._cache_version = version
+        return responses
+
+    def _call(self, method, *args):
+        ok, result = self._send([(method, args)])[0]
+        if not ok:
+            raise result
+        return result
+
+    def _current(self):
+        """
+        Clear the cache if the mirror changed since it was filled, and return False if
+        the cache cannot be used.
+        """
+        counter = self._counter
+        if counter is None:
+            try:
+                counter = self._counter = _attach(self._callmethod("counter_name"))
+            except OSError:
+                counter = self._counter = False
+        if counter is False or not self.cache_size:
+            return False
+        version = _COUNTER.unpack_from(counter.buf, 0)[0]
+        if version != self._cache_version:
+            self._cache.clear()
+            self._cache_version = version
+        return True
+
+    def _lookup(self, items):
+        """
+        Return the (found, partner) of each item, from the cache when possible and
+        with the rest looked up in one round trip.
+        """
+        if not self._current():
+            return self._call("lookup", items)
+        cache = self._cache
+        found = {}
+        for x in items:
+            if x in cache:
+                found[x] = cache[x]
+                self._hits += 1
+        missing = [x for x in dict.fromkeys(items) if x not in found]
+        if missing:
+            self._misses += len(missing)
+            version, ((ok, results),) = self._callmethod("batch", ([("lookup", (missing,))],))
+            if not ok:
+                raise results
+            fetched = dict(zip(missing, results))
+            found.update(fetched)
+            if version != self._cache_version:
+                cache.clear()
+                self._cache_version = version
+            if len(cache) + len(fetched) > self.cache_size:
+                cache.clear()
+            cache.update(fetched)
+        return [found[x] for x in items]
+
+    # -- methods ------------------------------------------------------------------------------------
+
+    def cache_info(self):
+        """
+        Return the lookups answered from the local cache ("hits") and by the manager
+        ("misses"), the number of cached lookups ("size"), and the version of the mirror
+        they were read at ("version").
+        """
+        return {"hits": self._hits, "misses": self._misses, "size": len(self._cache), "version": self._cache_version}
+
+    def clear(self):
+        self._call("clear")
+
+    def copy(self):
+        """
+        Return a local MirrorDict copy of the shared mirror.
+        """
+        return MirrorDict(self._call("items"))
+
+    def get(self, key, default=None):
+        found, result = self._lookup([key])[0]
+        return result if found else default
+
+    def get_many(self, keys, default=None):
+        """
+        Look up every key (or value) in `keys`, from the cache or in one round trip,
+        and return the results as a list, with `default` for the ones not found.
+        """
+        return [result if found else default for found, result in self._lookup(list(keys))]
+
+    def items(self):
+        return self._call("items")
+
+    def keys(self):
+        return self._call("keys")
+
+    def pipeline(self):
+        """
+        Return a pipeline that queues requests, using the method names of
+        `MirrorDictClient.pipeline()`, and sends them in one round trip with `execute()`.
+
+        Example:
+            >>> md.pipeline().setitem("c", 3).getitem(3).execute()
+            [None, 'c']
+        """
+        return _Pipeline(self)
+
+    def pop(self, key, default=KeyError):
+        if default is KeyError:
+            return self._call("pop", key)
+        return self._call("pop", key, default)
+
+    def popitem(self):
+        return self._call("popitem")
+
+    def setdefault(self, key, default=None):
+        return self._call("setdefault", key, default)
+
+    def update(self, *args, **kwargs):
+        """
+        Send all key-value pairs from mappings, iterables, or keyword arguments to the
+        manager in one round trip, where they are applied in order.
+        """
+        pairs = []
+        for arg in args:
+            if isinstance(arg, (Mapping, MirrorDict)):
+                pairs.extend(arg.items())
+            elif hasattr(arg, "__iter__") and not isinstance(arg, str):
+                pairs.extend(arg)
+            else:
+                raise TypeError(
+                    f"MirrorDictProxy.update() expected a dict-like or an iterable of key-value pairs but received: {arg}"
+                )
+        pairs.extend(kwargs.items())
+        self._call("update", pairs)
+
+    def values(self):
+        return self._call("values")
+
+    def __str__(self):
+        return f"MirrorDictProxy({dict(self.items())})"
+
+    def __len__(self):
+        return self._call("len")
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return self._lookup([key])[0][0]
+
+    def __setitem__(self, key, value):
+        self._call("setitem", key, value)
+
+    def __getitem__(self, key):
+        found, result = self._lookup([key])[0]
+        if not found:
+            raise KeyError(f'MirrorDictProxy[key] does not have key="{key}".')
+        return result
+
+    def __delitem__(self, key):
+        self._call("delitem", key)
+
+    def __eq__(self, other):
+        if isinstance(other, MirrorDictProxy):
+            other = dict(other.items())
+        elif isinstance(other, MirrorDict):
+            other = other._key
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+def register_mirror(manager_class, typeid="MirrorDict"):
+    """
+    Register a shared `MirrorDict` on a `multiprocessing.managers.BaseManager` subclass
+    (e.g. `SyncManager`), so that `manager.<typeid>(*args, **kwargs)` creates a mirror
+    in the manager process and returns a `MirrorDictProxy` for it.
+    """
+    manager_class.register(typeid, _MirrorOwner, proxytype=MirrorDictProxy)
+
+
+class MirrorManager(BaseManager):
+    """
+    A `multiprocessing` manager with `manager.MirrorDict(*args, **kwargs)`, which creates
+    a `MirrorDict` in the manager process and returns a `MirrorDictProxy` for it.
+
+    Example Usage:
+        >>> with MirrorManager() as manager:
+        ...     md = manager.MirrorDict(a=1)
+        ...     md[1]
+        'a'
+    """
+
+
+register_mirror(MirrorManager)
@@ -0,0 +1,179 @@
+"""
+MirrorDict Memory Module
+
+This module implements `MirrorDict.memory_usage()` and `MirrorDict.estimate_memory()`,
+which report the memory used by a mirror and estimate it for a number of pairs.
+
+`sys.getsizeof(md)` only counts the instance itself, the pairs are held by the key
+(`_key`) and value (`_val`) dicts. The size of a dict depends on the capacity of
+its table, which is a power of 2 that holds up to 2/3 of its capacity in entries,
+and on the size of its entries, which is smaller for dicts with only str keys
+(on Python 3.11+). The layout is measured once from small dicts, so the estimates
+follow the running Python version.
+
+The spelling dict of a `NormalizedMirrorDict`, the pending pairs of a
+`LazyMirrorDict`, the secondary indexes of an `IndexedMirrorDict`, and the hash set
+of a `FilteredMirrorDict` are reported as their own components, counting the
+containers they are built from but not the keys and values they reference.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDict
+    >>> md = MirrorDict((f"id{i}", i) for i in range(1000))
+    >>> usage = md.memory_usage(deep=True)
+    >>> sorted(usage)
+    ['instance', 'key_table', 'keys', 'per_pair', 'per_pair_overhead', 'total', 'value_table', 'values']
+    >>> MirrorDict.estimate_memory(10_000_000, key="id1234567", value=1234567)["total"] > 1e9
+    True
+"""
+
+import sys
+
+__all__ = ["memory_usage", "estimate_memory"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_LAYOUT = {}  # str keys (bool) -> (base bytes, bytes per entry)
+
+
+def _dict_layout(str_keys):
+    """
+    Return the (base, entry) bytes of a dict with only str keys or with any keys,
+    where a dict with a table capacity of `cap` uses `base + cap * index + 2 * cap // 3 * entry` bytes.
+    """
+    if str_keys not in _LAYOUT:
+        sizes = []  # sizes of a growing dict, one per table capacity, 8, 16, 32, 64, 128
+        d = {}
+        i = 0
+        while len(sizes) < 5:
+            d[str(i) if str_keys else i] = None
+            size = sys.getsizeof(d)
+            if not sizes or size != sizes[-1]:
+                sizes.append(size)
+            i += 1
+        entry = (sizes[4] - sizes[3] - 64) // (128 * 2 // 3 - 64 * 2 // 3)  # 1 byte indexes at 64 and 128
+        base = sizes[3] - 64 - 64 * 2 // 3 * entry
+        _LAYOUT[str_keys] = base, entry
+    return _LAYOUT[str_keys]
+
+
+def _table_bytes(n, str_keys):
+    """
+    Return the bytes of a dict with the smallest table that holds `n` entries,
+    which is the size of the dicts of a mirror after `compact()`.
+    """
+    base, entry = _dict_layout(str_keys)
+    cap = 8
+    while cap * 2 // 3 < n:
+        cap *= 2
+    log2 = cap.bit_length() - 1
+    index = 1 if log2 < 8 else 2 if log2 < 16 else 4 if log2 < 32 else 8
+    return base + cap * index + cap * 2 // 3 * entry
+
+
+def _sizeof(obj, seen):
+    """
+    Return the size of `obj` and, for tuples and frozensets, the objects they contain,
+    not counting objects whose id is in `seen`, which is updated.
+    """
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (tuple, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+def _index_bytes(md):
+    """
+    Return the size of the indexes of an IndexedMirrorDict: the index objects and the
+    lists, dicts, and sets inside them, but not the keys and values they hold, nor the
+    key and value dicts of the mirror that an index refers to.
+    """
+    from .indexed import _OrderList, _SortedList, GroupIndex, OrderIndex, PrefixIndex, SortedIndex
+
+    indexes = (SortedIndex, PrefixIndex, OrderIndex, GroupIndex, _SortedList, _OrderList)
+    total = 0
+    seen = {id(md._key), id(md._val)}
+    stack = [md._indexes, md._sorted, md._prefix, md._groups]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, (list, set)):
+            total += sys.getsizeof(obj)
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            total += sys.getsizeof(obj)
+            stack.extend(obj.values())
+        elif isinstance(obj, indexes):
+            total += sys.getsizeof(obj) + sys.getsizeof(obj.__dict__)
+            stack.extend(obj.__dict__.values())
+    return total
+
+
+_OVERHEAD = ("key_table", "value_table", "spelling_table", "pending", "indexes", "filter")  # per_pair_overhead
+
+
+def _per_pair(usage, n):
+    tables = sum(usage.get(name, 0) for name in _OVERHEAD)
+    usage["per_pair_overhead"] = tables / n if n else 0.0
+    usage["per_pair"] = (usage["total"] - usage["instance"]) / n if n else 0.0
+    return usage
+
+
+def memory_usage(md, deep=False):
+    """
+    See `MirrorDict.memory_usage`.
+    """
+    val = md._val
+    usage = {
+        "instance": sys.getsizeof(md) + sys.getsizeof(md.__dict__),
+        "key_table": sys.getsizeof(md._key),
+        "value_table": 0 if val is None else sys.getsizeof(val),  # LazyMirrorDict may not have built it
+    }
+    spelling = getattr(md, "_spelling", None)  # NormalizedMirrorDict, canonical form -> spelling
+    if spelling is not None:
+        usage["spelling_table"] = sys.getsizeof(spelling)
+    pending = getattr(md, "_pending", None)  # LazyMirrorDict, (key, value) pairs not in the inverse yet
+    if pending is not None:
+        usage["pending"] = sys.getsizeof(pending) + sum(map(sys.getsizeof, pending))
+    if hasattr(md, "_indexes"):  # IndexedMirrorDict
+        usage["indexes"] = _index_bytes(md)
+    if hasattr(md, "_hashes"):  # FilteredMirrorDict, a set of int hashes
+        usage["filter"] = sys.getsizeof(md._hashes) + sum(map(sys.getsizeof, md._hashes))
+    if deep:
+        seen = set()
+        usage["keys"] = sum(_sizeof(key, seen) for key in md._key)
+        usage["values"] = sum(_sizeof(val, seen) for val in md._key.values())
+        if spelling is not None:  # the spellings that are not the canonical objects themselves
+            usage["spellings"] = sum(_sizeof(item, seen) for item in spelling.values())
+    usage["total"] = sum(usage.values())
+    return _per_pair(usage, len(md._key))
+
+
+def estimate_memory(n, key, value):
+    """
+    See `MirrorDict.estimate_memory`.
+    """
+    if n < 0:
+        raise ValueError(f"MirrorDict.estimate_memory() expected n >= 0, but received: {n}")
+    from . import MirrorDict
+
+    instance = MirrorDict()
+    usage = {
+        "instance": sys.getsizeof(instance) + sys.getsizeof(instance.__dict__),
+        "key_table": _table_bytes(n, type(key) is str),
+        "value_table": _table_bytes(n, type(value) is str),
+        "keys": n * _sizeof(key, set()),
+        "values": n * _sizeof(value, set()),
+    }
+    usage["total"] = sum(usage.values())
+    return _per_pair(usage, n)
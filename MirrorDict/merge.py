@@ -0,0 +1,151 @@
+"""
+MirrorDict Merge Module
+
+This module implements `MirrorDict.merge()`, which merges another mirror into a
+MirrorDict with an explicit policy for the pairs that conflict, and which is also
+used by `update()`, `|`, and `|=` when merging one MirrorDict into another.
+
+An incoming pair `k: v` conflicts on its key if `k` is already a key or value of the
+mirror with another partner, and on its value if `v` is. With `update()` a conflict
+evicts the existing pair. The merge instead:
+    1. Finds the conflicts with set intersections of the incoming keys and values
+       with both tables, which run at C speed, so no Python code runs per pair
+       unless it conflicts.
+    2. Resolves each conflicting pair, in the order of `other`, with its policy
+       ("replace", "keep", or "raise"). Nothing is changed if any conflict raises.
+    3. Removes the evicted pairs and adds the incoming pairs with `dict.update()`.
+
+With the "replace" policy for both sides, the result, including the order of the
+keys and values, is the same as `update(other)`.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDict
+    >>> md = MirrorDict(a=1, b=2)
+    >>> md.merge({"a": 10, "c": 3}, on_key_conflict="keep", report=True)
+    {'added': 1, 'unchanged': 0, 'replaced': [], 'skipped': [('a', 10)]}
+    >>> md
+    MirrorDict({'a': 1, 'b': 2, 'c': 3})
+"""
+
+from collections.abc import Mapping
+
+from . import MirrorDict
+
+__all__ = ["merge"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_POLICIES = ("replace", "keep", "raise")
+
+
+def _incoming(other):
+    """
+    Return the pairs of `other` as key and value dicts, which must form a valid mirror.
+    """
+    if type(other) is MirrorDict:
+        return other._key, other._val
+    try:
+        ok = dict(other.items() if isinstance(other, Mapping) else other)
+        ov = dict(zip(ok.values(), ok))
+    except TypeError as e:
+        raise TypeError(
+            f"MirrorDict.merge() expected a dict-like or an iterable of hashable key-value pairs but received: {other}"
+        ) from e
+    if len(ov) != len(ok) or not ok.keys().isdisjoint(ov):
+        raise ValueError(
+            "MirrorDict.merge(): other must be a valid mirror, where no value repeats and no key is also a value, "
+            "use update() to add its pairs in order instead."
+        )
+    return ok, ov
+
+
+def merge(md, other, on_key_conflict="replace", on_value_conflict="replace", report=False):
+    """
+    See `MirrorDict.merge`.
+    """
+    for name, policy in (("on_key_conflict", on_key_conflict), ("on_value_conflict", on_value_conflict)):
+        if policy not in _POLICIES:
+            raise ValueError(f'MirrorDict.merge(): {name} must be "replace", "keep", or "raise", but received "{policy}".')
+
+    ok, ov = _incoming(other)
+    key, val = md._key, md._val
+
+    # 1. conflicts, found set-wise
+    key_hits = (ok.keys() & key.keys()) | (ok.keys() & val.keys())
+    val_hits = (ov.keys() & val.keys()) | (ov.keys() & key.keys())
+    same = {k for k in key_hits if k in key and key[k] == ok[k]}
+    if same:
+        key_hits -= same
+        val_hits -= {ok[k] for k in same}
+    conflicts = key_hits | {ov[v] for v in val_hits}
+    if len(conflicts) > 1:  # resolve in the order of other, as update() would
+        conflicts = [k for k in ok if k in conflicts]
+
+    # 2. resolve them, without changing the mirror
+    evicted = []  # existing pairs that are removed, in order
+    gone = set()  # keys of the evicted pairs
+    kept = {}  # evicted pair -> 0 if its key, 1 if its value, is reassigned in place
+    skipped = []
+    raised = []
+    for k in conflicts:
+        v = ok[k]
+        policies = []
+        if k in key_hits:
+            policies.append(on_key_conflict)
+        if v in val_hits:
+            policies.append(on_value_conflict)
+        if "raise" in policies:
+            raised.append((k, v))
+        elif "keep" in policies:
+            skipped.append((k, v))
+        elif not raised:
+            for side, x in enumerate((k, v)):  # same rules as MirrorDict._update
+                if x in key:
+                    pair, inplace = (x, key[x]), side == 0
+                elif x in val:
+                    pair, inplace = (val[x], x), side == 1
+                else:
+                    continue
+                if pair[0] not in gone:
+                    gone.add(pair[0])
+                    evicted.append(pair)
+                    if inplace:  # k is already a key or v already a value, keeps its position
+                        kept[pair] = side
+    if raised:
+        k, v = raised[0]
+        raise ValueError(
+            f"MirrorDict.merge(): {len(raised)} pairs of other conflict with existing pairs, "
+            f"the first is key='{k}' and value='{v}'."
+        )
+
+    # 3. apply them
+    if same or skipped:
+        ok = dict(ok)
+        for k in same:
+            del ok[k]
+        for k, _ in skipped:
+            del ok[k]
+
+    if type(md) is MirrorDict:
+        removed = 0
+        for pair in evicted:
+            side = kept.get(pair, None)
+            if side != 0:
+                del key[pair[0]]
+                removed += 1
+            if side != 1:
+                del val[pair[1]]
+                removed += 1
+        key.update(ok)
+        val.update(zip(ok.values(), ok))
+        if removed:
+            md._removed(removed)
+    else:  # subclasses that hook into _update see every pair
+        for k, v in ok.items():
+            md._update(k, v)
+
+    if report:
+        return {"added": len(ok), "unchanged": len(same), "replaced": evicted, "skipped": skipped}
+    return md
@@ -0,0 +1,350 @@
+"""
+NormalizedMirrorDict Module
+
+This module defines the `NormalizedMirrorDict` class, a `MirrorDict` that matches keys
+and values by a normalized (canonical) form, e.g. case- and whitespace-insensitive
+hostnames, while returning them with the spelling they were set with.
+
+Every key is passed through the key normalizer and every value through the value
+normalizer, and `_key` and `_val` hold only the canonical forms, so the mirror rules
+and lookups are plain dict operations on them. The spelling of each stored item is
+kept in a separate dict from canonical form to spelling, and the most recent spelling
+set for an item is the one returned.
+
+Normalizing is usually the most expensive part of a lookup, so each normalizer is
+wrapped in an LRU cache of the most recently seen raw inputs, and a repeated lookup
+with the same raw spelling skips the normalizer.
+
+Example Usage:
+    >>> from MirrorDict import NormalizedMirrorDict, normalize_text
+    >>> md = NormalizedMirrorDict({"Web-01.Example.COM ": 17}, normalize_key=normalize_text)
+    >>> md["web-01.example.com"]
+    17
+    >>> md[17]
+    'Web-01.Example.COM '
+"""
+
+from collections.abc import Hashable, ItemsView, KeysView, ValuesView
+from functools import lru_cache
+
+from . import MirrorDict, _raise_unhashable
+
+__all__ = ["NormalizedMirrorDict", "normalize_text"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_MISSING = object()
+
+
+def normalize_text(item):
+    """
+    Return `item` casefolded with its whitespace stripped and runs of inner whitespace
+    collapsed to one space, if it is a str, otherwise return `item` unchanged.
+
+    Example:
+        >>> normalize_text("  Web-01.Example.COM ")
+        'web-01.example.com'
+        >>> normalize_text("New   York")
+        'new york'
+    """
+    if isinstance(item, str):
+        return " ".join(item.split()).casefold()
+    return item
+
+
+def _identity(item):
+    return item
+
+
+def _canonical(normalize, item):
+    """
+    Return `normalize(item)`, or _MISSING if the normalizer does not accept `item`.
+    """
+    try:
+        return normalize(item)
+    except TypeError:
+        return _MISSING
+
+
+class _NormalizedKeysView(KeysView):
+    def __contains__(self, key):
+        return _canonical(self._mapping._normalize_key, key) in self._mapping._key
+
+    def __iter__(self):
+        spelling = self._mapping._spelling
+        return (spelling[k] for k in self._mapping._key)
+
+    def __reversed__(self):
+        spelling = self._mapping._spelling
+        return (spelling[k] for k in reversed(self._mapping._key.keys()))
+
+
+class _NormalizedValuesView(ValuesView):
+    def __contains__(self, value):
+        return _canonical(self._mapping._normalize_value, value) in self._mapping._val
+
+    def __iter__(self):
+        spelling = self._mapping._spelling
+        return (spelling[v] for v in self._mapping._key.values())
+
+
+class _NormalizedItemsView(ItemsView):
+    def __contains__(self, item):
+        key, value = item
+        md = self._mapping
+        ck = _canonical(md._normalize_key, key)
+        return ck in md._key and md._key[ck] == _canonical(md._normalize_value, value)
+
+    def __iter__(self):
+        spelling = self._mapping._spelling
+        return ((spelling[k], spelling[v]) for k, v in self._mapping._key.items())
+
+
+class NormalizedMirrorDict(MirrorDict):
+    """
+    A `MirrorDict` that matches keys and values by their normalized form and returns
+    them with the spelling they were set with.
+
+    Args:
+        *args, **kwargs: Initial pairs, see `MirrorDict.__init__`.
+        normalize_key (callable, optional): Returns the canonical form of a key.
+                                            Defaults to no normalization.
+        normalize_value (callable, optional): Returns the canonical form of a value.
+                                              Defaults to no normalization.
+        cache_size (int, optional): Number of recent raw inputs whose canonical forms
+                                    are cached for each normalizer, or None for no limit.
+                                    Defaults to 1024.
+
+    Note that `normalize_key`, `normalize_value`, and `cache_size` are keyword arguments
+    of the constructor, so they cannot be used as keys in `**kwargs`.
+
+    Example Usage:
+        >>> md = NormalizedMirrorDict(normalize_key=normalize_text)
+        >>> md["Alpha"] = 1
+        >>> "ALPHA " in md, md.canonical("ALPHA "), list(md)
+        (True, 'alpha', ['Alpha'])
+    """
+
+    _spelling: dict  # canonical form -> spelling it was last set with
+    _cache_size: "int | None"
+
+    def __init__(self, *args, normalize_key=None, normalize_value=None, cache_size=1024, **kwargs):
+        self._key = {}
+        self._val = {}
+        self._spelling = {}
+        self._cache_size = cache_size
+        self._normalize_key = lru_cache(maxsize=cache_size)(normalize_key or _identity)
+        self._normalize_value = lru_cache(maxsize=cache_size)(normalize_value or _identity)
+        self.update(*args, **kwargs)
+
+    def _find(self, item):
+        """
+        Return the canonical form of `item` as a key or a value in the mirror, or _MISSING.
+        A normalizer that raises TypeError for `item` (e.g. `str.lower` for an int) means
+        it is not on that side.
+        """
+        try:
+            canonical = self._normalize_key(item)
+            if canonical in self._key:
+                return canonical
+        except TypeError:
+            pass
+        try:
+            canonical = self._normalize_value(item)
+            if canonical in self._val:
+                return canonical
+        except TypeError:
+            pass
+        return _MISSING
+
+    def _mirrored(self, canonical):
+        """
+        Return the spelling of the item mirrored with the stored canonical form.
+        """
+        other = self._key[canonical] if canonical in self._key else self._val[canonical]
+        return self._spelling[other]
+
+    def _pair_of(self, x):
+        """
+        Return the (key, value) pair that has any spelling of `x` as its key or value,
+        with the spellings they were set with, or None.
+        """
+        canonical = self._find(x)
+        if canonical is _MISSING:
+            return None
+        spelling = self._spelling
+        if canonical in self._key:
+            return spelling[canonical], spelling[self._key[canonical]]
+        return spelling[self._val[canonical]], spelling[canonical]
+
+    def _forget(self, *canonicals):
+        """
+        Drop the spelling of the canonical forms that are no longer in the mirror.
+        """
+        for canonical in canonicals:
+            if canonical not in self._key and canonical not in self._val:
+                self._spelling.pop(canonical, None)
+
+    def cache_info(self):
+        """
+        Return the `functools.lru_cache` statistics of the key and value normalizers.
+
+        Returns:
+            dict: {"key": CacheInfo, "value": CacheInfo}
+        """
+        return {"key": self._normalize_key.cache_info(), "value": self._normalize_value.cache_info()}
+
+    def canonical(self, item, default=KeyError):
+        """
+        Return the canonical form that `item` (a key or value) is stored as.
+
+        Raises:
+            KeyError: If `item` is not in the mirror and no default is provided.
+        """
+        canonical = self._find(item)
+        if canonical is not _MISSING:
+            return canonical
+        if default is not KeyError:
+            return default
+        raise KeyError(f'MirrorDict.canonical(item, default) item="{item}" not found and default=KeyError.')
+
+    def clear(self):
+        super().clear()
+        self._spelling.clear()
+        return self
+
+    def copy(self):
+        """
+        Return a shallow copy with the same normalizers.
+        """
+        md = NormalizedMirrorDict(
+            normalize_key=self._normalize_key.__wrapped__,
+            normalize_value=self._normalize_value.__wrapped__,
+            cache_size=self._cache_size,
+        )
+        md._key = self._key.copy()
+        md._val = self._val.copy()
+        md._spelling = self._spelling.copy()
+        return md
+
+    def get(self, key, default=None):
+        canonical = self._find(key)
+        return default if canonical is _MISSING else self._mirrored(canonical)
+
+    @property
+    def inverse(self):
+        raise TypeError("MirrorDict.inverse is not supported for subclass NormalizedMirrorDict.")
+
+    def items(self):
+        """
+        Return a view of the (key, value) pairs with the spellings they were set with.
+        """
+        return _NormalizedItemsView(self)
+
+    def keys(self):
+        """
+        Return a view of the keys with the spellings they were set with.
+        """
+        return _NormalizedKeysView(self)
+
+    def merge(self, other, on_key_conflict="replace", on_value_conflict="replace", report=False):
+        raise TypeError("MirrorDict.merge() is not supported for subclass NormalizedMirrorDict.")
+
+    def original(self, item, default=KeyError):
+        """
+        Return the spelling that `item` (a key or value) was set with.
+
+        Raises:
+            KeyError: If `item` is not in the mirror and no default is provided.
+        """
+        canonical = self._find(item)
+        if canonical is not _MISSING:
+            return self._spelling[canonical]
+        if default is not KeyError:
+            return default
+        raise KeyError(f'MirrorDict.original(item, default) item="{item}" not found and default=KeyError.')
+
+    def pop(self, key, default=KeyError):
+        canonical = self._find(key)
+        if canonical is _MISSING:
+            return super().pop(key, default)  # raises or returns the default
+        result = self._mirrored(canonical)
+        other = super().pop(canonical)
+        self._forget(canonical, other)
+        return result
+
+    def popitem(self):
+        key, val = super().popitem()
+        result = self._spelling[key], self._spelling[val]
+        self._forget(key, val)
+        return result
+
+    def reversed(self):
+        return reversed(self.keys())
+
+    def setdefault(self, key, default=None):
+        canonical = self._find(key)
+        if canonical is not _MISSING:
+            return self._mirrored(canonical)
+        self._update(key, default)
+        return default
+
+    def transaction(self):
+        raise TypeError("MirrorDict.transaction() is not supported for subclass NormalizedMirrorDict.")
+
+    def values(self):
+        """
+        Return a view of the values with the spellings they were set with.
+        """
+        return _NormalizedValuesView(self)
+
+    def _update(self, key, val):
+        if not isinstance(key, Hashable) or not isinstance(val, Hashable):
+            _raise_unhashable(key, val)
+        ck = self._normalize_key(key)
+        cv = self._normalize_value(val)
+        displaced = []
+        case = super()._update(ck, cv, displaced)
+        for pair in displaced:
+            self._forget(*pair)
+        self._spelling[ck] = key
+        self._spelling[cv] = val
+        return case
+
+    def __str__(self):
+        return f"NormalizedMirrorDict({dict(self.items())})"
+
+    def __reversed__(self):
+        return self.reversed()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return self._find(key) is not _MISSING
+
+    def __getitem__(self, key):
+        canonical = self._find(key)
+        if canonical is _MISSING:
+            raise KeyError(f'MirrorDict[key] does not have key="{key}".')
+        return self._mirrored(canonical)
+
+    def __delitem__(self, key):
+        canonical = self._find(key)
+        if canonical is _MISSING:
+            raise KeyError(f'del MirrorDict[key] does not have key="{key}".')
+        other = self._key[canonical] if canonical in self._key else self._val[canonical]
+        super().__delitem__(canonical)
+        self._forget(canonical, other)
+
+    def __eq__(self, other):
+        if isinstance(other, NormalizedMirrorDict):
+            return self._key == other._key
+        if isinstance(other, MirrorDict):
+            return dict(self.items()) == other._key
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
@@ -0,0 +1,540 @@
+"""
+PersistentMirrorDict Module
+
+This module defines the `PersistentMirrorDict` class, a mirror that keeps every
+version of its contents, so that `md.at(version)` answers what an item mapped to
+at any earlier point, and `MirrorSnapshot`, the read-only view of one version.
+
+The pairs are stored in two persistent hash array mapped tries (HAMT), key to value
+and value to key. A trie node has up to 32 children selected by 5 bits of the hash,
+and a change copies only the nodes on the path to the changed entry, O(log n), while
+the new version shares every other node with the previous one. So each version costs
+O(log n) memory instead of the O(n) of a `copy()`, and reading any version is as
+fast as reading the current one.
+
+Every call that changes the mirror (e.g. `md[key] = value`, `del md[key]`, `pop()`,
+or one `update()` call with many pairs) records one new version, numbered from 0 for
+the initial contents. The mirror rules and the order of the keys are the same as for
+`MirrorDict`, but since the tries are ordered by hash, iterating over a version sorts
+its pairs, O(n log n), and `popitem()` is O(n).
+
+Example Usage:
+    >>> from MirrorDict import PersistentMirrorDict
+    >>> md = PersistentMirrorDict({"host-1": 17})
+    >>> md["host-1"] = 42     # version 1
+    >>> md["host-2"] = 17     # version 2
+    >>> md.at(0)[17], md.at(2)[17]
+    ('host-1', 'host-2')
+    >>> md.at(1)
+    MirrorSnapshot({'host-1': 42}, version=1)
+"""
+
+from collections.abc import Hashable, Mapping, MutableMapping
+
+from . import _raise_unhashable
+
+__all__ = ["PersistentMirrorDict", "MirrorSnapshot"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+# Persistent hash array mapped trie. A node is a bitmap of the occupied child slots and
+# a tuple of the children, each a leaf (hash, key, value) or a node. Keys whose 64 bit
+# hashes are equal end in a collision node below the last level.
+
+_MASK = (1 << 64) - 1
+_MISSING = object()
+
+
+class _Node:
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collision:
+    __slots__ = ("entries",)
+
+    def __init__(self, entries):
+        self.entries = entries
+
+
+_EMPTY = _Node(0, ())
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    _popcount = int.bit_count
+else:
+
+    def _popcount(x):
+        return bin(x).count("1")
+
+
+def _find(node, h, key):
+    """
+    Return the leaf of `key`, whose hash is `h`, or None.
+    """
+    shift = 0
+    while True:
+        if type(node) is _Collision:
+            for leaf in node.entries:
+                if leaf[1] == key:
+                    return leaf
+            return None
+        bit = 1 << ((h >> shift) & 31)
+        if not node.bitmap & bit:
+            return None
+        entry = node.entries[_popcount(node.bitmap & (bit - 1))]
+        if type(entry) is tuple:
+            return entry if entry[0] == h and entry[1] == key else None
+        node = entry
+        shift += 5
+
+
+def _join(shift, a, b):
+    """
+    Return a node holding the leaves `a` and `b`, which have different keys.
+    """
+    if shift >= 64:
+        return _Collision((a, b))
+    ia = (a[0] >> shift) & 31
+    ib = (b[0] >> shift) & 31
+    if ia == ib:
+        return _Node(1 << ia, (_join(shift + 5, a, b),))
+    return _Node((1 << ia) | (1 << ib), (a, b) if ia < ib else (b, a))
+
+
+def _assoc(node, shift, leaf):
+    """
+    Return a copy of `node` with `leaf` added or replacing the leaf with the same key.
+    """
+    h, key = leaf[0], leaf[1]
+    if type(node) is _Collision:
+        return _Collision(tuple(e for e in node.entries if e[1] != key) + (leaf,))
+    bit = 1 << ((h >> shift) & 31)
+    idx = _popcount(node.bitmap & (bit - 1))
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, entries[:idx] + (leaf,) + entries[idx:])
+    entry = entries[idx]
+    if type(entry) is tuple:
+        new = leaf if entry[0] == h and entry[1] == key else _join(shift + 5, entry, leaf)
+    else:
+        new = _assoc(entry, shift + 5, leaf)
+    return _Node(node.bitmap, entries[:idx] + (new,) + entries[idx + 1 :])
+
+
+def _dissoc(node, shift, h, key):
+    """
+    Return a copy of `node` without `key`, which must be in it, or None if it becomes empty.
+    """
+    if type(node) is _Collision:
+        rest = tuple(e for e in node.entries if e[1] != key)
+        return rest[0] if len(rest) == 1 else _Collision(rest)
+    bit = 1 << ((h >> shift) & 31)
+    idx = _popcount(node.bitmap & (bit - 1))
+    entries = node.entries
+    entry = entries[idx]
+    new = None if type(entry) is tuple else _dissoc(entry, shift + 5, h, key)
+    if new is None:
+        if node.bitmap == bit:
+            return None
+        return _Node(node.bitmap ^ bit, entries[:idx] + entries[idx + 1 :])
+    if type(new) is _Node and len(new.entries) == 1 and type(new.entries[0]) is tuple:
+        new = new.entries[0]  # a lone leaf moves up, its slot at this level is enough to find it
+    return _Node(node.bitmap, entries[:idx] + (new,) + entries[idx + 1 :])
+
+
+def _leaves(node):
+    stack = [node]
+    while stack:
+        for entry in stack.pop().entries:
+            if type(entry) is tuple:
+                yield entry
+            else:
+                stack.append(entry)
+
+
+# %% -----------------------------------------------------------------------------------------------
+# A version is the tuple (forward trie, inverse trie, size, next sequence number). The
+# forward trie maps key -> (value, sequence number), the inverse trie maps value -> key,
+# and the sequence number gives the order of the keys.
+
+
+def _hash(x):
+    return hash(x) & _MASK
+
+
+def _lookup(state, x):
+    """
+    Return the partner of `x` (a key or a value) in the version `state`, or _MISSING.
+    """
+    fwd, inv = state[0], state[1]
+    h = _hash(x)
+    leaf = _find(fwd, h, x)
+    if leaf is not None:
+        return leaf[2][0]
+    leaf = _find(inv, h, x)
+    if leaf is not None:
+        return leaf[2]
+    return _MISSING
+
+
+def _remove_pair(fwd, inv, key, val):
+    fwd = _dissoc(fwd, 0, _hash(key), key) or _EMPTY
+    inv = _dissoc(inv, 0, _hash(val), val) or _EMPTY
+    return fwd, inv
+
+
+def _set(state, key, val):
+    """
+    Return the version after `md[key] = val`, with the same rules as `MirrorDict._update`.
+    """
+    fwd, inv, size, seq = state
+    hk, hv = _hash(key), _hash(val)
+    order = None
+    leaf = _find(fwd, hk, key)
+    if leaf is not None:  # key already defined, keeps its position
+        val_old, order = leaf[2]
+        if val_old == val:
+            return state
+        inv = _dissoc(inv, 0, _hash(val_old), val_old) or _EMPTY
+        size -= 1
+
+    leaf = _find(inv, hk, key)
+    if leaf is not None:  # key is a value, reverse storage direction
+        fwd, inv = _remove_pair(fwd, inv, leaf[2], key)
+        size -= 1
+
+    leaf = _find(inv, hv, val)
+    if leaf is not None:  # val already defined, update key to it
+        fwd = _dissoc(fwd, 0, _hash(leaf[2]), leaf[2]) or _EMPTY
+        inv = _dissoc(inv, 0, hv, val) or _EMPTY
+        size -= 1
+
+    leaf = _find(fwd, hv, val)
+    if leaf is not None:  # val is a key, reverse storage direction
+        fwd, inv = _remove_pair(fwd, inv, val, leaf[2][0])
+        size -= 1
+
+    if order is None:
+        order = seq
+        seq += 1
+    fwd = _assoc(fwd, 0, (hk, key, (val, order)))
+    inv = _assoc(inv, 0, (hv, val, key))
+    return fwd, inv, size + 1, seq
+
+
+def _delete(state, x):
+    """
+    Return the version without the pair of `x` and the partner of `x`, or (state, _MISSING).
+    """
+    fwd, inv, size, seq = state
+    h = _hash(x)
+    leaf = _find(fwd, h, x)
+    if leaf is not None:
+        other = leaf[2][0]
+        fwd, inv = _remove_pair(fwd, inv, x, other)
+        return (fwd, inv, size - 1, seq), other
+    leaf = _find(inv, h, x)
+    if leaf is not None:
+        other = leaf[2]
+        fwd, inv = _remove_pair(fwd, inv, other, x)
+        return (fwd, inv, size - 1, seq), other
+    return state, _MISSING
+
+
+def _pairs(state):
+    """
+    Return the (key, value) pairs of the version `state` in key order.
+    """
+    leaves = sorted(_leaves(state[0]), key=lambda leaf: leaf[2][1])
+    return [(leaf[1], leaf[2][0]) for leaf in leaves]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class MirrorSnapshot(Mapping):
+    """
+    Read-only view of one version of a `PersistentMirrorDict`, see `PersistentMirrorDict.at()`.
+
+    Supports the `MirrorDict` lookups in both directions (`s[x]`, `s.get(x)`, `x in s`),
+    `len(s)`, and iteration over the keys, values, and pairs in key order.
+
+    Attributes:
+        version (int): The version of the mirror that this view shows.
+    """
+
+    __slots__ = ("_state", "version")
+
+    def __init__(self, state, version):
+        self._state = state
+        self.version = version
+
+    def get(self, key, default=None):
+        result = _lookup(self._state, key)
+        return default if result is _MISSING else result
+
+    def items(self):
+        """
+        Return the (key, value) pairs in key order.
+        """
+        return _pairs(self._state)
+
+    def keys(self):
+        """
+        Return the keys in order.
+        """
+        return [k for k, _ in _pairs(self._state)]
+
+    def values(self):
+        """
+        Return the values in the order of their keys.
+        """
+        return [v for _, v in _pairs(self._state)]
+
+    def to_mirror(self):
+        """
+        Return a `MirrorDict` with the pairs of this version.
+        """
+        from . import MirrorDict
+
+        return MirrorDict(_pairs(self._state))
+
+    def __str__(self):
+        return f"MirrorSnapshot({dict(_pairs(self._state))}, version={self.version})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return self._state[2]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return _lookup(self._state, key) is not _MISSING
+
+    def __getitem__(self, key):
+        result = _lookup(self._state, key)
+        if result is _MISSING:
+            raise KeyError(f'MirrorSnapshot[key] does not have key="{key}".')
+        return result
+
+    def __eq__(self, other):
+        if isinstance(other, (MirrorSnapshot, PersistentMirrorDict)):
+            other = dict(other.items())
+        elif not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(_pairs(self._state)) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class PersistentMirrorDict(MutableMapping):
+    """
+    A mirror that records a version for every change and reads any earlier version
+    with `at(version)`, storing the versions in shared persistent tries.
+
+    Has the same mirror rules and mapping API as `MirrorDict`, with version 0 holding
+    the pairs passed to the constructor.
+
+    Example Usage:
+        >>> md = PersistentMirrorDict(a=1)
+        >>> md["a"] = 2
+        >>> md.version, md.at(0)["a"], md["a"]
+        (1, 1, 2)
+    """
+
+    _versions: list  # the version tuples, see _set()
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize a PersistentMirrorDict instance, see `MirrorDict.__init__`.
+        """
+        self._versions = [(_EMPTY, _EMPTY, 0, 0)]
+        self._state = self._versions[0]
+        self.update(*args, **kwargs)
+        self._versions[0] = self._state
+        del self._versions[1:]  # the constructor's pairs are version 0
+
+    @property
+    def version(self):
+        """
+        The number of the current version.
+        """
+        return len(self._versions) - 1
+
+    def _commit(self, state):
+        if state is self._state:  # _set returns the same version when nothing changed
+            return
+        self._state = state
+        self._versions.append(state)
+
+    def at(self, version):
+        """
+        Return a read-only `MirrorSnapshot` of the mirror as it was at `version`.
+
+        Raises:
+            IndexError: If `version` is not between 0 and the current version.
+
+        Example:
+            >>> md = PersistentMirrorDict(a=1)
+            >>> md["b"] = 1
+            >>> md.at(0)[1], md.at(1)[1]
+            ('a', 'b')
+        """
+        if not isinstance(version, int) or not 0 <= version < len(self._versions):
+            raise IndexError(
+                f"PersistentMirrorDict.at(version) version={version} is not in the range 0 to {self.version}."
+            )
+        return MirrorSnapshot(self._versions[version], version)
+
+    def clear(self):
+        """
+        Remove all items, recorded as a new version if the mirror was not empty.
+        """
+        if self._state[2]:
+            self._commit((_EMPTY, _EMPTY, 0, self._state[3]))
+        return self
+
+    def copy(self):
+        """
+        Return a PersistentMirrorDict with the current pairs as its version 0, in O(1).
+        """
+        md = PersistentMirrorDict()
+        md._state = self._state
+        md._versions = [self._state]
+        return md
+
+    def get(self, key, default=None):
+        result = _lookup(self._state, key)
+        return default if result is _MISSING else result
+
+    def items(self):
+        """
+        Return the (key, value) pairs in key order.
+        """
+        return _pairs(self._state)
+
+    def keys(self):
+        """
+        Return the keys in order.
+        """
+        return [k for k, _ in _pairs(self._state)]
+
+    def pop(self, key, default=KeyError):
+        state, result = _delete(self._state, key)
+        if result is not _MISSING:
+            self._commit(state)
+            return result
+        if default is not KeyError:
+            return default
+        raise KeyError(f'PersistentMirrorDict.pop(key, default) key="{key}" not found and default=KeyError.')
+
+    def popitem(self):
+        """
+        Remove and return the last (key, value) pair, which is O(n).
+        """
+        if self._state[2] == 0:
+            raise KeyError("PersistentMirrorDict.popitem() dictionary is empty.")
+        leaf = max(_leaves(self._state[0]), key=lambda leaf: leaf[2][1])
+        self._commit(_delete(self._state, leaf[1])[0])
+        return leaf[1], leaf[2][0]
+
+    def setdefault(self, key, default=None):
+        result = _lookup(self._state, key)
+        if result is not _MISSING:
+            return result
+        self[key] = default
+        return default
+
+    def snapshot(self):
+        """
+        Return a read-only `MirrorSnapshot` of the current version.
+        """
+        return MirrorSnapshot(self._state, self.version)
+
+    def update(self, *args, **kwargs):
+        """
+        Update the mirror with key-value pairs from mappings, iterables, or keyword
+        arguments, recorded as one new version if any pair changed.
+        """
+        state = self._state
+        for arg in args:
+            if isinstance(arg, Mapping):
+                pairs = arg.items()
+            elif hasattr(arg, "__iter__") and not isinstance(arg, str):
+                pairs = arg
+            else:
+                raise TypeError(
+                    f"PersistentMirrorDict.update() expected a dict-like or an iterable of key-value pairs but received: {arg}"
+                )
+            for key, val in pairs:
+                state = self._update(state, key, val)
+        for key, val in kwargs.items():
+            state = self._update(state, key, val)
+        self._commit(state)
+        return self
+
+    def values(self):
+        """
+        Return the values in the order of their keys.
+        """
+        return [v for _, v in _pairs(self._state)]
+
+    def _update(self, state, key, val):
+        if not isinstance(key, Hashable) or not isinstance(val, Hashable):
+            _raise_unhashable(key, val, "PersistentMirrorDict")
+        return _set(state, key, val)
+
+    def __str__(self):
+        return f"PersistentMirrorDict({dict(_pairs(self._state))})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return self._state[2]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return _lookup(self._state, key) is not _MISSING
+
+    def __setitem__(self, key, value):
+        self._commit(self._update(self._state, key, value))
+
+    def __getitem__(self, key):
+        result = _lookup(self._state, key)
+        if result is _MISSING:
+            raise KeyError(f'PersistentMirrorDict[key] does not have key="{key}".')
+        return result
+
+    def __delitem__(self, key):
+        state, result = _delete(self._state, key)
+        if result is _MISSING:
+            raise KeyError(f'del PersistentMirrorDict[key] does not have key="{key}".')
+        self._commit(state)
+
+    def __eq__(self, other):
+        if isinstance(other, (MirrorSnapshot, PersistentMirrorDict)):
+            other = dict(other.items())
+        elif not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(_pairs(self._state)) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
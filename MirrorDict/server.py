@@ -0,0 +1,451 @@
+"""
+MirrorDict Server Module
+
+This module defines a small server that hosts one `MirrorDict` over a Unix domain
+socket (`MirrorDictServer`), and a client with the same mapping API
+(`MirrorDictClient`), so several processes on one host share a single mutable mirror.
+The module imports on every platform, but creating a server or client raises OSError
+where Unix domain sockets are not available (e.g. Windows).
+
+Protocol:
+    Every message is a 4-byte big-endian length followed by a pickled payload.
+    A request is `(method, args)` and a response is `(ok, result)`, where `result`
+    is the exception to re-raise when `ok` is False. Responses are returned in the
+    order the requests were sent, so a client can write many requests before reading
+    any responses (pipelining). The server processes every complete request it has
+    received under a single lock acquisition and returns the responses in one write.
+
+    Batched requests, `get_many(keys)` and `update(pairs)`, do many lookups or inserts
+    in one round trip, so the cost is set by round trips instead of per-key calls.
+
+Security:
+    Payloads are pickled, so only processes trusted to run code as the server user
+    should be able to connect. The socket file is created with the permissions of
+    the server process umask, use the filesystem permissions of its directory to
+    restrict access.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDictServer, MirrorDictClient
+    >>> server = MirrorDictServer("/tmp/ids.sock").start()   # or: python -m MirrorDict.server /tmp/ids.sock
+    >>> client = MirrorDictClient("/tmp/ids.sock")
+    >>> client["a"] = 1
+    >>> client[1]
+    'a'
+    >>> client.get_many(["a", 1, "z"])
+    [1, 'a', None]
+    >>> pipe = client.pipeline()
+    >>> pipe.setitem("b", 2).get("b").execute()
+    [None, 2]
+    >>> client.close()
+    >>> server.close()
+"""
+
+import os
+import pickle
+import socket
+import socketserver
+import stat
+import struct
+import threading
+from collections.abc import Mapping, MutableMapping
+
+from . import MirrorDict
+
+__all__ = ["MirrorDictServer", "MirrorDictClient"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_SIZE = struct.Struct("!I")
+_MISSING = object()
+
+
+def _frame(obj):
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    return _SIZE.pack(len(data)) + data
+
+
+def _recv_exact(sock, size):
+    buf = bytearray(size)
+    view = memoryview(buf)
+    pos = 0
+    while pos < size:
+        n = sock.recv_into(view[pos:])
+        if n == 0:
+            raise ConnectionError("MirrorDict server connection closed.")
+        pos += n
+    return buf
+
+
+def _get_many(md, keys, default=None):
+    get = md.get
+    return [get(key, default) for key in keys]
+
+
+def _clear(md):
+    md.clear()
+
+
+def _update(md, pairs):
+    md.update(pairs)  # returns None instead of the mirror, so the response is not the whole mirror
+
+
+def _pop(md, key, default=_MISSING):
+    if default is _MISSING:
+        return md.pop(key)
+    return md.pop(key, default)
+
+
+_METHODS = {
+    "getitem": lambda md, key: md[key],
+    "get": lambda md, key, default=None: md.get(key, default),
+    "get_many": _get_many,
+    "contains": lambda md, key: key in md,
+    "setitem": lambda md, key, val: md.__setitem__(key, val),
+    "setdefault": lambda md, key, default=None: md.setdefault(key, default),
+    "update": _update,
+    "delitem": lambda md, key: md.__delitem__(key),
+    "pop": _pop,
+    "popitem": lambda md: md.popitem(),
+    "clear": _clear,
+    "len": lambda md: len(md),
+    "keys": lambda md: list(md.keys()),
+    "values": lambda md: list(md.values()),
+    "items": lambda md: list(md.items()),
+}
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        sock = self.request
+        server = self.server
+        buf = bytearray()
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return
+            buf += chunk
+
+            requests = []
+            pos = 0
+            while len(buf) - pos >= _SIZE.size:
+                (size,) = _SIZE.unpack_from(buf, pos)
+                if len(buf) - pos - _SIZE.size < size:
+                    break
+                start = pos + _SIZE.size
+                requests.append(pickle.loads(buf[start : start + size]))
+                pos = start + size
+            del buf[:pos]
+            if not requests:
+                continue
+
+            responses = []
+            with server.lock:
+                md = server.mirror
+                for request in requests:
+                    try:
+                        method, args = request
+                        responses.append(_frame((True, _METHODS[method](md, *args))))
+                    except Exception as e:
+                        responses.append(_frame((False, e)))
+            sock.sendall(b"".join(responses))
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+else:  # e.g. Windows, the module still imports and the classes raise when they are created
+    _UnixServer = None
+
+
+def _require_unix(name):
+    if _UnixServer is None:
+        raise OSError(f"{name} requires Unix domain sockets, which are not available on this platform.")
+
+
+class MirrorDictServer:
+    """
+    Host a `MirrorDict` over a Unix domain socket for `MirrorDictClient` connections.
+
+    Each client connection is served by its own thread, and every batch of requests
+    received on a connection is processed under one lock on the hosted mirror.
+
+    Args:
+        path (str): Filesystem path of the Unix domain socket. An existing socket file
+                    at that path is replaced, any other existing file raises FileExistsError.
+        mirror (MirrorDict, optional): The mirror to host. Defaults to a new empty MirrorDict.
+
+    Raises:
+        OSError: If the platform has no Unix domain sockets (e.g. Windows).
+
+    Example Usage:
+        >>> server = MirrorDictServer("/tmp/ids.sock", MirrorDict(a=1)).start()
+        >>> server.close()
+    """
+
+    def __init__(self, path, mirror=None):
+        _require_unix("MirrorDictServer")
+        self.path = os.fspath(path)
+        self.mirror = MirrorDict() if mirror is None else mirror
+        self.lock = threading.Lock()
+        try:
+            mode = os.stat(self.path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"MirrorDictServer(): path exists and is not a socket: {self.path}")
+            os.unlink(self.path)  # stale socket of a previous server
+        self._server = _UnixServer(self.path, _Handler)
+        self._server.mirror = self.mirror
+        self._server.lock = self.lock
+        self._thread = None
+
+    def serve_forever(self):
+        """
+        Serve clients in the current thread until `close()` is called from another thread.
+        """
+        self._server.serve_forever()
+
+    def start(self):
+        """
+        Serve clients from a background daemon thread and return self.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MirrorDictServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """
+        Stop serving, close the socket, and remove the socket file.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class _Pipeline:
+    """
+    Queue of requests that are sent to the server in one write by `execute()`.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._requests = []
+
+    def __len__(self):
+        return len(self._requests)
+
+    def __getattr__(self, method):
+        if method not in _METHODS:
+            raise AttributeError(f"MirrorDictClient.pipeline() has no method '{method}'.")
+
+        def queue(*args):
+            self._requests.append((method, args))
+            return self
+
+        return queue
+
+    def execute(self, raise_on_error=True):
+        """
+        Send the queued requests and return their results in order.
+
+        Args:
+            raise_on_error (bool): If True, raise the first error returned by the server
+                                   after all responses are received. If False, the
+                                   exception is returned in place of the result.
+        """
+        requests, self._requests = self._requests, []
+        responses = self._client._send(requests)
+        if raise_on_error:
+            for ok, result in responses:
+                if not ok:
+                    raise result
+        return [result for _, result in responses]
+
+
+class MirrorDictClient(MutableMapping):
+    """
+    Client for a `MirrorDictServer` with the same mapping API as `MirrorDict`.
+
+    Every method is one round trip to the server. Use `get_many()` and `update()` to
+    look up or insert many pairs in one round trip, and `pipeline()` to send a
+    sequence of different requests in one round trip.
+
+    Args:
+        path (str): Filesystem path of the server's Unix domain socket.
+
+    Example Usage:
+        >>> client = MirrorDictClient("/tmp/ids.sock")
+        >>> client.update({"a": 1, "b": 2})
+        >>> client.get_many(["a", 2])
+        [1, 'b']
+    """
+
+    def __init__(self, path):
+        _require_unix("MirrorDictClient")
+        self.path = os.fspath(path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(self.path)
+        self._lock = threading.Lock()
+
+    def _send(self, requests):
+        sock = self._sock
+        with self._lock:
+            sock.sendall(b"".join(_frame(request) for request in requests))
+            responses = []
+            for _ in requests:
+                (size,) = _SIZE.unpack(_recv_exact(sock, _SIZE.size))
+                responses.append(pickle.loads(_recv_exact(sock, size)))
+        return responses
+
+    def _call(self, method, *args):
+        ok, result = self._send([(method, args)])[0]
+        if not ok:
+            raise result
+        return result
+
+    def close(self):
+        """
+        Close the connection to the server.
+        """
+        self._sock.close()
+
+    def pipeline(self):
+        """
+        Return a pipeline that queues requests, using the server method names
+        (getitem, get, get_many, contains, setitem, setdefault, update, delitem,
+        pop, popitem, clear, len, keys, values, items), and sends them all in one
+        round trip with `execute()`.
+
+        Example:
+            >>> pipe = client.pipeline()
+            >>> pipe.setitem("c", 3).getitem(3).contains("z").execute()
+            [None, 'c', False]
+        """
+        return _Pipeline(self)
+
+    def copy(self):
+        """
+        Return a local MirrorDict copy of the hosted mirror.
+        """
+        return MirrorDict(self._call("items"))
+
+    def get(self, key, default=None):
+        return self._call("get", key, default)
+
+    def get_many(self, keys, default=None):
+        """
+        Look up every key (or value) in `keys` in one round trip and return the
+        results as a list, with `default` for the ones not found.
+        """
+        return self._call("get_many", list(keys), default)
+
+    def items(self):
+        return self._call("items")
+
+    def keys(self):
+        return self._call("keys")
+
+    def pop(self, key, default=_MISSING):
+        if default is _MISSING:
+            return self._call("pop", key)
+        return self._call("pop", key, default)
+
+    def popitem(self):
+        return self._call("popitem")
+
+    def setdefault(self, key, default=None):
+        return self._call("setdefault", key, default)
+
+    def clear(self):
+        self._call("clear")
+
+    def update(self, *args, **kwargs):
+        """
+        Send all key-value pairs from mappings, iterables, or keyword arguments to the
+        server in one round trip, where they are applied in order.
+        """
+        pairs = []
+        for arg in args:
+            if isinstance(arg, (Mapping, MirrorDict)):
+                pairs.extend(arg.items())
+            elif hasattr(arg, "__iter__") and not isinstance(arg, str):
+                pairs.extend(arg)
+            else:
+                raise TypeError(
+                    f"MirrorDictClient.update() expected a dict-like or an iterable of key-value pairs but received: {arg}"
+                )
+        pairs.extend(kwargs.items())
+        self._call("update", pairs)
+
+    def values(self):
+        return self._call("values")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._call("len")
+
+    def __iter__(self):
+        return iter(self._call("keys"))
+
+    def __contains__(self, key):
+        return self._call("contains", key)
+
+    def __setitem__(self, key, value):
+        self._call("setitem", key, value)
+
+    def __getitem__(self, key):
+        return self._call("getitem", key)
+
+    def __delitem__(self, key):
+        self._call("delitem", key)
+
+    def __eq__(self, other):
+        return MirrorDict(self._call("items")) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host a MirrorDict over a Unix domain socket.")
+    parser.add_argument("path", help="path of the Unix domain socket to create")
+    server = MirrorDictServer(parser.parse_args().path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -0,0 +1,404 @@
+"""
+SharedMirrorDict Module
+
+This module defines the `SharedMirrorDict` class, a read-only `MirrorDict` whose
+forward (`k:v`) and inverse (`v:k`) lookup tables live in a single
+`multiprocessing.shared_memory` block. One process builds the block with
+`SharedMirrorDict.create()`, and any number of other processes attach to it by
+name and serve lookups directly from the shared buffer without copying it.
+
+Only `str` and `int` keys and values are supported, since they have a
+process independent binary encoding and hash. A `bool` is stored as its int with a
+flag in its type tag, so it hashes and matches like the int and is returned as a bool.
+
+Shared Memory Layout:
+    header   - magic, pair count, table capacity, and the offsets of the sections below.
+    records  - one fixed-size record per pair (in key order) holding the offset,
+               length, and type tag of the encoded key and value.
+    forward  - open addressing hash table (uint32 record index + 1) keyed on the keys.
+    inverse  - open addressing hash table (uint32 record index + 1) keyed on the values.
+    data     - the encoded bytes of every key and value.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDict, SharedMirrorDict
+    >>> smd = SharedMirrorDict.create(MirrorDict(a=1, b=2), name="ids")
+    >>> worker = SharedMirrorDict("ids")   # in another process
+    >>> worker["a"], worker[2]
+    (1, 'b')
+    >>> worker.close()
+    >>> smd.close()
+    >>> smd.unlink()
+"""
+
+from collections.abc import Mapping
+from hashlib import blake2b
+from numbers import Number
+from multiprocessing import shared_memory
+import struct
+import sys
+
+from . import MirrorDict
+
+__all__ = ["SharedMirrorDict"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_MAGIC = b"MIRRDICT"
+_HEADER = struct.Struct("<8sQQQQQQ")  # magic, n, cap, rec_off, fwd_off, inv_off, data_off
+_RECORD = struct.Struct("<QIQIBB2x")  # key_off, key_len, val_off, val_len, key_tag, val_tag
+
+_STR = 1
+_INT = 2
+_BOOL = 0x80  # flag on _INT, the int was a bool, ignored by hashing and matching
+_TYPE = 0x7F  # the tag without the flag
+
+
+def _encode(obj):
+    """
+    Return the (tag, bytes) encoding of `obj` or None if `obj` is not a str or int.
+    """
+    tp = type(obj)
+    if tp is str:
+        return _STR, obj.encode("utf-8", "surrogatepass")
+    if tp is int:
+        return _INT, obj.to_bytes(obj.bit_length() // 8 + 1, "little", signed=True)
+    if tp is bool:
+        return _INT | _BOOL, bytes((obj,))
+    return None
+
+
+def _decode(tag, data):
+    if tag == _STR:
+        return str(data, "utf-8", "surrogatepass")
+    if tag & _BOOL:
+        return bool(data[0])
+    return int.from_bytes(data, "little", signed=True)
+
+
+def _as_int(obj):
+    """
+    Return the int equal to the number `obj` (e.g. 1.0 or Decimal(1)), which a
+    `MirrorDict` finds under that int, or None.
+    """
+    if not isinstance(obj, Number):
+        return None
+    try:
+        i = int(obj)
+    except (TypeError, ValueError, OverflowError):  # complex, nan, inf
+        return None
+    return i if i == obj else None
+
+
+def _hash(tag, data):
+    """
+    Process independent hash, Python's str hash is randomized per interpreter.
+    """
+    return int.from_bytes(blake2b(bytes((tag,)) + data, digest_size=8).digest(), "little")
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _attach(name):
+    """
+    Attach to an existing shared memory block without letting this process's
+    resource tracker unlink it when the process exits.
+
+    Before Python 3.13 attaching always registers the block with the resource tracker.
+    Processes started by multiprocessing (or forked after the block was created) share
+    the creator's tracker, where the registration is harmless. A process that has to
+    start its own tracker would unlink the block on exit, so it is unregistered there.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    if sys.platform == "win32":
+        return shared_memory.SharedMemory(name=name)
+
+    from multiprocessing import resource_tracker
+
+    private_tracker = getattr(resource_tracker._resource_tracker, "_fd", None) is None
+    shm = shared_memory.SharedMemory(name=name)
+    if private_tracker:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class SharedMirrorDict(Mapping):
+    """
+    A read-only `MirrorDict` stored in `multiprocessing.shared_memory`.
+
+    The building process calls `SharedMirrorDict.create(data)` to write the mirror
+    to a new shared memory block. Worker processes call `SharedMirrorDict(name)` to
+    attach to that block and serve `__getitem__`, `get`, and `__contains__` directly
+    from it, so the memory is paid once per host instead of once per process.
+
+    Lookups follow the `MirrorDict` rules: a key returns its value and a value
+    returns its key. The order of `keys()`, `values()`, and `items()` is the order
+    of the `MirrorDict` the block was built from.
+
+    Constraints:
+        - Keys and values must be `str` or `int` (including `bool`, which is returned
+          as a bool). As in a `MirrorDict`, a lookup with a number that equals an int,
+          such as `True` or `1.0`, finds that int.
+        - The mirror is immutable once created.
+
+    Example Usage:
+        >>> smd = SharedMirrorDict.create({'a': 1, 'b': 2})
+        >>> other = SharedMirrorDict(smd.name)
+        >>> other['b'], other[1]
+        (2, 'a')
+    """
+
+    def __init__(self, name):
+        """
+        Attach to the existing SharedMirrorDict shared memory block called `name`.
+
+        Args:
+            name (str): Name of the shared memory block, see the `name` attribute
+                        of the instance returned by `SharedMirrorDict.create()`.
+        """
+        self._open(_attach(name), owner=False)
+
+    @classmethod
+    def create(cls, data=(), name=None):
+        """
+        Build a SharedMirrorDict in a new shared memory block.
+
+        Args:
+            data: A MirrorDict, mapping, or iterable of key-value pairs. Anything that
+                  is not already a MirrorDict is passed through `MirrorDict(data)`
+                  to resolve the mirrored relationships first.
+            name (str, optional): Name of the shared memory block. If not provided
+                                  a unique name is generated.
+
+        Returns:
+            SharedMirrorDict: The instance that owns the block and is responsible
+                              for calling `unlink()` when it is no longer needed.
+
+        Raises:
+            TypeError: If a key or value is not a str or int.
+        """
+        if not isinstance(data, MirrorDict):
+            data = MirrorDict(data)
+
+        n = len(data)
+        cap = 8
+        while cap < 2 * n:
+            cap <<= 1
+
+        records = []
+        blob = bytearray()
+        for key, val in data.items():
+            enc_key = _encode(key)
+            enc_val = _encode(val)
+            if enc_key is None or enc_val is None:
+                raise TypeError(
+                    f"SharedMirrorDict.create(): keys and values must be str or int, but received key='{key}' "
+                    f"({type(key)}) and value='{val}' ({type(val)})."
+                )
+            records.append((enc_key, len(blob), enc_val, len(blob) + len(enc_key[1])))
+            blob += enc_key[1]
+            blob += enc_val[1]
+
+        rec_off = _align(_HEADER.size)
+        fwd_off = _align(rec_off + n * _RECORD.size)
+        inv_off = fwd_off + 4 * cap
+        data_off = inv_off + 4 * cap
+        size = max(data_off + len(blob), 1)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        buf = shm.buf
+        fwd = buf[fwd_off:inv_off].cast("I")
+        inv = buf[inv_off:data_off].cast("I")
+        try:
+            _HEADER.pack_into(buf, 0, _MAGIC, n, cap, rec_off, fwd_off, inv_off, data_off)
+            buf[data_off : data_off + len(blob)] = blob
+
+            mask = cap - 1
+            for i, ((key_tag, key), key_pos, (val_tag, val), val_pos) in enumerate(records):
+                rec = (data_off + key_pos, len(key), data_off + val_pos, len(val), key_tag, val_tag)
+                _RECORD.pack_into(buf, rec_off + i * _RECORD.size, *rec)
+                for table, h in ((fwd, _hash(key_tag & _TYPE, key)), (inv, _hash(val_tag & _TYPE, val))):
+                    slot = h & mask
+                    while table[slot]:
+                        slot = (slot + 1) & mask
+                    table[slot] = i + 1
+        except BaseException:
+            fwd.release()
+            inv.release()
+            del buf
+            shm.close()
+            shm.unlink()
+            raise
+        fwd.release()
+        inv.release()
+        del buf
+
+        self = cls.__new__(cls)
+        self._open(shm, owner=True)
+        return self
+
+    def _open(self, shm, owner):
+        self._shm = shm
+        self._owner = owner
+        magic, n, cap, rec_off, fwd_off, inv_off, data_off = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC:
+            shm.close()
+            raise ValueError(f"SharedMirrorDict(): shared memory block '{shm.name}' is not a SharedMirrorDict.")
+        self._n = n
+        self._mask = cap - 1
+        self._rec_off = rec_off
+        self._buf = shm.buf
+        self._fwd = shm.buf[fwd_off:inv_off].cast("I")
+        self._inv = shm.buf[inv_off:data_off].cast("I")
+
+    @property
+    def name(self):
+        """
+        Name of the shared memory block that other processes attach to.
+        """
+        return self._shm.name
+
+    def close(self):
+        """
+        Detach from the shared memory block. The instance is unusable afterwards.
+        """
+        if self._buf is None:
+            return
+        self._fwd.release()
+        self._inv.release()
+        self._buf = self._fwd = self._inv = None
+        self._shm.close()
+
+    def unlink(self):
+        """
+        Destroy the shared memory block. Only needs to be called once, by the creator,
+        after every process is done with it.
+        """
+        self._shm.unlink()
+
+    def copy(self):
+        """
+        Return a process local MirrorDict copy of the shared mirror.
+        """
+        return MirrorDict(self.items())
+
+    def _record(self, i):
+        key_off, key_len, val_off, val_len, key_tag, val_tag = _RECORD.unpack_from(
+            self._buf, self._rec_off + i * _RECORD.size
+        )
+        return key_off, key_len, key_tag, val_off, val_len, val_tag
+
+    def _find(self, obj):
+        """
+        Return (record, is_key) for `obj` or None if it is not in the mirror.
+        """
+        enc = _encode(obj)
+        if enc is None:
+            obj = _as_int(obj)
+            if obj is None:
+                return None
+            enc = _encode(obj)
+        tag, data = enc[0] & _TYPE, enc[1]
+        h = _hash(tag, data)
+        buf = self._buf
+        mask = self._mask
+        for table, is_key in ((self._fwd, True), (self._inv, False)):
+            slot = h & mask
+            while True:
+                i = table[slot]
+                if not i:
+                    break
+                rec = self._record(i - 1)
+                off, size, rec_tag = rec[0:3] if is_key else rec[3:6]
+                if rec_tag & _TYPE == tag and size == len(data) and buf[off : off + size] == data:
+                    return rec, is_key
+                slot = (slot + 1) & mask
+        return None
+
+    def get(self, key, default=None):
+        """
+        Return the value for key if key is in the dictionary, else default.
+        """
+        found = self._find(key)
+        if found is None:
+            return default
+        rec, is_key = found
+        off, size, tag = rec[3:6] if is_key else rec[0:3]
+        return _decode(tag, self._buf[off : off + size])
+
+    def items(self):
+        """
+        Iterate over key-value pairs in key order.
+        """
+        buf = self._buf
+        for i in range(self._n):
+            key_off, key_len, key_tag, val_off, val_len, val_tag = self._record(i)
+            yield (
+                _decode(key_tag, buf[key_off : key_off + key_len]),
+                _decode(val_tag, buf[val_off : val_off + val_len]),
+            )
+
+    def keys(self):
+        """
+        Iterate over the keys in key order.
+        """
+        return iter(self)
+
+    def values(self):
+        """
+        Iterate over the values in key order.
+        """
+        for _, val in self.items():
+            yield val
+
+    def __reduce__(self):  # pickle by name so workers re-attach instead of copying
+        return SharedMirrorDict, (self.name,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __str__(self):
+        return f"SharedMirrorDict({dict(self.items())})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        buf = self._buf
+        for i in range(self._n):
+            key_off, key_len, key_tag = self._record(i)[0:3]
+            yield _decode(key_tag, buf[key_off : key_off + key_len])
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key):
+        found = self._find(key)
+        if found is None:
+            raise KeyError(f'SharedMirrorDict[key] does not have key="{key}".')
+        rec, is_key = found
+        off, size, tag = rec[3:6] if is_key else rec[0:3]
+        return _decode(tag, self._buf[off : off + size])
+
+    def __eq__(self, other):
+        if isinstance(other, (SharedMirrorDict, MirrorDict)):
+            return dict(self.items()) == dict(other.items())
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
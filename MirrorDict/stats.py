@@ -0,0 +1,179 @@
+"""
+InstrumentedMirrorDict Module
+
+This module defines the `InstrumentedMirrorDict` class, a `MirrorDict` subclass that
+counts which branch every lookup, update, and removal takes and records latency
+histograms for lookups, updates, and mirror reversals. The update branches are
+reported by `MirrorDict._update` itself, so the mirror rules are not duplicated here.
+
+The instrumentation lives entirely in the subclass, so a plain `MirrorDict` pays
+nothing for it. An existing `MirrorDict` is switched in and out of instrumented
+mode with `md.enable_stats()` and `md.disable_stats()`, which swap the class of the
+instance rather than adding checks to the hot paths.
+
+Counters:
+    lookup_key      - lookup found the item in the keys (`_key`).
+    lookup_val      - lookup found the item in the values (`_val`).
+    lookup_miss     - lookup did not find the item.
+    update_insert   - `_update` added a new pair.
+    update_same     - `_update` found the pair already defined and did nothing.
+    update_replace  - `_update` changed the value of an existing key.
+    update_reverse_key - `_update` was given a key that was a value and reversed its pair.
+    update_evict_val   - `_update` was given a value that was already in use and dropped its old key.
+    update_reverse_val - `_update` was given a value that was a key and reversed its pair.
+    remove_key      - `pop`/`del` removed the pair by its key.
+    remove_val      - `pop`/`del` removed the pair by its value.
+    remove_miss     - `pop`/`del` did not find the item.
+
+Histograms:
+    lookup, update, reverse - maps an upper bound in nanoseconds (a power of 2)
+                              to the number of calls that took less than it,
+                              "reverse" times the updates that reversed a pair.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDict
+    >>> md = MirrorDict(a=1, b=2)
+    >>> md.enable_stats()
+    >>> md["a"], md[2], md.get("z")
+    (1, 'b', None)
+    >>> md.stats()["counters"]
+    {'lookup_key': 1, 'lookup_val': 1, 'lookup_miss': 1}
+    >>> md.disable_stats()
+"""
+
+from collections import Counter
+from time import perf_counter_ns
+
+from . import _UPDATE_EVICT_VAL, _UPDATE_REPLACE, _UPDATE_REVERSE_KEY, _UPDATE_REVERSE_VAL, MirrorDict
+
+__all__ = ["InstrumentedMirrorDict"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class InstrumentedMirrorDict(MirrorDict):
+    """
+    A `MirrorDict` that records per-branch counters and latency histograms.
+
+    Behaves exactly like `MirrorDict`, with the addition of `stats()` and `reset_stats()`.
+    Use `MirrorDict.enable_stats()` to instrument an existing instance in place.
+
+    Example Usage:
+        >>> md = InstrumentedMirrorDict(a=1)
+        >>> md["b"] = 1      # 1 is already the value of "a"
+        >>> md.stats()["counters"]["update_evict_val"]
+        1
+    """
+
+    _counts: Counter
+    _hists: dict
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize an InstrumentedMirrorDict instance, see `MirrorDict.__init__`.
+        """
+        self.reset_stats()
+        super().__init__(*args, **kwargs)
+
+    def disable_stats(self):
+        """
+        Turn this instance back into a plain `MirrorDict` and discard its statistics.
+        """
+        del self._counts, self._hists
+        self.__class__ = MirrorDict
+
+    def reset_stats(self):
+        """
+        Set all counters and histograms to zero.
+        """
+        self._counts = Counter()
+        self._hists = {"lookup": Counter(), "update": Counter(), "reverse": Counter()}
+
+    def stats(self):
+        """
+        Return the recorded statistics.
+
+        Returns:
+            dict: with the keys
+                "counters":   dict of event name to count, see the module docstring.
+                "histograms": dict of "lookup", "update", and "reverse" to a dict that
+                              maps a nanosecond upper bound to the number of calls faster than it.
+        """
+        return {
+            "counters": dict(self._counts),
+            "histograms": {name: dict(sorted(hist.items())) for name, hist in self._hists.items()},
+        }
+
+    def _record(self, name, start):
+        self._hists[name][1 << (perf_counter_ns() - start).bit_length()] += 1
+
+    def _lookup(self, key, default):
+        start = perf_counter_ns()
+        if key in self._key:
+            self._counts["lookup_key"] += 1
+            result = self._key[key]
+        elif key in self._val:
+            self._counts["lookup_val"] += 1
+            result = self._val[key]
+        else:
+            self._counts["lookup_miss"] += 1
+            result = default
+        self._record("lookup", start)
+        return result
+
+    def get(self, key, default=None):
+        return self._lookup(key, default)
+
+    def pop(self, key, default=KeyError):
+        if key in self._key:
+            self._counts["remove_key"] += 1
+        elif key in self._val:
+            self._counts["remove_val"] += 1
+        else:
+            self._counts["remove_miss"] += 1
+        return super().pop(key, default)
+
+    def setdefault(self, key, default=None):
+        result = self._lookup(key, KeyError)
+        if result is not KeyError:
+            return result
+        self._update(key, default)
+        return default
+
+    def _update(self, key, val):
+        start = perf_counter_ns()
+        case = super()._update(key, val)
+        self._record("update", start)
+        counts = self._counts
+        if case is None:
+            counts["update_same"] += 1
+            return case
+        counts["update_replace" if case & _UPDATE_REPLACE else "update_insert"] += 1
+        if case & _UPDATE_REVERSE_KEY:
+            counts["update_reverse_key"] += 1
+        if case & _UPDATE_EVICT_VAL:
+            counts["update_evict_val"] += 1
+        if case & _UPDATE_REVERSE_VAL:
+            counts["update_reverse_val"] += 1
+        if case & (_UPDATE_REVERSE_KEY | _UPDATE_REVERSE_VAL):
+            self._record("reverse", start)
+        return case
+
+    def __contains__(self, key):
+        return self._lookup(key, KeyError) is not KeyError
+
+    def __getitem__(self, key):
+        result = self._lookup(key, KeyError)
+        if result is KeyError:
+            raise KeyError(f'MirrorDict[key] does not have key="{key}".')
+        return result
+
+    def __delitem__(self, key):
+        if key in self._key:
+            self._counts["remove_key"] += 1
+        elif key in self._val:
+            self._counts["remove_val"] += 1
+        else:
+            self._counts["remove_miss"] += 1
+        super().__delitem__(key)
@@ -0,0 +1,245 @@
+"""
+MirrorTransaction Module
+
+This module defines the `MirrorTransaction` class, returned by `MirrorDict.transaction()`,
+that stages many puts and deletes and applies them to the mirror all at once.
+
+Commit happens in two phases:
+    1. The staged operations are resolved against copy-on-write layers over the
+       `_key` and `_val` dicts, using the same mirror rules as `MirrorDict._update`
+       and `MirrorDict.__delitem__`. This is the only phase that can raise
+       (e.g. an unhashable key or deleting a missing key), and it does not modify
+       the mirror, so an error leaves the mirror exactly as it was.
+    2. The resolved dict operations are applied to `_key` and `_val` in one pass,
+       without repeating the hashability checks or conflict resolution. Subclasses
+       that hook into `_update` (e.g. `IndexedMirrorDict`) have the staged operations
+       replayed through their methods instead, which phase 1 has shown will succeed.
+
+Example Usage:
+    >>> from MirrorDict import MirrorDict
+    >>> md = MirrorDict(a=1, b=2)
+    >>> with md.transaction() as tx:
+    ...     tx["c"] = 3
+    ...     del tx["a"]
+    >>> md
+    MirrorDict({'b': 2, 'c': 3})
+"""
+
+from collections.abc import Hashable, Mapping
+
+from . import MirrorDict
+
+__all__ = ["MirrorTransaction"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_DELETED = object()
+
+
+class _Layer:
+    """
+    Copy-on-write view of a dict that records every change made through it.
+    """
+
+    __slots__ = ("_base", "_changes", "_ops", "_name")
+
+    def __init__(self, base, ops, name):
+        self._base = base
+        self._changes = {}
+        self._ops = ops
+        self._name = name
+
+    def __contains__(self, x):
+        found = self._changes.get(x, None)
+        if found is None and x not in self._changes:
+            return x in self._base
+        return found is not _DELETED
+
+    def __getitem__(self, x):
+        if x in self._changes:
+            found = self._changes[x]
+            if found is _DELETED:
+                raise KeyError(x)
+            return found
+        return self._base[x]
+
+    def __setitem__(self, x, y):
+        self._changes[x] = y
+        self._ops.append((self._name, x, y))
+
+    def pop(self, x):
+        y = self[x]
+        self._changes[x] = _DELETED
+        self._ops.append((self._name, x, _DELETED))
+        return y
+
+
+class _Layers:
+    """
+    The key and value layers in place of the dicts of a MirrorDict, so the staged pairs
+    are resolved by `MirrorDict._update` itself.
+    """
+
+    __slots__ = ("_key", "_val")
+
+    def __init__(self, key, val):
+        self._key = key
+        self._val = val
+
+    def _removed(self, count):
+        pass  # compaction is left to the mirror the operations are applied to
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class MirrorTransaction:
+    """
+    Staged batch of puts and deletes that is applied atomically to a MirrorDict.
+
+    Use as a context manager, `with md.transaction() as tx:`, which commits when the
+    block exits normally and discards the staged operations if it raises. Nothing
+    is applied to the mirror until commit.
+
+    Methods:
+        tx[key] = value:  stage `md[key] = value`.
+        del tx[key]:      stage `del md[key]`, which raises KeyError at commit if missing.
+        tx.discard(key):  stage removing `key` if it is present at that point.
+        tx.update(...):   stage `md.update(...)`.
+        tx.commit():      apply the staged operations.
+        tx.rollback():    discard the staged operations.
+    """
+
+    def __init__(self, mirror):
+        self._mirror = mirror
+        self._staged = []  # ("set", key, val), ("del", key, None), ("discard", key, None)
+        self._done = False
+
+    def __len__(self):
+        return len(self._staged)
+
+    def __setitem__(self, key, value):
+        self._check_open()
+        self._staged.append(("set", key, value))
+
+    def __delitem__(self, key):
+        self._check_open()
+        self._staged.append(("del", key, None))
+
+    def discard(self, key):
+        """
+        Stage removing `key` (a key or value) and its mirrored counterpart if present.
+        """
+        self._check_open()
+        self._staged.append(("discard", key, None))
+
+    def update(self, *args, **kwargs):
+        """
+        Stage key-value pairs from mappings, iterables of key-value pairs, or keyword arguments.
+        """
+        self._check_open()
+        staged = self._staged
+        for arg in args:
+            pairs = arg.items() if isinstance(arg, (Mapping, MirrorDict)) else arg
+            if isinstance(arg, str) or not hasattr(pairs, "__iter__"):
+                raise TypeError(
+                    f"MirrorDict.transaction().update() expected a dict-like or an iterable of key-value pairs "
+                    f"but received: {arg}"
+                )
+            for key, val in pairs:
+                staged.append(("set", key, val))
+        for key, val in kwargs.items():
+            staged.append(("set", key, val))
+        return self
+
+    def rollback(self):
+        """
+        Discard the staged operations, the mirror is not modified.
+        """
+        self._staged.clear()
+        self._done = True
+
+    def commit(self):
+        """
+        Apply the staged operations to the mirror.
+
+        Raises:
+            TypeError: If a staged key or value is not hashable.
+            KeyError: If a staged `del` is for a key that does not exist at that point.
+            Any error raised by an index of an `IndexedMirrorDict` rejecting a pair.
+            In all cases the mirror is left unchanged.
+        """
+        self._check_open()
+        self._done = True
+        mirror = self._mirror
+        ops = self._resolve()
+
+        if type(mirror) is MirrorDict:
+            key, val = mirror._key, mirror._val
+            removed = 0
+            for name, x, y in ops:
+                target = key if name == "key" else val
+                if y is _DELETED:
+                    del target[x]
+                    removed += 1
+                else:
+                    target[x] = y
+            if removed:
+                mirror._removed(removed)
+        else:
+            for op, key, val in self._staged:
+                if op == "set":
+                    mirror._update(key, val)
+                elif op == "del" or key in mirror:
+                    del mirror[key]
+        self._staged.clear()
+
+    def _check_open(self):
+        if self._done:
+            raise RuntimeError("MirrorDict.transaction(): the transaction has already been committed or rolled back.")
+
+    def _resolve(self):
+        """
+        Resolve the staged operations against layers over the mirror and return
+        the resulting list of (dict name, item, new value or _DELETED) operations.
+        """
+        mirror = self._mirror
+        ops = []
+        k = _Layer(mirror._key, ops, "key")
+        v = _Layer(mirror._val, ops, "val")
+        layers = _Layers(k, v)
+        indexes = getattr(mirror, "_indexes", ())
+
+        for op, key, val in self._staged:
+            if op != "set":
+                if key in k:
+                    v.pop(k.pop(key))
+                elif key in v:
+                    k.pop(v.pop(key))
+                elif op == "del":
+                    raise KeyError(f'MirrorDict.transaction(): del tx[key] does not have key="{key}".')
+                continue
+
+            if not isinstance(key, Hashable) or not isinstance(val, Hashable):
+                raise TypeError(
+                    f"MirrorDict.transaction(): both key and value must be hashable, but received key='{key}' "
+                    f"({type(key)}) and value='{val}' ({type(val)})."
+                )
+            for index in indexes:
+                index._check(key, val)
+
+            MirrorDict._update(layers, key, val)
+        return ops
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._done:
+            return
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
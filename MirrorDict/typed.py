@@ -0,0 +1,517 @@
+"""
+Typed MirrorDict Module
+
+This module defines type-specialized mirrors for the two most common layouts,
+`int <-> int` (`IntMirrorDict`) and `str <-> int` (`StrIntMirrorDict`).
+
+Instead of two dicts of boxed objects, each pair is stored once in packed
+columns (`array("q")` for int columns, a `list` for the str column) in key order,
+and both lookup directions are open addressing hash tables of `array("i")`
+entry indices into those columns. This removes the per-pair dict entries and
+int objects, and the type check on insert is a simple type test instead of the
+generic `isinstance(x, Hashable)` ABC check.
+
+Classes:
+    - `IntMirrorDict`:    MirrorDict for int keys and int values.
+    - `StrIntMirrorDict`: MirrorDict for str keys and int values.
+
+Both classes provide the same API and ordering rules as `MirrorDict`.
+Int keys and values must fit in a signed 64-bit integer.
+
+Example Usage:
+    >>> from MirrorDict import StrIntMirrorDict
+    >>> md = StrIntMirrorDict(a=1, b=2)
+    >>> md['b'], md[1]
+    (2, 'a')
+"""
+
+from array import array
+from collections.abc import ItemsView, KeysView, Mapping, MutableMapping, ValuesView
+
+from . import MirrorDict
+
+__all__ = ["IntMirrorDict", "StrIntMirrorDict"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_EMPTY = -1  # slot never used, ends a probe sequence
+_DUMMY = -2  # slot of a removed entry, probing continues past it
+_UINT64 = (1 << 64) - 1
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _capacity(n):
+    cap = 8
+    while cap < 2 * (n + 1):
+        cap <<= 1
+    return cap
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class _TypedKeysView(KeysView):
+    def __contains__(self, key):
+        return self._mapping._find_key(key) >= 0
+
+    def __iter__(self):
+        return self._mapping._iter_col(self._mapping._ks)
+
+
+class _TypedValuesView(ValuesView):
+    def __contains__(self, value):
+        return self._mapping._find_val(value) >= 0
+
+    def __iter__(self):
+        return self._mapping._iter_col(self._mapping._vs)
+
+
+class _TypedItemsView(ItemsView):
+    def __contains__(self, item):
+        key, value = item
+        e = self._mapping._find_key(key)
+        return e >= 0 and self._mapping._vs[e] == value
+
+    def __iter__(self):
+        md = self._mapping
+        ks, vs, live = md._ks, md._vs, md._live
+        for e in range(len(live)):
+            if live[e]:
+                yield ks[e], vs[e]
+
+
+class _TypedMirrorDict(MutableMapping):
+    """
+    Base class for the packed, type-specialized mirrors.
+
+    Subclasses set `_key_is_int` and `_val_is_int` to select the column storage.
+    Pairs are stored at entry index `e` in the `_ks` and `_vs` columns with
+    `_live[e]` set to 0 once removed. `_fwd` maps hash(key) -> e and `_inv`
+    maps hash(value) -> e. Dead entries are dropped whenever the tables are rebuilt.
+    """
+
+    _key_is_int: bool
+    _val_is_int: bool
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize a typed MirrorDict instance.
+
+        Args:
+            *args: A mapping object (e.g., dictionary) or an iterable of key-value pairs
+                   to initialize the mirror.
+            **kwargs: Additional key-value pairs to initialize the mirror.
+        """
+        self._reset(0)
+        self.update(*args, **kwargs)
+
+    # -- storage ------------------------------------------------------------------------------------
+
+    def _reset(self, n):
+        cap = _capacity(n)
+        self._ks = array("q") if self._key_is_int else []
+        self._vs = array("q") if self._val_is_int else []
+        self._live = bytearray()
+        self._n = 0
+        self._fwd = array("i", [_EMPTY]) * cap
+        self._inv = array("i", [_EMPTY]) * cap
+        self._ffill = 0  # number of non-empty slots in _fwd
+        self._ifill = 0  # number of non-empty slots in _inv
+
+    def _rebuild(self, extra=1):
+        """
+        Drop dead entries and rebuild both hash tables with room for `extra` more pairs.
+        """
+        pairs = list(_TypedItemsView(self))
+        self._reset(len(pairs) + extra)
+        ks, vs, live = self._ks, self._vs, self._live
+        fwd, inv = self._fwd, self._inv
+        for e, (key, val) in enumerate(pairs):
+            ks.append(key)
+            vs.append(val)
+            live.append(1)
+            fwd[self._free_slot(fwd, key)] = e
+            inv[self._free_slot(inv, val)] = e
+        self._n = self._ffill = self._ifill = len(pairs)
+
+    def _reserve(self):
+        limit = 2 * len(self._fwd)
+        if 3 * (self._ffill + 1) > limit or 3 * (self._ifill + 1) > limit:
+            self._rebuild()
+
+    @staticmethod
+    def _free_slot(slots, obj):
+        mask = len(slots) - 1
+        perturb = hash(obj) & _UINT64
+        i = perturb & mask
+        while slots[i] != _EMPTY:
+            perturb >>= 5
+            i = (i * 5 + perturb + 1) & mask
+        return i
+
+    @staticmethod
+    def _lookup(slots, col, obj):
+        """
+        Return (slot, entry) for `obj` in the hash table `slots` over column `col`,
+        where entry is -1 if `obj` is not found.
+        """
+        mask = len(slots) - 1
+        perturb = hash(obj) & _UINT64
+        i = perturb & mask
+        while True:
+            e = slots[i]
+            if e == _EMPTY:
+                return i, -1
+            if e >= 0 and col[e] == obj:
+                return i, e
+            perturb >>= 5
+            i = (i * 5 + perturb + 1) & mask
+
+    def _find_key(self, key):
+        try:
+            return self._lookup(self._fwd, self._ks, key)[1]
+        except TypeError:  # unhashable
+            return -1
+
+    def _find_val(self, val):
+        try:
+            return self._lookup(self._inv, self._vs, val)[1]
+        except TypeError:  # unhashable
+            return -1
+
+    def _remove(self, e):
+        self._fwd[self._lookup(self._fwd, self._ks, self._ks[e])[0]] = _DUMMY
+        self._inv[self._lookup(self._inv, self._vs, self._vs[e])[0]] = _DUMMY
+        self._live[e] = 0
+        self._n -= 1
+
+    def _iter_col(self, col):
+        live = self._live
+        for e in range(len(live)):
+            if live[e]:
+                yield col[e]
+
+    def _check(self, obj, is_int):
+        if is_int:
+            if type(obj) is int or (isinstance(obj, int) and not isinstance(obj, bool)):
+                return _INT64_MIN <= obj <= _INT64_MAX
+            return False
+        return type(obj) is str or isinstance(obj, str)
+
+    # -- MirrorDict API -----------------------------------------------------------------------------
+
+    def clear(self):
+        """
+        Remove all items from the instance.
+        """
+        self._reset(0)
+        return self
+
+    def copy(self):
+        """
+        Return a shallow copy of the instance.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new._ks = self._ks[:]
+        new._vs = self._vs[:]
+        new._live = self._live[:]
+        new._n = self._n
+        new._fwd = self._fwd[:]
+        new._inv = self._inv[:]
+        new._ffill = self._ffill
+        new._ifill = self._ifill
+        return new
+
+    def get(self, key, default=None):
+        """
+        Return the value for key if key is in the dictionary, else default.
+        """
+        e = self._find_key(key)
+        if e >= 0:
+            return self._vs[e]
+        e = self._find_val(key)
+        if e >= 0:
+            return self._ks[e]
+        return default
+
+    def items(self):
+        """
+        Iterate over key-value pairs from the initial mapping.
+        """
+        return _TypedItemsView(self)
+
+    def keys(self):
+        """
+        Return an iterator over the keys of the dictionary.
+        """
+        return _TypedKeysView(self)
+
+    def pop(self, key, default=KeyError):
+        """
+        Remove a key (or value) and its mirrored counterpart from the dictionary.
+
+        Returns the removed value if a key is provided, or the removed key if a value
+        is provided. If neither is found, `default` is returned if provided;
+        otherwise, a `KeyError` is raised.
+        """
+        e = self._find_key(key)
+        if e >= 0:
+            val = self._vs[e]
+            self._remove(e)
+            return val
+        e = self._find_val(key)
+        if e >= 0:
+            key = self._ks[e]
+            self._remove(e)
+            return key
+        if default is not KeyError:
+            return default
+        raise KeyError(f'{type(self).__name__}.pop(key, default) key="{key}" not found and default=KeyError.')
+
+    def popitem(self):
+        """
+        Remove and return the last inserted key-value pair.
+
+        Raises:
+            KeyError: If the dictionary is empty.
+        """
+        if self._n == 0:
+            raise KeyError(f"{type(self).__name__}.popitem() dictionary is empty.")
+        live = self._live
+        e = len(live) - 1
+        while not live[e]:
+            e -= 1
+        key, val = self._ks[e], self._vs[e]
+        self._remove(e)
+        return key, val
+
+    def __reversed__(self):
+        ks, live = self._ks, self._live
+        for e in range(len(live) - 1, -1, -1):
+            if live[e]:
+                yield ks[e]
+
+    def reversed(self):
+        """
+        Return a reversed iterator over the dictionary's keys.
+        """
+        return self.__reversed__()
+
+    def setdefault(self, key, default=None):
+        """
+        Insert a key-value pair into the dictionary if the key is not already present,
+        and return the value (or key) associated with `key`.
+        """
+        e = self._find_key(key)
+        if e >= 0:
+            return self._vs[e]
+        e = self._find_val(key)
+        if e >= 0:
+            return self._ks[e]
+        self._update(key, default)
+        return default
+
+    def update(self, *args, **kwargs):
+        """
+        Update the instance with key-value pairs from a mapping, iterable, or keyword arguments.
+
+        Returns:
+            The updated instance (update is done inplace, but returns self for chaining methods).
+
+        Raises:
+            TypeError: If an argument is not a mapping or an iterable of key-value pairs,
+                       or a key or value is not the supported type.
+        """
+        for arg in args:
+            if isinstance(arg, (Mapping, MirrorDict)):
+                for key, val in arg.items():
+                    self._update(key, val)
+            elif hasattr(arg, "__iter__") and not isinstance(arg, str):
+                try:
+                    for key, val in arg:
+                        self._update(key, val)
+                except ValueError as e:
+                    raise TypeError(
+                        f"{type(self).__name__}.update() expected a dict-like or an iterable of key-value pairs "
+                        f"but received: {arg}"
+                    ) from e
+            else:
+                raise TypeError(
+                    f"{type(self).__name__}.update() expected a dict-like or an iterable of key-value pairs "
+                    f"but received: {arg}"
+                )
+
+        for key, val in kwargs.items():
+            self._update(key, val)
+        return self
+
+    def values(self):
+        """
+        Return an iterator over the values of the dictionary.
+        """
+        return _TypedValuesView(self)
+
+    def _update(self, key, val):
+        """
+        Add or update a key-value pair and maintain the mirrored relationship,
+        following the same rules as `MirrorDict._update`.
+
+        Raises:
+            TypeError: If key or value is not the supported type.
+        """
+        if not self._check(key, self._key_is_int) or not self._check(val, self._val_is_int):
+            raise TypeError(
+                f"{type(self).__name__}: key must be {'int64' if self._key_is_int else 'str'} and value must be "
+                f"{'int64' if self._val_is_int else 'str'}, but received key='{key}' ({type(key)}) "
+                f"and value='{val}' ({type(val)})."
+            )
+        self._reserve()
+
+        ks, vs = self._ks, self._vs
+        fwd, inv = self._fwd, self._inv
+        cross = self._key_is_int == self._val_is_int  # a key can also be looked up as a value
+
+        e = self._lookup(fwd, ks, key)[1]
+        if e >= 0:  # key already defined, check if val is the same or needs to be updated
+            if vs[e] == val:
+                return
+            inv[self._lookup(inv, vs, vs[e])[0]] = _DUMMY
+        elif cross:  # key in values, so need to reverse storage direction
+            e_old = self._lookup(inv, vs, key)[1]
+            if e_old >= 0:
+                self._remove(e_old)
+
+        e_old = self._lookup(inv, vs, val)[1]
+        if e_old >= 0:  # val already defined, drop its old key
+            self._remove(e_old)
+
+        if cross:  # val in keys, so need to reverse storage direction
+            e_old = self._lookup(fwd, ks, val)[1]
+            if e_old >= 0 and e_old != e:
+                self._remove(e_old)
+
+        if e >= 0:
+            vs[e] = val
+        else:
+            e = len(ks)
+            ks.append(key)
+            vs.append(val)
+            self._live.append(1)
+            self._n += 1
+            fwd[self._free_slot(fwd, key)] = e
+            self._ffill += 1
+        inv[self._free_slot(inv, val)] = e
+        self._ifill += 1
+
+    def __str__(self):
+        return f"{type(self).__name__}({dict(self.items())})"
+
+    def __repr__(self):
+        return str(self)
+
+    __hash__ = None
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return self._iter_col(self._ks)
+
+    def __contains__(self, key):
+        return self._find_key(key) >= 0 or self._find_val(key) >= 0
+
+    def __setitem__(self, key, value):
+        self._update(key, value)
+
+    def __getitem__(self, key):
+        e = self._find_key(key)
+        if e >= 0:
+            return self._vs[e]
+        e = self._find_val(key)
+        if e >= 0:
+            return self._ks[e]
+        raise KeyError(f'{type(self).__name__}[key] does not have key="{key}".')
+
+    def __delitem__(self, key):
+        e = self._find_key(key)
+        if e < 0:
+            e = self._find_val(key)
+        if e < 0:
+            raise KeyError(f'del {type(self).__name__}[key] does not have key="{key}".')
+        self._remove(e)
+
+    def __ior__(self, other):  # dict concat with assignment, a |= b
+        return self.update(other)
+
+    def __or__(self, other):  # dict concat, a | b
+        return self.copy().update(other)
+
+    def __ror__(self, other):  # reverse dict concat, b | a
+        return self.__class__(other, self)
+
+    def __eq__(self, other):  # compare self == other.
+        if isinstance(other, _TypedMirrorDict):
+            return dict(self.items()) == dict(other.items())
+        if isinstance(other, MirrorDict):
+            return dict(self.items()) == other._key
+        return dict(self.items()) == other
+
+    def __ne__(self, other):  # compare self != other.
+        return not self == other
+
+    def __lt__(self, other):  # compare self < other.
+        raise TypeError(f"'<' not supported between instances of '{type(self).__name__}' and '{type(other)}'")
+
+    def __le__(self, other):  # compare self <= other.
+        raise TypeError(f"'<=' not supported between instances of '{type(self).__name__}' and '{type(other)}'")
+
+    def __gt__(self, other):  # compare self > other.
+        raise TypeError(f"'>' not supported between instances of '{type(self).__name__}' and '{type(other)}'")
+
+    def __ge__(self, other):  # compare self >= other.
+        raise TypeError(f"'>=' not supported between instances of '{type(self).__name__}' and '{type(other)}'")
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+class IntMirrorDict(_TypedMirrorDict):
+    """
+    A `MirrorDict` specialized for int keys and int values.
+
+    Both columns are packed `array("q")` storage, so keys and values must fit in a
+    signed 64-bit integer. Follows the same ordering and re-keying rules as `MirrorDict`,
+    including reversing the storage direction when an existing value is set as a key.
+
+    Example Usage:
+        >>> md = IntMirrorDict({1: 10, 2: 20})
+        >>> md[20]
+        2
+        >>> md[20] = 3     # 20 becomes a key
+        >>> list(md.items())
+        [(1, 10), (20, 3)]
+    """
+
+    _key_is_int = True
+    _val_is_int = True
+
+
+class StrIntMirrorDict(_TypedMirrorDict):
+    """
+    A `MirrorDict` specialized for str keys and int values.
+
+    The str keys are held in a list and the int values in a packed `array("q")`,
+    so values must fit in a signed 64-bit integer. Since keys and values have
+    different types, `md[k] = v` requires `k` to be a str and `v` an int.
+
+    Example Usage:
+        >>> md = StrIntMirrorDict(a=1, b=2)
+        >>> md['a'], md[2]
+        (1, 'b')
+    """
+
+    _key_is_int = False
+    _val_is_int = True
@@ -0,0 +1,303 @@
+"""
+WeakMirrorDict Module
+
+This module defines the `WeakMirrorDict` class, a mirror that holds weak references
+to its keys and values, so a pair is removed from both directions when either of
+its objects is garbage collected.
+
+Objects that support weak references (e.g. instances of most user classes) are held
+weakly, and objects that do not (e.g. int, str, tuple) are held normally, so the common
+case of mirroring live objects to ids releases the pair when the object dies.
+
+The pairs are stored in a `MirrorDict` of `weakref.ref` objects, which hash and compare
+like the objects they refer to while they are alive, so the mirror rules are the same
+as for `MirrorDict`. A collected object only appends its reference to a list of pending
+removals, and the pending removals are applied in one pass, O(1) each, by the next
+operation on the mirror. So mass collection (e.g. closing thousands of connections)
+costs O(1) per object instead of triggering any work proportional to the mirror size.
+
+Example Usage:
+    >>> from MirrorDict import WeakMirrorDict
+    >>> class Connection:
+    ...     pass
+    >>> conn = Connection()
+    >>> md = WeakMirrorDict({conn: 42})
+    >>> md[42] is conn
+    True
+    >>> del conn        # the last reference, the pair is removed
+    >>> len(md)
+    0
+"""
+
+from collections.abc import Hashable, ItemsView, KeysView, Mapping, MutableMapping, ValuesView
+from weakref import ref
+
+from . import MirrorDict, _raise_unhashable
+
+__all__ = ["WeakMirrorDict"]
+
+
+# %% -----------------------------------------------------------------------------------------------
+
+
+_MISSING = object()
+
+
+def _unwrap(x):
+    return x() if type(x) is ref else x
+
+
+def _lookup(x):
+    """
+    Return the object that finds `x` in the internal mirror, without a callback.
+    """
+    try:
+        return ref(x)
+    except TypeError:  # not weakly referenceable, stored directly
+        return x
+
+
+class _WeakKeysView(KeysView):
+    def __contains__(self, key):
+        md = self._mapping
+        if md._pending:
+            md._commit_removals()
+        return _lookup(key) in md._mirror._key
+
+    def __iter__(self):
+        for k, _ in self._mapping._iter_items():
+            yield k
+
+
+class _WeakValuesView(ValuesView):
+    def __contains__(self, value):
+        md = self._mapping
+        if md._pending:
+            md._commit_removals()
+        return _lookup(value) in md._mirror._val
+
+    def __iter__(self):
+        for _, v in self._mapping._iter_items():
+            yield v
+
+
+class _WeakItemsView(ItemsView):
+    def __contains__(self, item):
+        key, value = item
+        md = self._mapping
+        if md._pending:
+            md._commit_removals()
+        stored = md._mirror._key.get(_lookup(key), _MISSING)
+        return stored is not _MISSING and _unwrap(stored) == value
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class WeakMirrorDict(MutableMapping):
+    """
+    A mirror of weakly referenced keys and values, where the pair is removed from both
+    directions when either of its objects is garbage collected.
+
+    Has the same mirror rules and mapping API as `MirrorDict`. Objects that do not
+    support weak references are held by strong references.
+
+    Example Usage:
+        >>> md = WeakMirrorDict()
+        >>> md[conn] = "conn-1"
+        >>> md["conn-1"] is conn
+        True
+    """
+
+    _mirror: MirrorDict  # pairs of weakref.ref (or the objects that do not support them)
+    _pending: list  # references to collected objects, removed by _commit_removals()
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize a WeakMirrorDict instance, see `MirrorDict.__init__`.
+        """
+        self._mirror = MirrorDict()
+        self._pending = []
+
+        def remove(wr, selfref=ref(self)):
+            self = selfref()
+            if self is not None:
+                self._pending.append(wr)  # only record it, the callback can run at any point
+
+        self._remove = remove
+        self.update(*args, **kwargs)
+
+    def _commit_removals(self):
+        """
+        Remove every pair with an object that was collected since the last call.
+        """
+        pending = self._pending
+        key, val = self._mirror._key, self._mirror._val
+        removed = 0
+        while pending:
+            wr = pending.pop()
+            try:  # a dead reference only equals itself, so this finds the stored reference
+                if wr in key:
+                    val.pop(key.pop(wr), None)
+                elif wr in val:
+                    key.pop(val.pop(wr), None)
+                else:
+                    continue
+            except TypeError:  # a reference that was never hashed cannot be hashed once dead
+                continue
+            removed += 2
+        if removed:
+            self._mirror._removed(removed)
+
+    def _wrap(self, x):
+        try:
+            return ref(x, self._remove)
+        except TypeError:  # not weakly referenceable, stored directly
+            return x
+
+    def clear(self):
+        """
+        Remove all items.
+        """
+        self._mirror.clear()
+        self._pending.clear()
+        return self
+
+    def copy(self):
+        """
+        Return a shallow copy of the WeakMirrorDict instance.
+        """
+        return WeakMirrorDict(self.items())
+
+    def get(self, key, default=None):
+        if self._pending:
+            self._commit_removals()
+        result = self._mirror.get(_lookup(key), KeyError)
+        return default if result is KeyError else _unwrap(result)
+
+    def items(self):
+        """
+        Return a view of the live (key, value) pairs.
+        """
+        return _WeakItemsView(self)
+
+    def keys(self):
+        """
+        Return a view of the live keys.
+        """
+        return _WeakKeysView(self)
+
+    def pop(self, key, default=KeyError):
+        if self._pending:
+            self._commit_removals()
+        result = self._mirror.pop(_lookup(key), _MISSING)
+        if result is not _MISSING:
+            return _unwrap(result)
+        if default is not KeyError:
+            return default
+        raise KeyError(f'WeakMirrorDict.pop(key, default) key="{key}" not found and default=KeyError.')
+
+    def popitem(self):
+        if self._pending:
+            self._commit_removals()
+        if len(self._mirror) == 0:
+            raise KeyError("WeakMirrorDict.popitem() dictionary is empty.")
+        k, v = self._mirror.popitem()
+        return _unwrap(k), _unwrap(v)
+
+    def setdefault(self, key, default=None):
+        if self._pending:
+            self._commit_removals()
+        result = self._mirror.get(_lookup(key), KeyError)
+        if result is not KeyError:
+            return _unwrap(result)
+        self._update(key, default)
+        return default
+
+    def update(self, *args, **kwargs):
+        """
+        Update the WeakMirrorDict with key-value pairs from mappings, iterables, or keyword arguments.
+        """
+        for arg in args:
+            if isinstance(arg, (Mapping, MirrorDict)):
+                pairs = arg.items()
+            elif hasattr(arg, "__iter__") and not isinstance(arg, str):
+                pairs = arg
+            else:
+                raise TypeError(
+                    f"WeakMirrorDict.update() expected a dict-like or an iterable of key-value pairs but received: {arg}"
+                )
+            for key, val in pairs:
+                self._update(key, val)
+        for key, val in kwargs.items():
+            self._update(key, val)
+        return self
+
+    def values(self):
+        """
+        Return a view of the live values.
+        """
+        return _WeakValuesView(self)
+
+    def _iter_items(self):
+        if self._pending:
+            self._commit_removals()
+        for k, v in self._mirror._key.items():
+            k, v = _unwrap(k), _unwrap(v)
+            if k is not None and v is not None:  # skip objects collected during iteration
+                yield k, v
+
+    def _update(self, key, val):
+        if not isinstance(key, Hashable) or not isinstance(val, Hashable):
+            _raise_unhashable(key, val, "WeakMirrorDict")
+        if self._pending:
+            self._commit_removals()
+        self._mirror._update(self._wrap(key), self._wrap(val))
+
+    def __str__(self):
+        return f"WeakMirrorDict({dict(self.items())})"
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        if self._pending:
+            self._commit_removals()
+        return len(self._mirror)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        if self._pending:
+            self._commit_removals()
+        return _lookup(key) in self._mirror
+
+    def __setitem__(self, key, value):
+        self._update(key, value)
+
+    def __getitem__(self, key):
+        if self._pending:
+            self._commit_removals()
+        result = self._mirror.get(_lookup(key), KeyError)
+        if result is KeyError:
+            raise KeyError(f'WeakMirrorDict[key] does not have key="{key}".')
+        return _unwrap(result)
+
+    def __delitem__(self, key):
+        if self._pending:
+            self._commit_removals()
+        if self._mirror.pop(_lookup(key), _MISSING) is _MISSING:
+            raise KeyError(f'del WeakMirrorDict[key] does not have key="{key}".')
+
+    def __eq__(self, other):
+        if isinstance(other, WeakMirrorDict):
+            other = dict(other.items())
+        elif isinstance(other, MirrorDict):
+            other = other._key
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
@@ -0,0 +1,65 @@
+import pytest
+import MirrorDict as package
+from MirrorDict import MirrorDict, create_mirror, register_backend, get_backend, available_backends
+from MirrorDict.backends import _BACKENDS
+
+
+@pytest.fixture
+def registry():
+    saved = dict(_BACKENDS)
+    yield
+    _BACKENDS.clear()
+    _BACKENDS.update(saved)
+
+
+def test_builtin_backends():
+    assert {"dict", "lazy", "int", "strint", "shared", "indexed", "instrumented"} <= set(available_backends())
+    assert type(create_mirror("dict", a=1)) is MirrorDict
+    for name in ["dict", "lazy", "indexed", "instrumented"]:
+        md = create_mirror(name, {"a": 1, "b": 2})
+        assert md[2] == "b"
+        md["c"] = 1
+        assert dict(md.items()) == {"b": 2, "c": 1}
+    assert create_mirror("int", {1: 100})[100] == 1
+    assert create_mirror("strint", {"x": 7})[7] == "x"
+
+
+def test_backend_keyword_is_positional_only():
+    md = create_mirror("dict", backend="x")
+    assert md["backend"] == "x"
+
+
+def test_register_by_name_is_lazy(registry):
+    register_backend("ordered", "collections:OrderedDict")
+    assert _BACKENDS["ordered"] == "collections:OrderedDict"
+    from collections import OrderedDict
+
+    assert get_backend("ordered") is OrderedDict
+    assert _BACKENDS["ordered"] is OrderedDict
+
+
+def test_register_callable(registry):
+    register_backend("mine", lambda *args, **kwargs: MirrorDict(*args, **kwargs))
+    assert create_mirror("mine", a=1)[1] == "a"
+    with pytest.raises(ValueError):
+        register_backend("mine", MirrorDict)
+    register_backend("mine", MirrorDict, replace=True)
+    assert get_backend("mine") is MirrorDict
+
+
+def test_register_errors(registry):
+    with pytest.raises(ValueError):
+        register_backend("bad", "no_colon")
+    with pytest.raises(TypeError):
+        register_backend("bad", 5)
+    with pytest.raises(KeyError):
+        get_backend("missing")
+    register_backend("broken", "no_such_module_xyz:Mirror")
+    with pytest.raises(ImportError):
+        create_mirror("broken")
+
+
+def test_package_lazy_attributes():
+    assert set(package.__all__) <= set(dir(package))
+    with pytest.raises(AttributeError):
+        package.NotAClass
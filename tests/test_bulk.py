@@ -0,0 +1,97 @@
+import random
+import pytest
+from MirrorDict import MirrorDict, LazyMirrorDict, NormalizedMirrorDict, normalize_text
+
+
+def reference(md, items):
+    ref = MirrorDict()
+    ref._key = md._key.copy()
+    ref._val = md._val.copy()
+    removed = 0
+    for x in items:
+        if ref.pop(x, None) is not None:
+            removed += 1
+    return ref, removed
+
+
+def test_remove_many():
+    md = MirrorDict(a=1, b=2, c=3, d=4)
+    assert md.remove_many(["a", 2, "a", 1]) == 2  # an item and its partner remove one pair
+    assert md == {"c": 3, "d": 4}
+    with pytest.raises(KeyError):
+        md.remove_many(["c", "zz"])
+    assert md == {"c": 3, "d": 4}  # nothing removed
+    assert md.remove_many(x for x in [4]) == 1
+    assert md.remove_many([], return_pairs=True) == []
+    with pytest.raises(TypeError):
+        md.remove_many("c")
+    with pytest.raises(TypeError):
+        md.remove_many(5)
+
+
+def test_discard_many_pairs():
+    md = MirrorDict(a=1, b=2, c=3)
+    assert md.discard_many([2, "zz", "c"], return_pairs=True) == [("b", 2), ("c", 3)]
+    assert md == {"a": 1} and md[1] == "a"
+
+
+@pytest.mark.parametrize("n", [10, 1_000])  # the per-item path and the rebuild path
+def test_pairs_in_order_of_items(n):
+    md = MirrorDict((i, -i - 1) for i in range(n))
+    items = [5, 8, -2, 2, -6] + list(range(n - 1, 9, -1))
+    expected = [(5, -6), (8, -9), (1, -2), (2, -3)] + [(i, -i - 1) for i in range(n - 1, 9, -1)]
+    assert md.remove_many(items, return_pairs=True) == expected
+    assert len(md) == n - len(expected)
+
+
+@pytest.mark.parametrize("fraction", [0.01, 0.3, 0.6, 0.95, 1.0])
+def test_matches_pop(fraction):
+    rng = random.Random(int(fraction * 100))
+    md = MirrorDict((i, -i - 1) for i in range(1, 2001))
+    md[5] = -9999  # value order differs from key order
+    md[-7] = 77  # a reversed pair
+    items = [x if rng.random() < 0.5 else md[x] for x in rng.sample(list(md.keys()), int(fraction * len(md)))]
+    items += [10**6, -(10**6)]
+    ref, removed = reference(md, items)
+    views = md.keys(), md.values()
+    assert md.discard_many(items) == removed
+    assert md._key == ref._key and list(md._val) == list(ref._val)
+    assert list(views[0]) == list(ref.keys()) and list(views[1]) == list(ref.values())
+    if fraction > 0.5:
+        assert md.churn()["tombstones"] == 0
+
+
+def test_retain_and_filter():
+    md = MirrorDict((f"s{i}", i) for i in range(10))
+    md["s3"] = 30
+    selected = md.filter(lambda k, v: v >= 5)
+    assert selected == {"s3": 30, "s5": 5, "s6": 6, "s7": 7, "s8": 8, "s9": 9}
+    assert list(selected._val) == [5, 6, 7, 8, 9, 30] and len(md) == 10
+    assert md.retain(lambda k, v: v % 2 == 0, return_pairs=True) == [("s1", 1), ("s5", 5), ("s7", 7), ("s9", 9)]
+    assert md.retain(lambda k, v: v < 5) == 3
+    assert md == {"s0": 0, "s2": 2, "s4": 4} and md[4] == "s4"
+
+    def boom(k, v):
+        if v == 4:
+            raise RuntimeError
+        return False
+
+    with pytest.raises(RuntimeError):
+        md.retain(boom)
+    assert len(md) == 3
+
+
+def test_subclasses():
+    md = MirrorDict(a=1, b=2, c=3)
+    md.add_sorted_index(side="value")
+    assert md.remove_many(["a", 3], return_pairs=True) == [("a", 1), ("c", 3)]
+    assert list(md.irange(side="value")) == [2]
+    assert md.retain(lambda k, v: False) == 1 and list(md.irange(side="value")) == []
+
+    lazy = LazyMirrorDict(a=1, b=2, c=3)
+    assert lazy.discard_many([2, "z"]) == 1 and lazy == {"a": 1, "c": 3}
+
+    norm = NormalizedMirrorDict({"Web-01": 1, "Web-02": 2}, normalize_key=normalize_text)
+    assert norm.remove_many(["web-01", 2], return_pairs=True) == [("Web-01", 1), ("Web-02", 2)]
+    assert len(norm) == 0
+    assert type(norm.filter(lambda k, v: True)) is MirrorDict
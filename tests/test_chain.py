@@ -0,0 +1,108 @@
+import random
+import pytest
+from MirrorDict import MirrorDict, ChainMirror, LazyMirrorDict, NormalizedMirrorDict
+
+
+@pytest.fixture
+def base():
+    return MirrorDict({"en": 1, "fr": 2, "de": 3})
+
+
+def test_override_hides_both_sides(base):
+    chain = base.overlay({"es": 2})
+    assert chain[2] == "es" and chain["es"] == 2
+    assert "fr" not in chain
+    assert chain.get("fr") is None
+    assert base[2] == "fr" and base["fr"] == 2
+    assert len(chain) == 3
+    assert list(chain.items()) == [("en", 1), ("de", 3), ("es", 2)]
+    assert chain.to_mirror() == MirrorDict(en=1, de=3, es=2)
+
+
+def test_views(base):
+    chain = base.overlay({"es": 2})
+    keys, values, items = chain.keys(), chain.values(), chain.items()
+    assert len(keys) == len(values) == len(items) == 3
+    assert "es" in keys and "fr" not in keys and 2 not in keys
+    assert 2 in values and "es" not in values
+    assert ("es", 2) in items and ("fr", 2) not in items
+    assert list(keys) == ["en", "de", "es"] and list(keys) == ["en", "de", "es"]  # not exhausted
+    chain["it"] = 4
+    assert list(values) == [1, 3, 2, 4]
+
+
+def test_override_reuses_base_key_and_value(base):
+    chain = ChainMirror(base)
+    chain["en"] = 3  # hides en:1 and de:3
+    assert chain["en"] == 3 and chain[3] == "en"
+    assert 1 not in chain and "de" not in chain
+    chain[2] = "x"  # reverses fr:2
+    assert chain["x"] == 2 and "fr" not in chain
+    assert dict(chain.items()) == {"en": 3, 2: "x"}
+
+
+def test_delete(base):
+    chain = base.overlay(it=4)
+    del chain[1]
+    assert "en" not in chain
+    assert chain.pop("it") == 4
+    assert chain.pop("zz", None) is None
+    with pytest.raises(KeyError):
+        del chain["en"]
+    with pytest.raises(KeyError):
+        chain.pop("en")
+    assert chain == {"fr": 2, "de": 3}
+    assert chain.popitem() == ("de", 3)
+    chain.clear()
+    assert len(chain) == 0 and list(chain) == []
+    assert base == {"en": 1, "fr": 2, "de": 3}
+
+
+def test_new_child_and_copy(base):
+    parent = base.overlay(es=2)
+    child = parent.new_child(pt=2)
+    assert child[2] == "pt" and "es" not in child and parent[2] == "es"
+    assert dict(child.items()) == {"en": 1, "de": 3, "pt": 2}
+    twin = child.copy()
+    twin["it"] = 5
+    assert "it" not in child
+
+
+def test_errors(base):
+    chain = base.overlay()
+    with pytest.raises(TypeError):
+        chain["a"] = [1]
+    assert len(chain) == 3
+    with pytest.raises(TypeError):
+        ChainMirror({"a": 1})
+    with pytest.raises(TypeError):
+        ChainMirror(NormalizedMirrorDict(a=1))
+
+
+def test_lazy_base():
+    chain = LazyMirrorDict(a=1, b=2).overlay(c=1)
+    assert chain[1] == "c" and "a" not in chain
+
+
+def test_matches_update():
+    rng = random.Random(13)
+    for _ in range(200):
+        base = MirrorDict()
+        for _ in range(30):
+            k, v = rng.randrange(40), rng.randrange(40, 80)
+            base[k] = v
+        chain = ChainMirror(base)
+        ref = base.copy()
+        for _ in range(20):
+            k, v = rng.randrange(80), rng.randrange(80)
+            if k == v:
+                continue
+            if rng.random() < 0.7:
+                chain[k] = v
+                ref[k] = v
+            else:
+                assert chain.pop(k, None) == ref.pop(k, None)
+        assert dict(chain.items()) == ref._key
+        assert len(chain) == len(ref)
+        for x in range(80):
+            assert chain.get(x) == ref.get(x)
@@ -0,0 +1,82 @@
+import sys
+
+import pytest
+from MirrorDict import MirrorDict, LazyMirrorDict
+
+
+def _size(md):
+    return sys.getsizeof(md._key) + sys.getsizeof(md._val)
+
+
+def test_churn_counts_removed_entries():
+    md = MirrorDict(a=1, b=2, c=3)
+    assert md.churn() == {"tombstones": 0, "live": 6, "ratio": 0.0}
+    del md["a"]
+    md.pop(2)
+    md["c"] = 4  # replaces the value, deletes 3 from _val
+    assert md.churn()["tombstones"] == 5
+    assert md.churn()["ratio"] == 5 / 7
+    md.clear()
+    assert md.churn()["tombstones"] == 0
+
+
+def test_compact_preserves_order_and_views():
+    md = MirrorDict((i, f"v{i}") for i in range(20_000))
+    keys = md.keys()
+    for i in range(0, 20_000, 2):
+        del md[i]
+    md["x"] = "v1"  # moves v1 to the end of the values
+    expected_items = list(md.items())
+    expected_val = list(md._val.items())
+    before = _size(md)
+
+    assert md.compact() is md
+    assert _size(md) < before
+    assert list(md.items()) == expected_items
+    assert list(md._val.items()) == expected_val
+    assert list(keys) == [k for k, _ in expected_items]  # existing views still track the mirror
+    assert md.churn()["tombstones"] == 0
+    assert md["v3"] == 3
+
+
+def test_auto_compact():
+    md = MirrorDict((i, -i - 1) for i in range(10_000))
+    md.auto_compact(ratio=0.5, min_tombstones=100)
+    peak = _size(md)
+    for i in range(9_900):
+        del md[i]
+        assert md.churn()["ratio"] <= 0.5 + 1e-9
+    assert _size(md) < peak / 10
+    assert list(md.items()) == [(i, -i - 1) for i in range(9_900, 10_000)]
+
+    md.auto_compact(None)
+    tombstones = md.churn()["tombstones"]
+    for i in range(9_900, 10_000):
+        md.pop(i)
+    assert md.churn()["tombstones"] == tombstones + 200
+
+
+def test_auto_compact_rechecks_after_growth():
+    md = MirrorDict((i, -i - 1) for i in range(1_000))
+    md.auto_compact(ratio=0.5, min_tombstones=1)
+    for i in range(400):
+        del md[i]
+    md.update((i, -i - 1) for i in range(1_000, 3_000))  # threshold no longer reached by ratio
+    del md[500]
+    assert md.churn()["tombstones"] == 802
+
+
+def test_auto_compact_invalid_ratio():
+    with pytest.raises(ValueError):
+        MirrorDict().auto_compact(ratio=1.5)
+
+
+def test_lazy_compact():
+    md = LazyMirrorDict((i, -i - 1) for i in range(1_000))
+    for i in range(500):
+        del md[i]
+    assert md._val is None
+    assert md.churn()["tombstones"] == 500
+    md.compact()
+    assert md._val is None and md[-600] == 599
+    assert list(md) == list(range(500, 1_000))
@@ -0,0 +1,105 @@
+import random
+import pytest
+from MirrorDict import MirrorDict, ComposedMirror, LazyMirrorDict, NormalizedMirrorDict
+
+
+@pytest.fixture
+def mirrors():
+    ext = MirrorDict({"ext-1": 10, "ext-2": 20, "ext-3": 30})
+    shard = MirrorDict({10: "shard-a", 20: "shard-b", 40: "shard-d"})
+    return ext, shard
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_lookup_both_directions(mirrors, cache):
+    ext, shard = mirrors
+    view = ext.compose(shard, cache=cache)
+    assert view["ext-1"] == "shard-a" and view["shard-b"] == "ext-2"
+    assert "ext-3" not in view and "shard-d" not in view and 10 not in view
+    assert view.get("ext-3", "none") == "none"
+    with pytest.raises(KeyError):
+        view["shard-d"]
+    assert len(view) == 2
+    assert list(view) == ["ext-1", "ext-2"]
+    assert dict(view.items()) == {"ext-1": "shard-a", "ext-2": "shard-b"}
+    assert view == {"ext-1": "shard-a", "ext-2": "shard-b"}
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_reflects_changes(mirrors, cache):
+    ext, shard = mirrors
+    view = ext.compose(shard, cache=cache)
+    assert view["ext-1"] == "shard-a" and "ext-3" not in view
+    shard[30] = "shard-c"
+    assert view["ext-3"] == "shard-c" and view["shard-c"] == "ext-3"
+    ext["ext-1"] = 40  # same length, replaces a value
+    assert view["ext-1"] == "shard-d" and "shard-a" not in view
+    shard.compact()
+    del ext["ext-2"]
+    ext["ext-9"] = 20  # same length and churn as before the compaction
+    assert view["shard-b"] == "ext-9"
+    ext.clear()
+    assert "ext-9" not in view and len(view) == 0
+    if cache:
+        assert view.cache_info()["hits"] == 0
+
+
+def test_views(mirrors):
+    ext, shard = mirrors
+    view = ext.compose(shard)
+    keys, values, items = view.keys(), view.values(), view.items()
+    assert len(keys) == len(values) == len(items) == 2
+    assert "ext-1" in keys and "ext-3" not in keys and "shard-a" not in keys
+    assert "shard-a" in values and "shard-d" not in values and "ext-1" not in values
+    assert ("ext-1", "shard-a") in items and ("ext-1", "shard-b") not in items
+    assert list(keys) == ["ext-1", "ext-2"] and list(keys) == ["ext-1", "ext-2"]  # not exhausted
+    shard[30] = "shard-c"
+    assert list(values) == ["shard-a", "shard-b", "shard-c"]
+
+
+def test_cache_hits(mirrors):
+    ext, shard = mirrors
+    view = ext.compose(shard, cache=True)
+    for _ in range(3):
+        assert view["ext-1"] == "shard-a"
+        assert "nope" not in view
+    assert view.cache_info() == {"hits": 4, "misses": 2, "size": 2}
+
+
+def test_inverse_and_lazy(mirrors):
+    ext, shard = mirrors
+    view = ComposedMirror(ext, shard.inverse.copy().inverse)
+    assert view["ext-2"] == "shard-b"
+    view = ComposedMirror(MirrorDict({10: "shard-a"}).inverse, ext.inverse)
+    assert view["shard-a"] == "ext-1" and view["ext-1"] == "shard-a"
+    lazy = LazyMirrorDict({10: "x", 20: "y"})
+    assert ext.compose(lazy, cache=True)["y"] == "ext-2"
+    with pytest.raises(TypeError):
+        ext.compose({10: "a"})
+    with pytest.raises(TypeError):
+        ext.compose(NormalizedMirrorDict({10: "a"}))
+
+
+def test_materialize(mirrors):
+    ext, shard = mirrors
+    md = ext.compose(shard).materialize()
+    assert type(md) is MirrorDict
+    assert md == MirrorDict({"ext-1": "shard-a", "ext-2": "shard-b"})
+    assert md["shard-b"] == "ext-2"
+    with pytest.raises(ValueError):
+        MirrorDict(a=1, b=2).compose(MirrorDict({1: "b", 2: "c"})).materialize()
+
+
+def test_matches_chained_lookups():
+    rng = random.Random(5)
+    first = MirrorDict((f"a{i}", rng.randrange(1000)) for i in range(300))
+    second = MirrorDict((b, f"c{b}") for b in rng.sample(range(1000), 400))
+    view = first.compose(second, cache=True)
+    for _ in range(3):
+        expected = {a: second[b] for a, b in first.items() if b in second}
+        assert view.materialize() == expected
+        for a, c in expected.items():
+            assert view[a] == c and view[c] == a
+        for _ in range(50):
+            second[rng.randrange(1000)] = f"c{rng.randrange(5000)}"
+            first.pop(f"a{rng.randrange(300)}", None)
@@ -0,0 +1,85 @@
+import pytest
+from MirrorDict import MirrorDict, EncoderMirrorDict
+
+
+def test_encode_assigns_dense_ids():
+    enc = EncoderMirrorDict()
+    assert enc.encode(["red", "green", "red", "blue"]) == [0, 1, 0, 2]
+    assert len(enc) == 3
+    assert list(enc.keys()) == ["red", "green", "blue"]
+    assert list(enc.values()) == [0, 1, 2]
+
+
+def test_decode():
+    enc = EncoderMirrorDict(["a", "b", "c"])
+    assert enc.decode([2, 0, 1, 0]) == ["c", "a", "b", "a"]
+    with pytest.raises(IndexError):
+        enc.decode([3])
+    with pytest.raises(IndexError):
+        enc.decode([0, -1])
+    assert enc.decode(iter([1])) == ["b"] and enc.decode([]) == []
+
+
+def test_mirror_lookup():
+    enc = EncoderMirrorDict(["a", "b"])
+    assert enc["a"] == 0
+    assert enc[1] == "b"
+    assert "b" in enc
+    assert 1 in enc
+    assert 2 not in enc
+    assert enc.get("z", "default") == "default"
+    with pytest.raises(KeyError):
+        enc["z"]
+
+
+def test_encode_without_add():
+    enc = EncoderMirrorDict(["a", "b"])
+    assert enc.encode(["b", "a"], add=False) == [1, 0]
+    with pytest.raises(KeyError):
+        enc.encode(["a", "z"], add=False)
+    assert len(enc) == 2
+
+
+def test_add_and_setdefault():
+    enc = EncoderMirrorDict()
+    assert enc.add("x") == 0
+    assert enc.setdefault("y", len(enc)) == 1
+    assert enc.setdefault("x", len(enc)) == 0
+    assert enc.setdefault("z") == 2
+    with pytest.raises(ValueError):
+        enc.setdefault("w", 10)
+
+
+def test_matches_mirrordict_setdefault_pattern():
+    labels = ["b", "a", "b", "c", "a"]
+    md = MirrorDict()
+    for label in labels:
+        md.setdefault(label, len(md))
+    enc = EncoderMirrorDict(labels)
+    assert enc == md
+    assert list(enc.items()) == list(md.items())
+
+
+def test_views_contains():
+    enc = EncoderMirrorDict(["a", "b"])
+    assert "a" in enc.keys()
+    assert 0 not in enc.keys()
+    assert 1 in enc.values()
+    assert ("b", 1) in enc.items()
+    assert ("b", 0) not in enc.items()
+
+
+def test_copy_clear_and_str():
+    enc = EncoderMirrorDict(["a"])
+    enc_copy = enc.copy()
+    enc.add("b")
+    assert "b" not in enc_copy
+    assert str(enc) == "EncoderMirrorDict({'a': 0, 'b': 1})"
+    enc.clear()
+    assert len(enc) == 0
+    assert enc.add("c") == 0
+
+
+def test_unhashable_raises():
+    with pytest.raises(TypeError):
+        EncoderMirrorDict([["a"]])
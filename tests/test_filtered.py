@@ -0,0 +1,95 @@
+import random
+import pytest
+from MirrorDict import MirrorDict, FilteredMirrorDict
+
+
+def test_lookups():
+    md = FilteredMirrorDict({("a", 1): "x", ("b", 2): "y"})
+    assert md[("a", 1)] == "x"
+    assert md["y"] == ("b", 2)
+    assert md.get(("c", 3)) is None
+    assert md.get(("c", 3), "missing") == "missing"
+    assert ("a", 1) in md
+    assert "x" in md
+    assert ("c", 3) not in md
+    with pytest.raises(KeyError):
+        md[("c", 3)]
+    with pytest.raises(TypeError):
+        md[["a"]] = 1
+
+
+def test_setdefault():
+    md = FilteredMirrorDict(a=1)
+    assert md.setdefault("a", 5) == 1
+    assert md.setdefault("b", 2) == 2
+    assert md[2] == "b"
+
+
+def test_stale_hashes_until_compact():
+    md = FilteredMirrorDict((i, -i) for i in range(2, 102))  # hash(-1) == hash(-2)
+    assert md.filter_info() == {"hashes": 200, "stale": 0}
+    for i in range(2, 52):
+        del md[i]
+    assert 2 not in md and -2 not in md
+    assert md.get(2) is None
+    assert md.filter_info() == {"hashes": 200, "stale": 100}
+    md.compact()
+    assert md.filter_info() == {"hashes": 100, "stale": 0}
+    assert md[52] == -52 and md[-101] == 101
+
+
+def test_auto_compact_rebuilds_filter():
+    md = FilteredMirrorDict((i, -i) for i in range(1, 101))
+    md.auto_compact(ratio=0.5, min_tombstones=10)
+    for i in range(1, 91):
+        del md[i]
+    assert md.filter_info()["stale"] < 2 * 90
+    assert list(md.items()) == [(i, -i) for i in range(91, 101)]
+
+
+def test_clear():
+    md = FilteredMirrorDict(a=1)
+    md.clear()
+    assert md.filter_info() == {"hashes": 0, "stale": 0}
+    assert "a" not in md
+
+
+def test_enable_disable_filter():
+    md = MirrorDict(a=1, b=2)
+    md.enable_filter()
+    assert type(md) is FilteredMirrorDict
+    assert md.filter_info() == {"hashes": 4, "stale": 0}
+    assert md[2] == "b" and "z" not in md
+    md.enable_filter()  # already filtered
+    md.disable_filter()
+    assert type(md) is MirrorDict
+    assert not hasattr(md, "_hashes")
+    assert md == {"a": 1, "b": 2}
+
+
+def test_enable_filter_other_subclass():
+    from MirrorDict import LazyMirrorDict
+
+    with pytest.raises(TypeError):
+        LazyMirrorDict(a=1).enable_filter()
+
+
+def test_matches_mirrordict():
+    rng = random.Random(3)
+    md = MirrorDict()
+    fmd = FilteredMirrorDict()
+    for _ in range(2000):
+        key, val = rng.randrange(50), rng.randrange(50, 100)
+        op = rng.random()
+        if op < 0.6:
+            md[key] = val
+            fmd[key] = val
+        elif op < 0.9:
+            assert md.pop(key, None) == fmd.pop(key, None)
+        else:
+            md.compact()
+            fmd.compact()
+        probe = rng.randrange(100)
+        assert (probe in md) == (probe in fmd)
+        assert md.get(probe) == fmd.get(probe)
+    assert list(md.items()) == list(fmd.items())
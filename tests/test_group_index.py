@@ -0,0 +1,82 @@
+import random
+import pytest
+from MirrorDict import MirrorDict, IndexedMirrorDict
+
+
+def _tenant(value):
+    return value.split("/")[0]
+
+
+@pytest.fixture
+def users():
+    md = MirrorDict({"u1": "acme/alice", "u2": "initech/bob", "u3": "acme/carol"})
+    md.add_index("tenant", _tenant, side="value")
+    return md
+
+
+def test_query(users):
+    assert isinstance(users, IndexedMirrorDict)
+    assert users.query("tenant", "acme") == [("u1", "acme/alice"), ("u3", "acme/carol")]
+    assert users.query("tenant", "initech") == [("u2", "initech/bob")]
+    assert users.query("tenant", "globex") == []
+
+
+def test_query_follows_mutations(users):
+    users["u4"] = "globex/dan"
+    users["u1"] = "initech/alice"  # moves u1 to another tenant
+    users.pop("u3")
+    assert users.query("tenant", "acme") == []
+    assert users.query("tenant", "initech") == [("u2", "initech/bob"), ("u1", "initech/alice")]
+    users["u5"] = "globex/dan"  # evicts u4
+    assert users.query("tenant", "globex") == [("u5", "globex/dan")]
+    del users["initech/bob"]
+    users.popitem()
+    assert users.query("tenant", "initech") == [("u1", "initech/alice")]
+    users.clear()
+    assert users.query("tenant", "initech") == []
+
+
+def test_key_side():
+    md = MirrorDict((i, str(i)) for i in range(10))
+    md.add_index("parity", lambda k: k % 2)
+    assert [k for k, _ in md.query("parity", 1)] == [1, 3, 5, 7, 9]
+    md[30] = 3  # evicts 3:"3", 30 is even
+    with pytest.raises(TypeError):
+        md["x"] = 11  # "x" % 2 fails, the mirror is unchanged
+    assert "x" not in md
+    assert [k for k, _ in md.query("parity", 1)] == [1, 5, 7, 9]
+
+
+def test_unhashable_group():
+    md = MirrorDict(a=1)
+    with pytest.raises(TypeError):
+        md.add_index("bad", lambda k: [k])
+
+
+def test_names(users):
+    with pytest.raises(ValueError):
+        users.add_index("tenant", _tenant, side="value")
+    with pytest.raises(ValueError):
+        users.query("missing", "acme")
+    with pytest.raises(ValueError):
+        users.add_index("x", _tenant, side="both")
+    users.drop_index("tenant")
+    with pytest.raises(ValueError):
+        users.query("tenant", "acme")
+    users["u9"] = "acme/zed"
+    users.add_index("tenant", _tenant, side="value")
+    assert len(users.query("tenant", "acme")) == 3
+
+
+def test_matches_scan():
+    rng = random.Random(11)
+    md = MirrorDict()
+    md.add_index("mod", lambda v: v % 5, side="value")
+    for _ in range(2000):
+        key, val = rng.randrange(100), rng.randrange(100, 200)
+        if rng.random() < 0.7:
+            md[key] = val
+        else:
+            md.pop(key, None)
+    for group in range(5):
+        assert sorted(md.query("mod", group)) == sorted((k, v) for k, v in md.items() if v % 5 == group)
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+# Budget for the cumulative time of `import MirrorDict`, in microseconds, as reported
+# by `python -X importtime`. Loading only the core module takes a few milliseconds,
+# eagerly importing the optional variants (multiprocessing, socket, inspect, ...)
+# took about 10x longer, so this is generous enough to be stable on slow CI machines.
+IMPORT_BUDGET_US = 40_000
+
+# Modules that must not be loaded by `import MirrorDict`, they are only needed by optional variants.
+HEAVY_MODULES = ["inspect", "multiprocessing", "socket", "socketserver", "pickle", "hashlib", "array", "bisect"]
+
+
+def _run(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout, result.stderr
+
+
+def _import_time_us():
+    _, err = _run("import MirrorDict")
+    for line in err.splitlines():
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace(":", "|", 1).split("|")]
+        if name == "MirrorDict":
+            return int(cumulative_us)
+    raise AssertionError(f"MirrorDict not found in -X importtime output:\n{err}")
+
+
+def test_import_does_not_load_optional_modules():
+    out, _ = _run(f"import sys, MirrorDict; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    assert out.strip() == "[]"
+
+
+def test_import_time_budget():
+    best = min(_import_time_us() for _ in range(3))
+    print(f"import MirrorDict: {best} us (budget {IMPORT_BUDGET_US} us)")
+    assert best < IMPORT_BUDGET_US
+
+
+def test_variants_load_on_first_access():
+    out, _ = _run("import sys, MirrorDict; assert 'MirrorDict.typed' not in sys.modules; print(MirrorDict.IntMirrorDict({1: 2})[2])")
+    assert out.strip() == "1"
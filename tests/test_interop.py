@@ -0,0 +1,80 @@
+import sys
+
+import pytest
+from MirrorDict import MirrorDict, LazyMirrorDict, FilteredMirrorDict, NormalizedMirrorDict, normalize_text
+from MirrorDict.interop import _from_columns
+
+
+def test_from_columns_bulk():
+    md = _from_columns(MirrorDict, ["a", "b", "c"], [1, 2, 3])
+    assert md == {"a": 1, "b": 2, "c": 3} and md[3] == "c"
+    md = _from_columns(LazyMirrorDict, ["a", "b"], [1, 2])
+    assert md._val is None and md[2] == "b"
+
+
+def test_from_columns_subclasses():
+    # from_arrow() and from_categorical() build through _from_columns, so no pandas or pyarrow is needed
+    md = _from_columns(FilteredMirrorDict, ["a", "b"], [0, 1])
+    assert type(md) is FilteredMirrorDict
+    assert "a" in md and md.get(1) == "b" and md.filter_info()["hashes"] == 4
+    md = _from_columns(NormalizedMirrorDict, ["Web-01", "Web-02"], [0, 1])
+    assert list(md.items()) == [("Web-01", 0), ("Web-02", 1)] and md[1] == "Web-02"
+
+
+def test_from_columns_conflicts_use_mirror_rules():
+    keys, values = ["a", "b", 1, "c"], [1, 2, "x", 2]
+    md = _from_columns(MirrorDict, keys, values)
+    assert list(md.items()) == list(MirrorDict(zip(keys, values)).items())
+    with pytest.raises(ValueError):
+        _from_columns(MirrorDict, ["a"], [1, 2])
+
+
+def test_missing_dependency_message(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match=r"pip install MirrorDict\[pandas\]"):
+        MirrorDict(a=1).map_series(["a"])
+    with pytest.raises(ImportError, match=r"pip install MirrorDict\[arrow\]"):
+        MirrorDict(a=1).to_arrow()
+
+
+def test_arrow_round_trip():
+    pa = pytest.importorskip("pyarrow")
+    md = MirrorDict(a=1, b=2, c=3)
+    table = md.to_arrow()
+    assert table.column_names == ["key", "value"]
+    assert table.column("value").to_pylist() == [1, 2, 3]
+    assert MirrorDict.from_arrow(table) == md
+    renamed = md.to_arrow(key="name", value="id")
+    assert MirrorDict.from_arrow(renamed, key="name", value="id")[2] == "b"
+
+    encoded = pa.array(["low", "high", "low"]).dictionary_encode()
+    assert MirrorDict.from_arrow(encoded) == {"low": 0, "high": 1}
+    with pytest.raises(TypeError):
+        MirrorDict.from_arrow(pa.array([1, 2]))
+
+
+def test_categorical_round_trip():
+    pd = pytest.importorskip("pandas")
+    cat = pd.Categorical(["b", "a", "b"])
+    md = MirrorDict.from_categorical(cat)
+    assert md == {"a": 0, "b": 1}
+    assert MirrorDict.from_categorical(pd.Series(cat)) == md
+    assert md.to_categorical(cat.codes).tolist() == ["b", "a", "b"]
+    assert list(md.to_categorical().categories) == ["a", "b"]
+    with pytest.raises(ValueError):
+        MirrorDict(a=0, b=5).to_categorical([0])
+    with pytest.raises(TypeError):
+        MirrorDict.from_categorical(pd.Series([1, 2]))
+
+
+def test_map_series():
+    pd = pytest.importorskip("pandas")
+    md = MirrorDict(a=1, b=2)
+    series = pd.Series(["a", 2, "z"])
+    assert md.map_series(series).tolist()[:2] == [1, "b"]
+    assert pd.isna(md.map_series(series).iloc[2])
+    assert md.map_series(["a", "b"], side="key").tolist() == [1, 2]
+    assert md.map_series([1, 2], side="value").tolist() == ["a", "b"]
+    with pytest.raises(ValueError):
+        md.map_series(series, side="x")
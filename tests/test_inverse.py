@@ -0,0 +1,61 @@
+import pytest
+from MirrorDict import MirrorDict, LazyMirrorDict
+
+
+def test_inverse_iteration():
+    md = MirrorDict({"a": 1, "b": 2})
+    inv = md.inverse
+    assert list(inv) == [1, 2]
+    assert list(inv.keys()) == [1, 2]
+    assert list(inv.values()) == ["a", "b"]
+    assert list(inv.items()) == [(1, "a"), (2, "b")]
+    assert len(inv) == 2
+
+
+def test_inverse_is_live():
+    md = MirrorDict({"a": 1})
+    inv = md.inverse
+    md["b"] = 2
+    assert inv[2] == "b"
+    assert dict(inv) == {1: "a", 2: "b"}
+    md.pop("a")
+    assert list(inv.items()) == [(2, "b")]
+
+
+def test_inverse_lookup_follows_mirror():
+    md = MirrorDict({"a": 1})
+    inv = md.inverse
+    assert inv[1] == "a"
+    assert inv["a"] == 1
+    assert 1 in inv
+    assert "a" in inv
+    assert inv.get("z", "default") == "default"
+    with pytest.raises(KeyError):
+        inv["z"]
+
+
+def test_inverse_writes():
+    md = MirrorDict({"a": 1, "b": 2})
+    inv = md.inverse
+    inv[3] = "c"
+    assert md["c"] == 3
+    inv[1] = "z"  # same as md["z"] = 1, drops a=1
+    assert md == {"b": 2, "c": 3, "z": 1}
+    del inv[2]
+    assert "b" not in md
+    assert inv.popitem() == (3, "c")
+    assert md == {"z": 1}
+
+
+def test_inverse_of_inverse_and_copy():
+    md = MirrorDict({"a": 1})
+    assert md.inverse.inverse is md
+    inv_copy = md.inverse.copy()
+    assert isinstance(inv_copy, MirrorDict)
+    assert list(inv_copy.items()) == [(1, "a")]
+    assert md.inverse == {1: "a"}
+
+
+def test_lazy_inverse():
+    md = LazyMirrorDict(a=1, b=1)
+    assert md.inverse == {1: "b"}
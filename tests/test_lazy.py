@@ -0,0 +1,78 @@
+import pytest
+from MirrorDict import MirrorDict, LazyMirrorDict
+
+
+def test_forward_lookup_does_not_build_inverse():
+    md = LazyMirrorDict((f"id{i}", i) for i in range(100))
+    assert md["id3"] == 3
+    assert md.get("id7") == 7
+    assert "id9" in md
+    assert len(md) == 100
+    assert md._val is None
+
+
+def test_reverse_lookup_builds_inverse():
+    md = LazyMirrorDict(a=1, b=2)
+    assert md[2] == "b"
+    assert md._val == {1: "a", 2: "b"}
+    md["c"] = 3
+    assert md[3] == "c"
+
+
+def test_contains_miss_builds_inverse():
+    md = LazyMirrorDict(a=1, b=2)
+    assert "z" not in md
+    assert md._val is not None
+
+
+def test_pending_conflicts_match_mirrordict():
+    pairs = [("a", 1), ("b", 2), ("c", 1), (2, "d"), ("e", "f"), ("f", 5)]
+    md = MirrorDict(pairs)
+    lazy = LazyMirrorDict(pairs)
+    assert list(lazy.keys()) == list(md.keys())
+    assert list(lazy.values()) == list(md.values())
+    assert lazy == md
+    assert lazy[1] == "c"
+    assert "a" not in lazy
+
+
+def test_forward_lookup_of_evicted_key():
+    lazy = LazyMirrorDict()
+    lazy["a"] = 1
+    lazy["b"] = 1  # evicts a=1
+    assert lazy.get("a") is None
+    assert lazy["b"] == 1
+
+
+def test_uniqueness_sensitive_mutation():
+    lazy = LazyMirrorDict(a=1, b=2)
+    lazy["a"] = 3  # changes value of an existing key
+    assert lazy._val == {3: "a", 2: "b"}
+    assert 1 not in lazy
+
+
+def test_pop_and_del():
+    lazy = LazyMirrorDict(a=1, b=2, c=3)
+    assert lazy.pop("a") == 1
+    assert lazy._val is None
+    del lazy[2]
+    assert lazy.pop(9, "default") == "default"
+    with pytest.raises(KeyError):
+        lazy.pop(9)
+    assert lazy == {"c": 3}
+    assert lazy.popitem() == ("c", 3)
+
+
+def test_clear_resets_lazy():
+    lazy = LazyMirrorDict(a=1)
+    assert lazy[1] == "a"
+    lazy.clear()
+    assert lazy._val is None
+    lazy["b"] = 2
+    assert lazy == MirrorDict(b=2)
+
+
+def test_non_hashable_raises():
+    lazy = LazyMirrorDict()
+    with pytest.raises(TypeError):
+        lazy["a"] = [1]
@@ -0,0 +1,106 @@
+import multiprocessing
+import pytest
+from MirrorDict import MirrorDict, MirrorManager, MirrorDictProxy
+
+
+def _worker(md, queue):
+    first = md[1]
+    second = md[1]
+    queue.put((first, second, md.cache_info()["hits"], md.get("zz")))
+
+
+@pytest.fixture
+def manager():
+    with MirrorManager() as manager:
+        yield manager
+
+
+def test_mapping_api(manager):
+    md = manager.MirrorDict({"a": 1, "b": 2})
+    assert isinstance(md, MirrorDictProxy)
+    assert md["a"] == 1 and md[2] == "b"
+    assert "a" in md and "z" not in md
+    assert md.get("z", 0) == 0
+    md["c"] = 3
+    md.update({"d": 4}, e=5)
+    del md["a"]
+    assert md.pop(2) == "b"
+    assert md.pop("zz", None) is None
+    assert md.setdefault("f", 6) == 6
+    assert len(md) == 4
+    assert md.items() == [("c", 3), ("d", 4), ("e", 5), ("f", 6)]
+    assert md == {"c": 3, "d": 4, "e": 5, "f": 6}
+    assert md.copy() == MirrorDict(c=3, d=4, e=5, f=6)
+    assert md.popitem() == ("f", 6)
+    with pytest.raises(KeyError):
+        md["a"]
+    with pytest.raises(KeyError):
+        del md["a"]
+    md.clear()
+    assert len(md) == 0
+
+
+def test_cache_hits_and_invalidation(manager):
+    md = manager.MirrorDict(a=1)
+    assert md[1] == "a"
+    assert md[1] == "a"
+    assert "z" not in md
+    assert "z" not in md
+    info = md.cache_info()
+    assert info["hits"] == 2 and info["misses"] == 2
+    other = manager.MirrorDict()  # changes to another mirror do not invalidate
+    other["x"] = 1
+    assert md[1] == "a"
+    assert md.cache_info()["hits"] == 3
+
+    md["z"] = 1  # evicts a:1
+    assert md[1] == "z"
+    assert "a" not in md
+    assert md.get_many(["z", 1, "q"], default=-1) == [1, "z", -1]
+
+
+def test_failed_write_keeps_cache(manager):
+    md = manager.MirrorDict(a=1)
+    assert md[1] == "a"
+    version = md.cache_info()["version"]
+    with pytest.raises(KeyError):
+        del md["zz"]
+    assert md[1] == "a"
+    assert md.cache_info()["version"] == version and md.cache_info()["hits"] == 1
+    with pytest.raises(TypeError):
+        md.update([("b", 2), ("c", [3])])  # b:2 is added before the error
+    assert md[2] == "b"
+    assert md.cache_info()["version"] != version
+
+
+def test_update_response_is_none():
+    from MirrorDict.managed import _OWNER_METHODS
+
+    assert _OWNER_METHODS["update"](MirrorDict(), [("a", 1)]) is None
+
+
+def test_pipeline(manager):
+    md = manager.MirrorDict(a=1)
+    assert md.get("a") == 1
+    pipe = md.pipeline()
+    assert pipe.setitem("b", 2).getitem(2).execute() == [None, "b"]
+    assert md.get_many(["a", "b"]) == [1, 2]
+
+
+def test_worker_process(manager):
+    md = manager.MirrorDict({"a": 1})
+    queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_worker, args=(md, queue))
+    proc.start()
+    result = queue.get(timeout=30)
+    proc.join(timeout=30)
+    assert result == ("a", "a", 1, None)
+    md["b"] = 1  # the worker's writes and reads go to the same mirror
+    assert md[1] == "b"
+
+
+def test_cache_disabled(manager):
+    md = manager.MirrorDict(a=1)
+    md.cache_size = 0
+    assert md[1] == "a" and md[1] == "a"
+    assert md.cache_info()["hits"] == 0
@@ -0,0 +1,94 @@
+import sys
+
+import pytest
+from MirrorDict import MirrorDict, LazyMirrorDict, NormalizedMirrorDict, normalize_text
+
+
+def test_memory_usage_components():
+    md = MirrorDict((f"id{i}", i) for i in range(1_000))
+    usage = md.memory_usage()
+    assert usage["key_table"] == sys.getsizeof(md._key)
+    assert usage["value_table"] == sys.getsizeof(md._val)
+    assert "keys" not in usage
+    assert usage["total"] == usage["instance"] + usage["key_table"] + usage["value_table"]
+    assert usage["per_pair_overhead"] == (usage["key_table"] + usage["value_table"]) / 1_000
+
+    deep = md.memory_usage(deep=True)
+    assert deep["keys"] == sum(sys.getsizeof(k) for k in md.keys())
+    assert deep["total"] > usage["total"]
+
+
+def test_deep_counts_shared_objects_once():
+    name = "x" * 1_000
+    md = MirrorDict({(name, 1): 1, (name, 2): 2})
+    deep = md.memory_usage(deep=True)
+    tuples = sys.getsizeof((name, 1)) + sys.getsizeof((name, 2))
+    assert deep["keys"] == tuples + sys.getsizeof(name) + sys.getsizeof(1) + sys.getsizeof(2)
+    assert deep["values"] == 0  # 1 and 2 were already counted inside the keys
+
+
+def test_indexes_and_filter():
+    md = MirrorDict((i, f"v{i}") for i in range(1_000))
+    plain = md.memory_usage()
+    assert "indexes" not in plain and "filter" not in plain
+
+    md.add_sorted_index(side="key")
+    sorted_only = md.memory_usage(deep=True)["indexes"]
+    buckets = md._sorted["key"]._items._lists
+    assert sorted_only >= sys.getsizeof(buckets) + sum(map(sys.getsizeof, buckets))
+    md.add_order_index()
+    usage = md.memory_usage(deep=True)
+    assert usage["indexes"] > sorted_only
+    components = ("instance", "key_table", "value_table", "indexes", "keys", "values")
+    assert usage["total"] == sum(usage[name] for name in components)
+
+    md = MirrorDict((i, f"v{i}") for i in range(1_000))
+    md.enable_filter()
+    usage = md.memory_usage()
+    assert usage["filter"] >= sys.getsizeof(md._hashes)
+    assert usage["per_pair_overhead"] == (usage["key_table"] + usage["value_table"] + usage["filter"]) / 1_000
+
+
+def test_spellings_and_pending():
+    md = NormalizedMirrorDict({f"Web-{i}.Example.COM": i for i in range(1_000)}, normalize_key=normalize_text)
+    usage = md.memory_usage(deep=True)
+    assert usage["spelling_table"] == sys.getsizeof(md._spelling)
+    assert usage["spellings"] == sum(sys.getsizeof(key) for key in md.keys())  # the ints are already values
+    overhead = usage["key_table"] + usage["value_table"] + usage["spelling_table"]
+    assert usage["per_pair_overhead"] == overhead / 1_000
+    assert usage["total"] == overhead + usage["instance"] + usage["keys"] + usage["values"] + usage["spellings"]
+
+    lazy = LazyMirrorDict((i, -i - 1) for i in range(1_000))
+    usage = lazy.memory_usage()
+    pending = sys.getsizeof(lazy._pending) + sum(map(sys.getsizeof, lazy._pending))
+    assert usage["pending"] == pending and usage["value_table"] == 0
+    assert usage["per_pair_overhead"] == (usage["key_table"] + pending) / 1_000
+    lazy[-1]  # builds the inverse
+    assert lazy.memory_usage()["pending"] == sys.getsizeof(lazy._pending) < pending
+
+
+def test_empty_and_lazy():
+    assert MirrorDict().memory_usage(deep=True)["per_pair"] == 0.0
+    md = LazyMirrorDict(a=1)
+    assert md.memory_usage()["value_table"] == 0
+
+
+@pytest.mark.parametrize("key, value", [("id12345", 1_000_000), (1_000_000, 2_000_000), (("a", 1_000), "v")])
+@pytest.mark.parametrize("n", [1, 10, 1_000, 50_000])
+def test_estimate_matches_compacted_tables(n, key, value):
+    est = MirrorDict.estimate_memory(n, key=key, value=value)
+    if isinstance(key, str):
+        md = MirrorDict((f"{key}{i}", value + i) for i in range(n))
+    elif isinstance(key, int):
+        md = MirrorDict((key + i, value + i) for i in range(n))
+    else:
+        md = MirrorDict(((key[0], key[1] + i), f"{value}{i}") for i in range(n))
+    usage = md.compact().memory_usage()
+    assert est["key_table"] == usage["key_table"]
+    assert est["value_table"] == usage["value_table"]
+
+
+def test_estimate_errors():
+    with pytest.raises(ValueError):
+        MirrorDict.estimate_memory(-1, key=1, value=2)
+    assert MirrorDict.estimate_memory(0, key=1, value=2)["per_pair"] == 0.0
@@ -0,0 +1,113 @@
+import random
+import pytest
+from MirrorDict import MirrorDict, IndexedMirrorDict, LazyMirrorDict, NormalizedMirrorDict
+
+
+def _random_mirror(rng, size, lo, hi):
+    md = MirrorDict()
+    for _ in range(size):
+        key, val = rng.randrange(lo, hi), rng.randrange(lo, hi)
+        if key != val:
+            md[key] = val
+    return md
+
+
+def _sequential(md, other):
+    ref = MirrorDict()
+    ref._key = md._key.copy()
+    ref._val = md._val.copy()
+    for key, val in other.items():
+        ref._update(key, val)
+    return ref
+
+
+def test_replace_matches_update():
+    rng = random.Random(5)
+    for _ in range(300):
+        md = _random_mirror(rng, 20, 0, 40)
+        other = _random_mirror(rng, 15, 0, 40)
+        ref = _sequential(md, other)
+        md.merge(other)
+        assert list(md._key.items()) == list(ref._key.items())
+        assert list(md._val.items()) == list(ref._val.items())
+
+
+def test_operators_use_merge():
+    rng = random.Random(6)
+    for _ in range(100):
+        md = _random_mirror(rng, 20, 0, 40)
+        other = _random_mirror(rng, 15, 0, 40)
+        ref = _sequential(md, other)
+        result = md | other
+        assert list(result._key.items()) == list(ref._key.items())
+        assert list(result._val.items()) == list(ref._val.items())
+        md |= other
+        assert list(md._val.items()) == list(ref._val.items())
+
+
+def test_report():
+    md = MirrorDict(a=1, b=2, c=3)
+    report = md.merge({"a": 1, "b": 20, 3: "d", "e": 5}, report=True)
+    assert report == {"added": 3, "unchanged": 1, "replaced": [("b", 2), ("c", 3)], "skipped": []}
+    assert md == {"a": 1, "b": 20, 3: "d", "e": 5}
+    assert list(md.keys()) == ["a", "b", 3, "e"]
+
+
+def test_keep():
+    md = MirrorDict(a=1, b=2)
+    report = md.merge({"a": 10, "x": 2, "c": 3}, on_key_conflict="keep", on_value_conflict="keep", report=True)
+    assert report["skipped"] == [("a", 10), ("x", 2)]
+    assert report["replaced"] == []
+    assert md == {"a": 1, "b": 2, "c": 3}
+
+
+def test_mixed_policies():
+    md = MirrorDict(a=1, b=2)
+    md.merge({"a": 10, "x": 2}, on_key_conflict="replace", on_value_conflict="keep")
+    assert md == {"a": 10, "b": 2}
+    md.merge({"b": 20, "y": 10}, on_key_conflict="keep", on_value_conflict="replace")
+    assert md == {"b": 2, "y": 10}
+
+
+def test_raise_leaves_mirror_unchanged():
+    md = MirrorDict(a=1, b=2)
+    with pytest.raises(ValueError, match="2 pairs"):
+        md.merge({"c": 3, "a": 10, "x": 2}, on_key_conflict="raise", on_value_conflict="raise")
+    assert list(md.items()) == [("a", 1), ("b", 2)]
+    md.merge({"a": 1, "c": 3}, on_key_conflict="raise")  # same pair is not a conflict
+    assert md == {"a": 1, "b": 2, "c": 3}
+
+
+def test_invalid_arguments():
+    md = MirrorDict(a=1)
+    with pytest.raises(ValueError):
+        md.merge({"b": 1, "c": 1})  # value repeats
+    with pytest.raises(ValueError):
+        md.merge({"b": "c", "c": 2})  # key is also a value
+    with pytest.raises(ValueError):
+        md.merge({"b": 2}, on_key_conflict="overwrite")
+    with pytest.raises(TypeError):
+        md.merge({"b": [2]})
+    assert md == {"a": 1}
+
+
+def test_pairs_and_churn():
+    md = MirrorDict((i, -i) for i in range(1, 11))
+    md.merge([(1, 100), (-2, 200)])
+    assert md.churn()["tombstones"] == 3
+    assert md == {**{i: -i for i in range(3, 11)}, 1: 100, -2: 200}
+
+
+def test_subclasses():
+    imd = IndexedMirrorDict(a=1, c=3)
+    imd.add_sorted_index("key")
+    imd.merge(MirrorDict(b=2, a=10))
+    assert list(imd.irange()) == ["a", "b", "c"]
+    assert imd[10] == "a"
+
+    lmd = LazyMirrorDict(a=1, b=2)
+    assert lmd.merge({"c": 2}, report=True)["replaced"] == [("b", 2)]
+    assert lmd == {"a": 1, "c": 2}
+
+    with pytest.raises(TypeError):
+        NormalizedMirrorDict(a=1).merge({"b": 2})
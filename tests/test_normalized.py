@@ -0,0 +1,111 @@
+import random
+
+import pytest
+from MirrorDict import MirrorDict, NormalizedMirrorDict, normalize_text
+
+
+def test_normalize_text():
+    assert normalize_text("  Web-01.Example.COM ") == "web-01.example.com"
+    assert normalize_text("New \t York") == "new york"
+    assert normalize_text("Straße") == "strasse"
+    assert normalize_text(17) == 17
+
+
+def test_lookup_by_any_spelling():
+    md = NormalizedMirrorDict({"Web-01.Example.COM ": 17}, normalize_key=normalize_text)
+    assert md["web-01.example.com"] == 17
+    assert md["  WEB-01.example.com"] == 17
+    assert md[17] == "Web-01.Example.COM "
+    assert "WEB-01.EXAMPLE.COM" in md and "web-02" not in md
+    assert md.get("web-02") is None
+    assert md.canonical(" Web-01.EXAMPLE.com") == "web-01.example.com"
+    assert md.original("web-01.example.com") == "Web-01.Example.COM "
+    assert md._key == {"web-01.example.com": 17}
+    with pytest.raises(KeyError):
+        md["web-02"]
+    assert md.canonical("web-02", None) is None
+
+
+def test_views():
+    md = NormalizedMirrorDict({"Alpha": "x", "Beta": "y"}, normalize_key=str.lower, normalize_value=str.upper)
+    keys, values, items = md.keys(), md.values(), md.items()
+    assert len(keys) == len(values) == len(items) == 2
+    assert "ALPHA" in keys and "X" not in keys and 1 not in keys
+    assert "X" in values and "alpha" not in values
+    assert ("alpha", "X") in items and ("alpha", "y") not in items
+    assert list(keys) == ["Alpha", "Beta"] and list(keys) == ["Alpha", "Beta"]  # not exhausted
+    md["Gamma"] = "z"
+    assert list(values) == ["x", "y", "z"] and list(items)[-1] == ("Gamma", "z")
+    assert list(md.reversed()) == ["Gamma", "Beta", "Alpha"]
+    assert list(md) == ["Alpha", "Beta", "Gamma"]
+
+
+def test_spelling_and_mirror_rules():
+    md = NormalizedMirrorDict(normalize_key=str.lower, normalize_value=str.upper)
+    md["Alpha"] = "x"
+    md["ALPHA"] = "y"  # same key, new spelling and new value
+    assert list(md.items()) == [("ALPHA", "y")]
+    assert md["Y"] == "ALPHA" and md["y"] == "ALPHA"
+    md["beta"] = "Y"  # value already used, evicts ALPHA
+    assert list(md.items()) == [("beta", "Y")]
+    assert md._spelling == {"beta": "beta", "Y": "Y"}
+    assert md == {"beta": "Y"}
+
+
+def test_removals_drop_spellings():
+    md = NormalizedMirrorDict({"A": 1, "B": 2, "C": 3}, normalize_key=str.lower)
+    assert md.pop("a") == 1
+    del md[2]
+    assert md.popitem() == ("C", 3)
+    assert md.pop("z", None) is None
+    assert md._spelling == {} and len(md) == 0
+    with pytest.raises(KeyError):
+        del md["a"]
+    with pytest.raises(KeyError):
+        md.pop("a")
+
+
+def test_matches_mirrordict_on_canonical_inputs():
+    rng = random.Random(3)
+    md = NormalizedMirrorDict(normalize_key=str.lower, normalize_value=str.lower)
+    ref = MirrorDict()
+    for _ in range(3_000):
+        key, val = f"k{rng.randrange(60)}", f"v{rng.randrange(60)}" if rng.random() < 0.8 else f"k{rng.randrange(60)}"
+        if key == val:
+            continue
+        if rng.random() < 0.7:
+            md[key.upper() if rng.random() < 0.5 else key] = val
+            ref[key] = val
+        else:
+            result = md.pop(key.upper(), None)
+            assert (result and result.lower()) == ref.pop(key, None)
+        assert md._key == ref._key and md._val == ref._val
+        assert set(md._spelling) == set(ref._key) | set(ref._val)
+
+
+def test_cache_and_copy():
+    calls = []
+
+    def norm(item):
+        calls.append(item)
+        return item.lower()
+
+    md = NormalizedMirrorDict(a=1, normalize_key=norm, cache_size=8)
+    for _ in range(100):
+        md["A"]
+    assert calls.count("A") == 1
+    assert md.cache_info()["key"].hits >= 99
+    cp = md.copy()
+    assert cp == md and cp["A"] == 1
+    cp["b"] = 2
+    assert "b" not in md
+
+
+def test_unsupported():
+    md = NormalizedMirrorDict(a=1)
+    with pytest.raises(TypeError):
+        md.transaction()
+    with pytest.raises(TypeError):
+        md.inverse
+    with pytest.raises(TypeError):
+        md["x"] = [1]
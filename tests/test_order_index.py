@@ -0,0 +1,96 @@
+import random
+
+import pytest
+from MirrorDict import MirrorDict, IndexedMirrorDict
+from MirrorDict.indexed import _OrderList
+
+
+def test_positional_access():
+    md = MirrorDict(a=1, b=2, c=3)
+    md.add_order_index()
+    assert isinstance(md, IndexedMirrorDict)
+    assert md.item_at(0) == ("a", 1)
+    assert md.item_at(-1) == ("c", 3)
+    assert md.index_of("b") == 1
+    assert md.index_of(3) == 2  # lookup by value
+    assert list(md.islice(1, 3)) == [("b", 2), ("c", 3)]
+    assert list(md.islice(2)) == [("c", 3)]
+    assert list(md.islice(1, 100)) == [("b", 2), ("c", 3)]
+    assert list(md.islice(3)) == []
+
+
+def test_follows_update_order_rules():
+    md = MirrorDict(a=1, b=2, c=3)
+    md.add_order_index()
+    md["a"] = 10  # new value, "a" keeps its position
+    assert md.item_at(0) == ("a", 10)
+    md[2] = "x"  # 2 becomes a key, so the pair moves to the end
+    assert list(md.islice()) == list(md.items()) == [("a", 10), ("c", 3), (2, "x")]
+    del md["c"]
+    assert md.index_of("x") == 1
+    md.popitem()
+    assert list(md.islice()) == [("a", 10)]
+    md.clear()
+    assert list(md.islice()) == []
+
+
+def test_errors():
+    md = MirrorDict(a=1)
+    with pytest.raises(AttributeError):
+        md.item_at(0)  # plain MirrorDict
+    md.add_sorted_index()
+    with pytest.raises(ValueError):
+        md.item_at(0)  # no order index
+    md.add_order_index()
+    with pytest.raises(IndexError):
+        md.item_at(1)
+    with pytest.raises(IndexError):
+        md.item_at(-2)
+    with pytest.raises(KeyError):
+        md.index_of("z")
+    with pytest.raises(ValueError):
+        md.islice(-1)
+
+
+def test_matches_items_order_random():
+    rng = random.Random(11)
+    md = IndexedMirrorDict()
+    md.add_order_index()
+    for step in range(5_000):
+        op = rng.random()
+        if op < 0.55:
+            md[rng.randrange(400)] = rng.randrange(400, 800) if rng.random() < 0.8 else rng.randrange(400)
+        elif op < 0.95 and len(md):
+            md.pop(rng.choice([rng.randrange(800), md.item_at(rng.randrange(len(md)))[0]]), None)
+        elif len(md):
+            md.popitem()
+        if step % 97 == 0:
+            items = list(md.items())
+            assert list(md.islice()) == items
+            for i, (k, v) in enumerate(items):
+                assert md.item_at(i) == (k, v)
+                assert md.index_of(k) == md.index_of(v) == i
+            if items:
+                start = rng.randrange(len(items))
+                assert list(md.islice(start, start + 10)) == items[start : start + 10]
+
+
+def test_order_list_rebuilds_dead_slots():
+    order = _OrderList(range(1_000))
+    for i in range(0, 900):
+        order.remove(i)
+    assert len(order._slots) < 1_000
+    assert order[0] == 900 and order.index(999) == 99
+    assert list(order.islice(95, 100)) == [995, 996, 997, 998, 999]
+
+
+def test_islice_pages_across_deleted_run():
+    md = MirrorDict((i, -i - 1) for i in range(2_000))
+    md.add_order_index()
+    for i in range(1, 900):  # a contiguous run of dead slots, fewer than the live ones
+        del md[i]
+    assert len(md._order._items._slots) == 2_000
+    assert list(md.islice(0, 3)) == [(0, -1), (900, -901), (901, -902)]
+    items = list(md.items())
+    for start in range(0, len(items), 250):
+        assert list(md.islice(start, start + 250)) == items[start : start + 250]
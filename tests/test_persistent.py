@@ -0,0 +1,142 @@
+import random
+import pytest
+from MirrorDict import MirrorDict, PersistentMirrorDict, MirrorSnapshot
+
+
+def test_versions():
+    md = PersistentMirrorDict({"host-1": 17})
+    assert md.version == 0
+    md["host-1"] = 42
+    md["host-2"] = 17
+    assert md.version == 2
+    assert md.at(0)[17] == "host-1"
+    assert md.at(1)["host-1"] == 42 and 17 not in md.at(1)
+    assert md.at(2)[17] == "host-2"
+    assert md.at(2) == md.snapshot() == {"host-1": 42, "host-2": 17}
+    with pytest.raises(IndexError):
+        md.at(3)
+    with pytest.raises(IndexError):
+        md.at(-1)
+
+
+def test_one_version_per_call():
+    md = PersistentMirrorDict()
+    md.update({"a": 1, "b": 2}, c=3)
+    assert md.version == 1
+    md.pop("a")
+    del md[2]
+    md.popitem()
+    assert md.version == 4
+    assert len(md) == 0
+    assert len(md.at(1)) == 3
+    with pytest.raises(KeyError):
+        del md["zz"]
+    assert md.pop("zz", None) is None
+    assert md.version == 4
+
+
+def test_no_version_without_change():
+    md = PersistentMirrorDict(a=1)
+    md["a"] = 1
+    md.update({})
+    md.update(a=1)
+    md.update([("a", 1)], a=1)
+    md.setdefault("a", 2)
+    md.pop("z", None)
+    assert md.version == 0
+    md["a"] = 2
+    md.update(a=2, b=3)
+    assert md.version == 2
+    md.clear()
+    md.clear()
+    assert md.version == 3 and md.at(2) == {"a": 2, "b": 3}
+
+
+def test_snapshot():
+    md = PersistentMirrorDict(a=1, b=2)
+    snap = md.snapshot()
+    md.clear()
+    assert isinstance(snap, MirrorSnapshot)
+    assert snap.version == 0
+    assert snap[2] == "b" and "a" in snap and "z" not in snap
+    assert snap.get("z", 0) == 0
+    assert list(snap) == ["a", "b"]
+    assert snap.values() == [1, 2]
+    assert snap.to_mirror() == MirrorDict(a=1, b=2)
+    with pytest.raises(KeyError):
+        snap["z"]
+    with pytest.raises(TypeError):
+        snap["c"] = 3
+
+
+def test_copy():
+    md = PersistentMirrorDict(a=1)
+    md["b"] = 2
+    cp = md.copy()
+    cp["c"] = 3
+    assert cp.version == 1 and cp.at(0) == {"a": 1, "b": 2}
+    assert md == {"a": 1, "b": 2}
+
+
+def test_unhashable():
+    md = PersistentMirrorDict()
+    with pytest.raises(TypeError):
+        md["a"] = [1]
+    assert md.version == 0
+
+
+class _Collide:
+    def __init__(self, x):
+        self.x = x
+
+    def __hash__(self):
+        return self.x % 3
+
+    def __eq__(self, other):
+        return isinstance(other, _Collide) and self.x == other.x
+
+    def __repr__(self):
+        return f"_Collide({self.x})"
+
+
+def test_hash_collisions():
+    items = [_Collide(i) for i in range(12)]
+    md = PersistentMirrorDict((c, i) for i, c in enumerate(items))
+    assert all(md[c] == i and md[i] == c for i, c in enumerate(items))
+    for c in items[::2]:
+        del md[c]
+    assert list(md.keys()) == items[1::2]
+    assert md.at(0)[items[0]] == 0
+
+
+def test_matches_mirrordict():
+    rng = random.Random(7)
+    md = MirrorDict()
+    pmd = PersistentMirrorDict()
+    history = [dict(md.items())]
+    for _ in range(3000):
+        op = rng.random()
+        key, val = rng.randrange(60), rng.randrange(30, 90)
+        if op < 0.6:
+            if key == val:
+                continue
+            md[key] = val
+            pmd[key] = val
+            if pmd.version == len(history) - 1:  # the pair was already set
+                continue
+        elif op < 0.95:
+            assert md.pop(key, None) == pmd.pop(key, None)
+            if pmd.version == len(history) - 1:
+                continue
+        else:
+            if len(md) == 0:
+                continue
+            assert md.popitem() == pmd.popitem()
+        history.append(dict(md.items()))
+        assert len(md) == len(pmd)
+        assert list(md.items()) == pmd.items()
+    assert pmd.version == len(history) - 1
+    for version, pairs in enumerate(history):
+        snap = pmd.at(version)
+        assert snap.items() == list(pairs.items())
+        assert all(snap[v] == k for k, v in pairs.items())
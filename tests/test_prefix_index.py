@@ -0,0 +1,47 @@
+import pytest
+from MirrorDict import MirrorDict
+
+
+@pytest.fixture
+def symbols():
+    md = MirrorDict({"AAPL": 1, "AMZN": 2, "AMD": 3, "GOOG": 4, "GOOGL": 5, "MSFT": 6})
+    md.add_prefix_index()
+    return md
+
+
+def test_prefix(symbols):
+    assert symbols.prefix("AM") == ["AMD", "AMZN"]
+    assert symbols.prefix("GOOG") == ["GOOG", "GOOGL"]
+    assert symbols.prefix("X") == []
+    assert symbols.prefix("") == ["AAPL", "AMD", "AMZN", "GOOG", "GOOGL", "MSFT"]
+
+
+def test_prefix_limit(symbols):
+    assert symbols.prefix("A", limit=2) == ["AAPL", "AMD"]
+    assert symbols.prefix("A", limit=0) == []
+
+
+def test_prefix_follows_mutations(symbols):
+    symbols["AMAT"] = 7
+    symbols.pop("AMD")
+    symbols["NVDA"] = 2  # evicts AMZN=2
+    assert symbols.prefix("AM") == ["AMAT"]
+    symbols[1] = "ZZZ"  # reverses AAPL=1 into 1="ZZZ"
+    assert symbols.prefix("A") == ["AMAT"]
+    symbols.clear()
+    assert symbols.prefix("") == []
+
+
+def test_prefix_value_side():
+    md = MirrorDict({1: "alpha", 2: "beta", 3: "alphabet", "x": 4})
+    md.add_prefix_index(side="value")
+    assert md.prefix("alp", side="value") == ["alpha", "alphabet"]
+    with pytest.raises(ValueError):
+        md.prefix("alp")  # no key index
+
+
+def test_prefix_ignores_non_str():
+    md = MirrorDict({"a": 1, 2: "b", "ab": 3})
+    md.add_prefix_index(side="both")
+    assert md.prefix("a") == ["a", "ab"]
+    assert md.prefix("b", side="value") == ["b"]
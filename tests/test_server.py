@@ -0,0 +1,125 @@
+import socket
+import threading
+
+import pytest
+
+if not hasattr(socket, "AF_UNIX"):
+    pytest.skip("requires Unix domain sockets", allow_module_level=True)
+
+from MirrorDict import MirrorDict, MirrorDictServer, MirrorDictClient
+
+
+@pytest.fixture
+def server(tmp_path):
+    with MirrorDictServer(tmp_path / "md.sock", MirrorDict(a=1, b=2)) as srv:
+        yield srv
+
+
+@pytest.fixture
+def client(server):
+    with MirrorDictClient(server.path) as cl:
+        yield cl
+
+
+def test_mapping_api(server, client):
+    assert client["a"] == 1
+    assert client[2] == "b"
+    assert client.get("z") is None
+    assert "b" in client and 1 in client and "z" not in client
+    client["c"] = 3
+    assert server.mirror[3] == "c"
+    del client[1]
+    assert client.pop("b") == 2
+    assert client.pop("z", None) is None
+    assert len(client) == 1
+    assert list(client) == ["c"]
+    assert client.setdefault("d", 4) == 4
+    assert client == {"c": 3, "d": 4}
+    assert client.copy() == server.mirror
+    client.clear()
+    assert len(server.mirror) == 0
+
+
+def test_errors_are_reraised(client):
+    with pytest.raises(KeyError):
+        client["z"]
+    with pytest.raises(KeyError):
+        del client["z"]
+    with pytest.raises(TypeError):
+        client["x"] = [1]
+    assert client["a"] == 1  # connection is still usable
+
+
+def test_batched_get_and_update(server, client):
+    client.update({f"k{i}": i for i in range(100)}, z=-1)
+    assert server.mirror["k42"] == 42
+    assert client.get_many(["k1", 99, "missing", -1]) == [1, "k99", None, "z"]
+    assert client.get_many(["missing"], default=0) == [0]
+
+
+def test_update_response_is_none(client):
+    assert client.pipeline().update([("c", 3)]).execute() == [None]
+    assert client.update({"d": 4}) is None
+    assert client[4] == "d"
+
+
+def test_path_is_not_a_socket(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        MirrorDictServer(path)
+    assert path.read_text() == "keep me"
+    with MirrorDictServer(tmp_path / "md.sock"):
+        pass
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(str(tmp_path / "stale.sock"))
+    stale.close()
+    MirrorDictServer(tmp_path / "stale.sock").close()  # a stale socket file is replaced
+
+
+def test_malformed_request(client):
+    (ok, error), response = client._send(["not a request", ("getitem", ("a",))])
+    assert not ok and isinstance(error, ValueError)
+    assert response == (True, 1)
+    assert client["a"] == 1  # the connection is still usable
+
+
+def test_pipeline(client):
+    pipe = client.pipeline()
+    pipe.setitem("c", 3).getitem(3).contains("z").get_many(["a", "b"])
+    assert len(pipe) == 4
+    assert pipe.execute() == [None, "c", False, [1, 2]]
+    assert len(pipe) == 0
+
+    pipe.getitem("z").getitem("a")
+    with pytest.raises(KeyError):
+        pipe.execute()
+    results = pipe.getitem("z").getitem("a").execute(raise_on_error=False)
+    assert isinstance(results[0], KeyError) and results[1] == 1
+
+    with pytest.raises(AttributeError):
+        pipe.not_a_method
+
+
+def test_many_clients(server):
+    def worker(n):
+        with MirrorDictClient(server.path) as cl:
+            cl.update((f"w{n}_{i}", (n, i)) for i in range(50))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(server.mirror) == 2 + 4 * 50
+    assert server.mirror[(3, 49)] == "w3_49"
+
+
+def test_requires_unix_sockets(tmp_path, monkeypatch):
+    from MirrorDict import server as server_module
+
+    monkeypatch.setattr(server_module, "_UnixServer", None)
+    with pytest.raises(OSError, match="requires Unix domain sockets"):
+        MirrorDictServer(tmp_path / "md.sock")
+    with pytest.raises(OSError, match="requires Unix domain sockets"):
+        MirrorDictClient(tmp_path / "md.sock")
@@ -0,0 +1,97 @@
+import multiprocessing
+
+import pytest
+from MirrorDict import MirrorDict, SharedMirrorDict
+
+
+def _worker_lookup(name, queries):
+    smd = SharedMirrorDict(name)
+    try:
+        return [smd.get(q) for q in queries]
+    finally:
+        smd.close()
+
+
+@pytest.fixture
+def shared():
+    smd = SharedMirrorDict.create(MirrorDict(a=1, b=2, c="x", d=-300))
+    yield smd
+    smd.close()
+    smd.unlink()
+
+
+def test_create_and_lookup(shared):
+    assert shared["a"] == 1
+    assert shared[1] == "a"
+    assert shared["x"] == "c"
+    assert shared["c"] == "x"
+    assert shared[-300] == "d"
+    assert len(shared) == 4
+
+
+def test_attach(shared):
+    with SharedMirrorDict(shared.name) as smd:
+        assert smd["b"] == 2
+        assert smd[2] == "b"
+        assert smd == shared
+        assert list(smd.keys()) == ["a", "b", "c", "d"]
+        assert list(smd.values()) == [1, 2, "x", -300]
+        assert list(smd.items()) == [("a", 1), ("b", 2), ("c", "x"), ("d", -300)]
+
+
+def test_contains_and_get(shared):
+    assert "a" in shared
+    assert 1 in shared
+    assert "1" not in shared
+    assert "z" not in shared
+    assert 3.5 not in shared
+    assert shared.get("z", "default") == "default"
+    with pytest.raises(KeyError):
+        shared["z"]
+
+
+def test_numbers_match_like_mirrordict(shared):
+    md = MirrorDict(a=1, b=2, c="x", d=-300)
+    for query in [1.0, True, 2.0, -300.0, 1.5, 0, False, float("nan"), 1j]:
+        assert shared.get(query) == md.get(query)
+        assert (query in shared) == (query in md)
+
+
+def test_bool_round_trip():
+    md = MirrorDict({True: "t", "f": False, 7: "seven"})
+    with SharedMirrorDict.create(md) as smd:
+        assert list(smd.items()) == [(True, "t"), ("f", False), (7, "seven")]
+        assert type(smd["t"]) is bool and type(smd["f"]) is bool
+        assert smd[1] == smd[True] == "t" and smd[0] == smd[False] == "f"
+        assert smd.copy() == md
+        smd.unlink()
+
+
+def test_mirror_semantics_resolved():
+    md = MirrorDict(a=1, b=2)
+    md[2] = "b"
+    with SharedMirrorDict.create([("a", 1), ("b", 2), (2, "b")]) as smd:
+        assert smd.copy() == md
+        assert list(smd.keys()) == ["a", 2]
+        smd.unlink()
+
+
+def test_non_str_int_raises():
+    with pytest.raises(TypeError):
+        SharedMirrorDict.create({"a": 1.5})
+    with pytest.raises(TypeError):
+        SharedMirrorDict.create({("a",): 1})
+
+
+def test_empty():
+    with SharedMirrorDict.create() as smd:
+        assert len(smd) == 0
+        assert "a" not in smd
+        smd.unlink()
+
+
+def test_other_process(shared):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        result = pool.apply(_worker_lookup, (shared.name, ["a", 2, "x", "missing"]))
+    assert result == [1, "b", "c", None]
@@ -0,0 +1,93 @@
+import pytest
+from MirrorDict import MirrorDict, IndexedMirrorDict
+
+
+def test_add_sorted_index_converts_in_place():
+    md = MirrorDict({30: "c", 10: "a", 20: "b"})
+    md.add_sorted_index()
+    assert isinstance(md, IndexedMirrorDict)
+    assert list(md.keys()) == [30, 10, 20]  # insertion order is unchanged
+    assert list(md.irange()) == [10, 20, 30]
+
+
+def test_irange():
+    md = MirrorDict((i, f"v{i}") for i in range(0, 100, 10))
+    md.add_sorted_index()
+    assert list(md.irange(15, 45)) == [20, 30, 40]
+    assert list(md.irange(20, 40, inclusive=(False, False))) == [30]
+    assert list(md.irange(maximum=20)) == [0, 10, 20]
+    assert list(md.irange(minimum=75, reverse=True)) == [90, 80]
+    assert list(md.irange(50, 10)) == []
+
+
+def test_floor_and_ceiling():
+    md = MirrorDict({100: "start", 250: "middle", 400: "end"})
+    md.add_sorted_index()
+    assert md.floor(300) == 250
+    assert md.floor(250) == 250
+    assert md.ceiling(300) == 400
+    assert md.ceiling(401, None) is None
+    with pytest.raises(KeyError):
+        md.floor(99)
+
+
+def test_value_side():
+    md = MirrorDict({"x": 5, "y": 1, "z": 3})
+    md.add_sorted_index(side="value")
+    assert list(md.irange(side="value")) == [1, 3, 5]
+    assert md.floor(4, side="value") == 3
+    with pytest.raises(ValueError):
+        md.irange()  # no key index
+
+
+def test_index_follows_mutations():
+    md = MirrorDict({1: "a", 2: "b", 3: "c"})
+    md.add_sorted_index(side="both")
+    md[4] = "d"
+    md[1] = "z"  # replace value
+    md[5] = "b"  # evicts 2="b"
+    md.pop(3)
+    del md["d"]
+    assert list(md.irange()) == [1, 5]
+    assert list(md.irange(side="value")) == ["b", "z"]
+    md.popitem()
+    assert list(md.irange()) == [1]
+    md.clear()
+    assert list(md.irange()) == []
+
+
+def test_reversal_updates_both_sides():
+    md = MirrorDict({1: 10, 2: 20})
+    md.add_sorted_index(side="both")
+    md[20] = 3  # 20 becomes a key
+    assert list(md.irange()) == [1, 20]
+    assert list(md.irange(side="value")) == [3, 10]
+
+
+def test_incomparable_item_rejected():
+    md = MirrorDict({1: "a"})
+    md.add_sorted_index()
+    with pytest.raises(TypeError):
+        md["b"] = 2
+    assert md == {1: "a"}
+    assert list(md.irange()) == [1]
+
+
+def test_unhashable_and_update_cases():
+    from MirrorDict import _UPDATE_EVICT_VAL, _UPDATE_REPLACE
+
+    md = MirrorDict({1: "a", 2: "b"})
+    md.add_sorted_index(side="both")
+    with pytest.raises(TypeError, match="must be hashable"):
+        md[3] = ["c"]
+    assert md._update(1, "a") is None
+    assert md._update(1, "c") == _UPDATE_REPLACE
+    assert md._update(3, "b") == _UPDATE_EVICT_VAL  # 2: "b" is evicted
+    assert md == {1: "c", 3: "b"}
+    assert list(md.irange()) == [1, 3] and list(md.irange(side="value")) == ["b", "c"]
+
+
+def test_bad_side():
+    md = MirrorDict()
+    with pytest.raises(ValueError):
+        md.add_sorted_index(side="keys")
@@ -0,0 +1,80 @@
+import pytest
+from MirrorDict import MirrorDict, InstrumentedMirrorDict
+
+
+def test_lookup_counters():
+    md = InstrumentedMirrorDict(a=1, b=2)
+    assert md["a"] == 1
+    assert md[2] == "b"
+    assert md.get("z") is None
+    assert "a" in md
+    assert 3 not in md
+    with pytest.raises(KeyError):
+        md["z"]
+    counters = md.stats()["counters"]
+    assert counters["lookup_key"] == 2
+    assert counters["lookup_val"] == 1
+    assert counters["lookup_miss"] == 3
+
+
+def test_update_counters():
+    md = InstrumentedMirrorDict(a=1, b=2, c=3)
+    md.reset_stats()
+    md["a"] = 1  # same
+    md["a"] = 10  # replace
+    md[2] = "x"  # reverse key, b=2 dropped
+    md["y"] = 3  # evict value, c dropped
+    md["z"] = "a"  # reverse value, a=10 dropped
+    counters = md.stats()["counters"]
+    assert counters["update_same"] == 1
+    assert counters["update_replace"] == 1
+    assert counters["update_reverse_key"] == 1
+    assert counters["update_evict_val"] == 1
+    assert counters["update_reverse_val"] == 1
+    assert counters["update_insert"] == 3
+    assert md == {2: "x", "y": 3, "z": "a"}
+
+
+def test_matches_mirrordict():
+    ops = [("a", 1), ("b", 2), (2, "c"), ("a", 3), ("d", 1), (3, "e")]
+    md = MirrorDict()
+    imd = InstrumentedMirrorDict()
+    for key, val in ops:
+        md[key] = val
+        imd[key] = val
+    assert list(md.items()) == list(imd.items())
+    assert md == imd
+
+
+def test_remove_counters():
+    md = InstrumentedMirrorDict(a=1, b=2)
+    md.pop("a")
+    del md[2]
+    md.pop("z", None)
+    counters = md.stats()["counters"]
+    assert counters == {"update_insert": 2, "remove_key": 1, "remove_val": 1, "remove_miss": 1}
+
+
+def test_histograms():
+    md = InstrumentedMirrorDict(a=1)
+    md[1] = "b"
+    md.get("a")
+    hists = md.stats()["histograms"]
+    assert sum(hists["update"].values()) == 2
+    assert sum(hists["reverse"].values()) == 1
+    assert sum(hists["lookup"].values()) == 1
+    assert all(bound & (bound - 1) == 0 for bound in hists["update"])
+
+
+def test_enable_disable_stats():
+    md = MirrorDict(a=1)
+    assert not hasattr(md, "stats")
+    md.enable_stats()
+    assert isinstance(md, InstrumentedMirrorDict)
+    md["b"] = 2
+    assert md.stats()["counters"] == {"update_insert": 1}
+    md.enable_stats()  # already enabled, keeps the counters
+    assert md.stats()["counters"] == {"update_insert": 1}
+    md.disable_stats()
+    assert type(md) is MirrorDict
+    assert md == {"a": 1, "b": 2}
@@ -0,0 +1,87 @@
+import pytest
+from MirrorDict import MirrorDict
+
+
+def test_commit_on_exit():
+    md = MirrorDict(a=1, b=2)
+    with md.transaction() as tx:
+        tx["c"] = 3
+        del tx[1]
+        assert "c" not in md  # nothing applied before commit
+    assert md == {"b": 2, "c": 3}
+    assert md[3] == "c"
+    assert 1 not in md
+
+
+def test_mirror_rules_match_sequential_updates():
+    ops = [("a", 1), ("b", 2), (2, "x"), ("c", 1), ("a", 5), ("x", "y")]
+    md = MirrorDict()
+    for key, val in ops:
+        md[key] = val
+    md_tx = MirrorDict()
+    with md_tx.transaction() as tx:
+        tx.update(ops)
+    assert list(md_tx.items()) == list(md.items())
+    assert md_tx._val == md._val
+
+
+def test_unhashable_rolls_back():
+    md = MirrorDict(a=1, b=2)
+    with pytest.raises(TypeError):
+        with md.transaction() as tx:
+            tx["c"] = 3
+            tx["d"] = [4]
+    assert md == {"a": 1, "b": 2}
+    assert md._val == {1: "a", 2: "b"}
+
+
+def test_commit_error_leaves_mirror_unchanged():
+    md = MirrorDict(a=1, b=2)
+    tx = md.transaction()
+    tx["a"] = 10
+    tx["c"] = 3
+    del tx["missing"]
+    with pytest.raises(KeyError):
+        tx.commit()
+    assert list(md.items()) == [("a", 1), ("b", 2)]
+    assert md._val == {1: "a", 2: "b"}
+
+
+def test_exception_in_block_discards():
+    md = MirrorDict(a=1)
+    with pytest.raises(RuntimeError):
+        with md.transaction() as tx:
+            tx["b"] = 2
+            raise RuntimeError("abort")
+    assert md == {"a": 1}
+
+
+def test_discard_and_rollback():
+    md = MirrorDict(a=1, b=2)
+    tx = md.transaction()
+    tx.discard("missing")
+    tx.discard(2)
+    assert len(tx) == 2
+    tx.commit()
+    assert md == {"a": 1}
+
+    tx = md.transaction()
+    tx["z"] = 26
+    tx.rollback()
+    assert md == {"a": 1}
+    with pytest.raises(RuntimeError):
+        tx["y"] = 25
+
+
+def test_indexed_mirror_transaction():
+    md = MirrorDict({1: "a", 2: "b"})
+    md.add_sorted_index()
+    with md.transaction() as tx:
+        tx[3] = "c"
+        tx[4] = "a"  # evicts 1="a"
+    assert list(md.irange()) == [2, 3, 4]
+    with pytest.raises(TypeError):
+        with md.transaction() as tx:
+            tx[5] = "e"
+            tx["f"] = 6  # not comparable with the int keys
+    assert list(md.keys()) == [2, 3, 4]
@@ -0,0 +1,107 @@
+import pytest
+from MirrorDict import MirrorDict, IntMirrorDict, StrIntMirrorDict
+
+
+def test_int_add_and_lookup():
+    md = IntMirrorDict()
+    md[1] = 10
+    md[2] = 20
+    assert md[1] == 10
+    assert md[10] == 1
+    assert md[2] == 20
+    assert md[20] == 2
+    assert len(md) == 2
+
+
+def test_int_key_shift_order_matches_mirrordict():
+    kv = {i: i + 100 for i in range(1, 11)}
+    md = MirrorDict(kv)
+    imd = IntMirrorDict(kv)
+    for target in (md, imd):
+        target.pop(104)
+        target.pop(6)
+        target[103] = 3
+        target[11] = 111
+        target[2] = 199
+        target[2] = 108
+        target[12] = 101
+    assert list(imd.keys()) == list(md.keys())
+    assert list(imd.values()) == list(md.values())
+    assert imd == md
+
+
+def test_str_int_lookup():
+    md = StrIntMirrorDict(a=1, b=2, c=3)
+    assert md["b"] == 2
+    assert md[2] == "b"
+    assert "a" in md
+    assert 3 in md
+    assert "z" not in md
+    assert 9 not in md
+    assert md.get("z", "default") == "default"
+    assert list(md.items()) == [("a", 1), ("b", 2), ("c", 3)]
+
+
+def test_str_int_update_value():
+    md = StrIntMirrorDict(a=1, b=2)
+    md["a"] = 2  # drops b=2
+    assert list(md.items()) == [("a", 2)]
+    assert 1 not in md
+    assert md[2] == "a"
+
+
+def test_wrong_types_raise():
+    with pytest.raises(TypeError):
+        StrIntMirrorDict()[1] = "a"
+    with pytest.raises(TypeError):
+        IntMirrorDict()[1] = "a"
+    with pytest.raises(TypeError):
+        IntMirrorDict()[1] = 2.5
+    with pytest.raises(TypeError):
+        IntMirrorDict()[1] = 1 << 70
+
+
+def test_pop_popitem_del():
+    md = IntMirrorDict({1: 10, 2: 20, 3: 30})
+    assert md.pop(20) == 2
+    assert md.pop(5, "default") == "default"
+    with pytest.raises(KeyError):
+        md.pop(5)
+    assert md.popitem() == (3, 30)
+    del md[10]
+    assert len(md) == 0
+    with pytest.raises(KeyError):
+        md.popitem()
+
+
+def test_views():
+    md = IntMirrorDict({1: 10, 2: 20})
+    assert 1 in md.keys()
+    assert 10 not in md.keys()
+    assert 10 in md.values()
+    assert (2, 20) in md.items()
+    assert list(md.reversed()) == [2, 1]
+
+
+def test_growth_and_churn():
+    md = IntMirrorDict()
+    for i in range(5000):
+        md[i] = -i - 1
+    for i in range(0, 5000, 2):
+        del md[i]
+    for i in range(5000, 6000):
+        md[i] = -i - 1
+    assert len(md) == 3500
+    assert md[-2] == 1
+    assert md[5999] == -6000
+    assert 0 not in md
+
+
+def test_copy_clear_and_str():
+    md = StrIntMirrorDict(a=1)
+    md_copy = md.copy()
+    md["b"] = 2
+    assert "b" not in md_copy
+    assert str(md_copy) == "StrIntMirrorDict({'a': 1})"
+    md.clear()
+    assert len(md) == 0
@@ -0,0 +1,117 @@
+import gc
+
+import pytest
+from MirrorDict import MirrorDict, WeakMirrorDict
+
+
+class Conn:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"Conn({self.name})"
+
+
+def test_mapping_api():
+    a, b = Conn("a"), Conn("b")
+    md = WeakMirrorDict({a: 1}, b=b)
+    assert md[a] == 1 and md[1] is a
+    assert md["b"] is b and md[b] == "b"
+    assert a in md and 1 in md and Conn("x") not in md
+    assert md.get(Conn("x")) is None
+    assert len(md) == 2
+    assert list(md.items()) == [(a, 1), ("b", b)]
+    assert md == {a: 1, "b": b}
+    assert md.copy() == md
+    assert md.setdefault(a, 5) == 1
+    assert md.pop(1) is a
+    assert md.pop(1, None) is None
+    del md[b]
+    assert len(md) == 0
+    with pytest.raises(KeyError):
+        md[a]
+    with pytest.raises(KeyError):
+        del md[a]
+    with pytest.raises(KeyError):
+        md.popitem()
+    with pytest.raises(TypeError):
+        md[a] = [1]
+
+
+def test_views():
+    a, b = Conn("a"), Conn("b")
+    md = WeakMirrorDict({a: 1, "b": b})
+    keys, values, items = md.keys(), md.values(), md.items()
+    assert len(keys) == len(values) == len(items) == 2
+    assert a in keys and 1 not in keys and b in values and "b" not in values
+    assert (a, 1) in items and (a, 2) not in items
+    assert list(keys) == [a, "b"] and list(keys) == [a, "b"]  # not exhausted
+    del a
+    gc.collect()
+    assert len(keys) == 1 and list(items) == [("b", b)] and list(values) == [b]
+
+
+def test_mirror_rules():
+    a, b = Conn("a"), Conn("b")
+    md = WeakMirrorDict()
+    ref = MirrorDict()
+    for key, val in [(a, 1), (b, 2), (a, 2), (2, "x"), ("x", a)]:
+        md[key] = val
+        ref[key] = val
+        assert list(md.items()) == list(ref.items())
+
+
+def test_collection_removes_pair_both_directions():
+    conns = [Conn(i) for i in range(1_000)]
+    md = WeakMirrorDict((c, i) for i, c in enumerate(conns))
+    md.update((f"name{i}", c) for i, c in enumerate(conns[:10]))  # re-keys the first 10 pairs
+    assert len(md) == 1_000
+    del conns[500:]
+    gc.collect()
+    assert len(md) == 500
+    assert 999 not in md and 499 in md
+    assert len(md._mirror._val) == 500
+    conns.clear()
+    gc.collect()
+    assert len(md) == 0 and len(md._mirror._val) == 0
+
+
+def test_collection_is_batched():
+    conns = [Conn(i) for i in range(100)]
+    md = WeakMirrorDict((c, i) for i, c in enumerate(conns))
+    conns.clear()
+    gc.collect()
+    assert len(md._pending) == 100  # collection only records the references
+    assert len(md._mirror) == 100
+    assert md.get(5) is None  # the next operation removes them all
+    assert md._pending == [] and len(md._mirror) == 0
+
+
+def test_both_sides_weak():
+    a, b = Conn("a"), Conn("b")
+    md = WeakMirrorDict({a: b})
+    assert md[b] is a
+    del b
+    gc.collect()
+    assert len(md) == 0 and a not in md
+
+
+def test_replaced_value_is_released():
+    a, b, c = Conn("a"), Conn("b"), Conn("c")
+    md = WeakMirrorDict({a: b})
+    md[a] = c  # b is no longer in the mirror, collecting it must not remove a
+    del b
+    gc.collect()
+    assert md[a] is c and md[c] is a
+
+
+def test_mirror_is_collectable():
+    import weakref
+
+    a = Conn("a")
+    md = WeakMirrorDict({a: 1})
+    md_ref = weakref.ref(md)
+    del md
+    gc.collect()
+    assert md_ref() is None
+    del a  # callback after the mirror is gone does nothing